@@ -1,4 +1,31 @@
+import os
+import time
+import threading
+
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+from profiling import traced
+
+urllib3.disable_warnings()
+
+# TopBrains API root; TOPBRAINS_API_BASE points the app at another server
+# (e.g. the local stand-in in bench/mock_server.py)
+API_BASE = (os.environ.get("TOPBRAINS_API_BASE") or "https://topbrains.com").rstrip("/")
+
+# (connect, read) seconds per endpoint — first URL fragment that matches wins
+TIMEOUTS = [
+    ("/auth/", (5, 20)),
+    ("/question", (5, 60)),
+    ("raw.githubusercontent.com", (5, 15)),
+    ("/archive/", (10, 120)),
+]
+DEFAULT_TIMEOUT = (5, 30)
+
+# kept-alive connections per host (paged fetches run several at once)
+POOL_SIZE = 16
+
 
 class AuthExpired(Exception):
     """Raised when access token is expired / blacklisted"""
@@ -10,6 +37,119 @@ class ApiError(Exception):
     pass
 
 
+def api_url(path):
+    """Full URL of an API path under API_BASE."""
+    return API_BASE + path
+
+
+# ---------------- HTTP CLIENT ---------------- #
+
+_session = None
+_session_lock = threading.Lock()
+_hooks = []
+
+
+def http():
+    """The shared pooled requests.Session (created on first use)."""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.verify = False
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+
+    return _session
+
+
+def timeout_for(url):
+    for fragment, timeout in TIMEOUTS:
+        if fragment in url:
+            return timeout
+    return DEFAULT_TIMEOUT
+
+
+def add_hook(hook):
+    """Call hook(method, url, status, seconds, error) after every request."""
+    _hooks.append(hook)
+
+
+def remove_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+@traced(cat="http", detail=lambda method, url, *a, **k: {"method": method, "url": url})
+def request(method, url, timeout=None, **kwargs):
+    """
+    Send one request on the pooled session and return the raw Response.
+    Network failures raise ApiError; HTTP statuses are left to the caller.
+    """
+    started = time.monotonic()
+    status = None
+    error = None
+
+    try:
+        res = http().request(method, url, timeout=timeout or timeout_for(url), **kwargs)
+        status = res.status_code
+        return res
+    except Exception as e:
+        error = str(e)
+        raise ApiError(f"Network error: {e}")
+    finally:
+        for hook in list(_hooks):
+            try:
+                hook(method, url, status, time.monotonic() - started, error)
+            except Exception:
+                pass
+
+
+def check(res):
+    """Classify a response: AuthExpired, ApiError, or the JSON body as a dict."""
+    # 🔒 Auth expired
+    if res.status_code in (401, 403):
+        raise AuthExpired("Session expired")
+
+    # ❌ Empty response
+    if not res.text:
+        raise ApiError("Empty response from server")
+
+    # ❌ Non-JSON response
+    try:
+        data = res.json()
+    except Exception:
+        raise ApiError("Server returned non-JSON response")
+
+    if not isinstance(data, dict):
+        raise ApiError("Invalid response structure")
+
+    return data
+
+
+# ---------------- BEARER TOKENS ---------------- #
+
+# token_manager.tokens registers itself here on import; until then
+# api_call sends bearer tokens as given
+_token_source = None
+
+
+def use_token_manager(manager):
+    """Route the bearer tokens of api_call through `manager` (valid / refresh)."""
+    global _token_source
+    _token_source = manager
+
+
+def bearer(headers):
+    """Access token of an `Authorization: Bearer ...` header, or None."""
+    auth = (headers or {}).get("Authorization", "")
+    return auth[7:] if auth.startswith("Bearer ") else None
+
+
+@traced(cat="http", detail=lambda stdscr, method, url, *a, **k: {"method": method, "url": url})
 def api_call(
     stdscr,
     method,
@@ -18,12 +158,24 @@ def api_call(
     params=None,
     json=None,
     files=None,
-    message="Loading..."
+    message="Loading...",
+    replay=True
 ):
     """
     Centralized API caller.
     ALWAYS returns dict OR raises exception.
+
+    Bearer tokens go through the token manager: a token about to expire
+    is refreshed first, and a 401/403 refreshes once and replays the call.
     """
+    tokens = _token_source
+    token = bearer(headers) if tokens else None
+
+    if token:
+        fresh = tokens.valid(token)
+        if fresh != token:
+            token = fresh
+            headers = {**headers, "Authorization": f"Bearer {token}"}
 
     # Simple loader screen
     if stdscr:
@@ -32,35 +184,27 @@ def api_call(
         stdscr.addstr(7, 6, "Please wait...")
         stdscr.refresh()
 
-    try:
-        res = requests.request(
+    res = request(
+        method,
+        url,
+        headers=headers,
+        params=params,
+        json=json,
+        files=files
+    )
+
+    # 🔒 Auth expired — refresh the token once and replay
+    if res.status_code in (401, 403) and token and replay:
+        token = tokens.refresh(token)
+        return api_call(
+            None,
             method,
             url,
-            headers=headers,
+            headers={**headers, "Authorization": f"Bearer {token}"},
             params=params,
             json=json,
             files=files,
-            verify=False,
-            timeout=20
+            replay=False
         )
-    except Exception as e:
-        raise ApiError(f"Network error: {e}")
-
-    # 🔒 Auth expired
-    if res.status_code in (401, 403):
-        raise AuthExpired("Session expired")
-
-    # ❌ Empty response
-    if not res.text:
-        raise ApiError("Empty response from server")
 
-    # ❌ Non-JSON response
-    try:
-        data = res.json()
-    except Exception:
-        raise ApiError("Server returned non-JSON response")
-
-    if not isinstance(data, dict):
-        raise ApiError("Invalid response structure")
-
-    return data
+    return check(res)
@@ -1,7 +1,8 @@
-from api_guard import api_call, AuthExpired
-from db import save_session, clear_session
+from api_guard import api_call, api_url, AuthExpired
+from db import save_session, clear_session, clear_catalog
+from token_manager import tokens
 
-LOGIN_URL = "https://topbrains.com/subject/v1/auth/login"
+LOGIN_URL = api_url("/subject/v1/auth/login")
 
 
 # -------- CURSES INPUT HELPERS -------- #
@@ -76,10 +77,17 @@ def login(stdscr):
         stdscr.getch()
         return False
 
+    save_session(session_from_login(data))
+    tokens.reset()
+    return True
+
+
+def session_from_login(data):
+    """auth_session fields from a login response."""
     body = data["response"]["userLoginResponse"]
     user = body["user"]
 
-    session = {
+    return {
         "user_id": user["id"],
         "user_name": user["name"],
         "user_email": user["email"],
@@ -93,9 +101,8 @@ def login(stdscr):
         "refresh_token": body["refreshToken"]
     }
 
-    save_session(session)
-    return True
-
 
 def logout():
     clear_session()
+    tokens.reset()
+    clear_catalog()
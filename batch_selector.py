@@ -1,11 +1,54 @@
-import curses
-import requests
-import urllib3
+import catalog
+from api_guard import AuthExpired, ApiError, api_url
 from db import get_session
+from paginator import PagedFetch
+from list_view import pick
 
-urllib3.disable_warnings()
+BATCH_URL = api_url("/subject/v1/batch/get-batches")
+PAGE_SIZE = 50
 
-BATCH_URL = "https://topbrains.com/subject/v1/batch/get-batches"
+
+def _batches(items):
+    """Map one page of batches to selector entries."""
+    batches = []
+    for b in items:
+        batches.append({
+            "batchId": b["id"],
+            "batchName": b["name"],
+            "batchCode": b.get("batchCode"),
+            "syllabusReference": b["syllabusReference"]
+        })
+
+    return batches
+
+
+def _label(b):
+    label = b["batchName"]
+    if b["batchCode"]:
+        label += f" ({b['batchCode']})"
+    return label
+
+
+def _fetch_batches(stdscr, access_token, subject_id, organization_id):
+    """Fetch every page of a subject's batches (stdscr=None: no loader screen). Returns a PagedFetch."""
+    headers = {
+        "Authorization": f"Bearer {access_token}"
+    }
+
+    params = {
+        "subjectId": subject_id,
+        "organizationId": organization_id
+    }
+
+    return PagedFetch(
+        stdscr,
+        BATCH_URL,
+        headers,
+        params,
+        PAGE_SIZE,
+        parse=_batches,
+        message="Loading batches..."
+    )
 
 
 def select_batch(stdscr, subject_id):
@@ -27,77 +70,30 @@ def select_batch(stdscr, subject_id):
         refresh_token
     ) = session
 
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
+    cache_key = f"{subject_id}:{organization_id}"
 
-    params = {
-        "subjectId": subject_id,
-        "organizationId": organization_id,
-        "pageNo": 0,
-        "pageSize": 50
-    }
-
-    res = requests.get(
-        BATCH_URL,
-        headers=headers,
-        params=params,
-        verify=False
-    )
+    def fetch(scr):
+        return _fetch_batches(scr, access_token, subject_id, organization_id)
 
-    if res.status_code != 200:
+    try:
+        batches, refresh = catalog.load(stdscr, "batch", cache_key, fetch)
+    except AuthExpired:
         stdscr.clear()
-        stdscr.addstr(4, 4, "❌ Failed to load batches")
-        stdscr.addstr(6, 4, res.text)
-        stdscr.addstr(8, 4, "Press any key to return...")
+        stdscr.addstr(4, 4, "🔒 Session expired. Please login again.")
+        stdscr.addstr(6, 4, "Press any key to continue...")
         stdscr.getch()
         return None
-
-    items = res.json()["response"]["content"]
-
-    if not items:
+    except ApiError as e:
         stdscr.clear()
-        stdscr.addstr(4, 4, "❌ No batches found")
-        stdscr.addstr(6, 4, "Press any key to return...")
+        stdscr.addstr(4, 4, "❌ Failed to load batches")
+        stdscr.addstr(6, 4, str(e))
+        stdscr.addstr(8, 4, "Press any key to return...")
         stdscr.getch()
         return None
 
-    batches = []
-    for b in items:
-        batches.append({
-            "batchId": b["id"],
-            "batchName": b["name"],
-            "batchCode": b.get("batchCode"),
-            "syllabusReference": b["syllabusReference"]
-        })
-
-    current = 0
-
-    while True:
-        stdscr.clear()
-        stdscr.addstr(1, 2, "Select Batch")
-        stdscr.addstr(2, 2, "-" * 13)
-
-        for i, b in enumerate(batches):
-            label = b["batchName"]
-            if b["batchCode"]:
-                label += f" ({b['batchCode']})"
-
-            if i == current:
-                stdscr.addstr(4 + i, 4, label, curses.A_REVERSE)
-            else:
-                stdscr.addstr(4 + i, 4, label)
-
-        stdscr.addstr(6 + len(batches), 2, "↑ ↓ move   Enter select   Esc cancel")
-        stdscr.refresh()
-
-        key = stdscr.getch()
-
-        if key == curses.KEY_UP:
-            current = (current - 1) % len(batches)
-        elif key == curses.KEY_DOWN:
-            current = (current + 1) % len(batches)
-        elif key in (10, 13):
-            return batches[current]
-        elif key == 27:
-            return None
+    return pick(
+        stdscr, "Select Batch", batches, _label,
+        refresh=refresh,
+        reload=lambda: catalog.refresh("batch", cache_key, fetch),
+        empty="❌ No batches found"
+    )
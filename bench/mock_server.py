@@ -0,0 +1,342 @@
+"""
+Local stand-in for the TopBrains API, for benchmarks and manual testing.
+
+    python -m bench.mock_server --port 8085 --latency 40 --jitter 20 --rate-429 0.02
+
+Point the app at it with TOPBRAINS_API_BASE=http://127.0.0.1:8085 (any
+email / password logs in). Serves login, token refresh, the syllabus
+list, the syllabus tree and question create on the real paths, plus
+GET /__stats with request counters.
+"""
+import json
+import time
+import uuid
+import base64
+import random
+import asyncio
+import argparse
+import threading
+
+from aiohttp import web
+
+LOGIN_PATH = "/subject/v1/auth/login"
+REFRESH_PATH = "/subject/v1/auth/refresh-token"
+SYLLABUS_PATH = "/subject/v1/syllabus/get-syllabus-trainer"
+TREE_PATH = "/subject/v1/tree/syllabus"
+QUESTION_PATH = "/subject/v1/question"
+STATS_PATH = "/__stats"
+
+USER_ID = "bench-user"
+ORG_ID = "bench-org"
+
+
+class MockConfig:
+    """Server behaviour. Latencies in ms, rates are probabilities per question request."""
+
+    def __init__(
+        self,
+        latency=40,
+        jitter=20,
+        dup_rate=0.0,
+        rate_429=0.0,
+        rate_5xx=0.0,
+        token_ttl=3600,
+        syllabuses=30,
+        chapters=50,
+        seed=None
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.dup_rate = dup_rate
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.token_ttl = token_ttl
+        self.syllabuses = syllabuses
+        self.chapters = chapters
+        self.seed = seed
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+class MockApi:
+    """Request handlers and in-memory state of one mock server."""
+
+    def __init__(self, config):
+        self.config = config
+        self.random = random.Random(config.seed)
+
+        self.access = {}            # access token -> exp
+        self.refresh = set()
+        self.created = set()        # (chapter, title) already created -> 409
+        self.stats = {
+            "login": 0, "refresh": 0, "syllabus": 0, "tree": 0,
+            "question": 0, "created": 0, "duplicate": 0,
+            "429": 0, "5xx": 0, "401": 0
+        }
+
+    def reset(self):
+        """Forget created questions and zero the counters (tokens stay valid)."""
+        self.created.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    # -------- HELPERS -------- #
+
+    async def _delay(self):
+        ms = self.config.latency + self.random.uniform(-self.config.jitter, self.config.jitter)
+        await asyncio.sleep(max(0.0, ms) / 1000)
+
+    def _issue(self):
+        now = int(time.time())
+        exp = now + self.config.token_ttl
+        access = ".".join([
+            _b64({"alg": "none", "typ": "JWT"}),
+            _b64({"sub": USER_ID, "iat": now, "exp": exp, "jti": uuid.uuid4().hex}),
+            "mock"
+        ])
+        refresh = uuid.uuid4().hex
+
+        self.access[access] = exp
+        self.refresh.add(refresh)
+        return access, refresh
+
+    def _authorized(self, request):
+        auth = request.headers.get("Authorization", "")
+        exp = self.access.get(auth[7:]) if auth.startswith("Bearer ") else None
+        return exp is not None and exp > time.time()
+
+    def _denied(self):
+        self.stats["401"] += 1
+        return web.json_response({"statusCode": 401, "response": "Unauthorized"}, status=401)
+
+    @staticmethod
+    def _page(request, items):
+        page_no = int(request.query.get("pageNo", 0))
+        page_size = max(1, int(request.query.get("pageSize", 20)))
+        start = page_no * page_size
+
+        return web.json_response({
+            "statusCode": 200,
+            "response": {
+                "content": items[start: start + page_size],
+                "totalPages": max(1, -(-len(items) // page_size))
+            }
+        })
+
+    # -------- HANDLERS -------- #
+
+    async def login(self, request):
+        self.stats["login"] += 1
+        await self._delay()
+
+        access, refresh = self._issue()
+        return web.json_response({
+            "statusCode": 200,
+            "response": {
+                "userLoginResponse": {
+                    "user": {
+                        "id": USER_ID,
+                        "name": "Bench User",
+                        "email": "bench@example.com",
+                        "phoneNumber": None,
+                        "currentPrivilege": "TRAINER",
+                        "status": "ACTIVE",
+                        "organizationId": ORG_ID,
+                        "organizationName": "Bench Org",
+                        "organizationType": "COLLEGE"
+                    },
+                    "accessToken": access,
+                    "refreshToken": refresh
+                }
+            }
+        })
+
+    async def refresh_token(self, request):
+        self.stats["refresh"] += 1
+        await self._delay()
+
+        body = await request.json()
+        if body.get("refreshToken") not in self.refresh:
+            return self._denied()
+
+        self.refresh.discard(body["refreshToken"])
+        access, refresh = self._issue()
+        return web.json_response({
+            "statusCode": 200,
+            "response": {"accessToken": access, "refreshToken": refresh}
+        })
+
+    async def syllabus(self, request):
+        self.stats["syllabus"] += 1
+        if not self._authorized(request):
+            return self._denied()
+        await self._delay()
+
+        return self._page(request, [
+            {"syllabusId": f"syl-{i}", "subject": {"id": f"sub-{i}", "name": f"Bench Subject {i}"}}
+            for i in range(self.config.syllabuses)
+        ])
+
+    async def tree(self, request):
+        self.stats["tree"] += 1
+        if not self._authorized(request):
+            return self._denied()
+        await self._delay()
+
+        syllabus = request.query.get("syllabusId", "syl")
+        nodes = []
+        for i in range(self.config.chapters):
+            nodes.append({"_id": f"{syllabus}-unit-{i}", "name": f"Unit {i}", "type": "UNIT"})
+            nodes.append({"_id": f"{syllabus}-ch-{i}", "name": f"Chapter {i}", "type": "CHAPTER"})
+        return self._page(request, nodes)
+
+    async def question(self, request):
+        self.stats["question"] += 1
+        if not self._authorized(request):
+            return self._denied()
+
+        form = await request.post()
+        payload = json.loads(form["questionRequest"])
+        await self._delay()
+
+        roll = self.random.random()
+        if roll < self.config.rate_429:
+            self.stats["429"] += 1
+            return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+        if roll < self.config.rate_429 + self.config.rate_5xx:
+            self.stats["5xx"] += 1
+            return web.Response(status=503, text="Service Unavailable")
+
+        key = (payload["parentId"], payload["questionTitle"])
+        if key in self.created or self.random.random() < self.config.dup_rate:
+            self.stats["duplicate"] += 1
+            return web.json_response({"statusCode": 409, "response": "Question already exists"}, status=409)
+
+        self.created.add(key)
+        self.stats["created"] += 1
+
+        version = payload["version"]
+        return web.json_response({
+            "statusCode": 201,
+            "response": {
+                **payload,
+                "id": uuid.uuid4().hex,
+                "version": {
+                    **version,
+                    "id": uuid.uuid4().hex,
+                    "createdByName": "Bench User",
+                    "createdByEmail": "bench@example.com",
+                    "createdOn": time.strftime("%Y-%m-%dT%H:%M:%S")
+                }
+            }
+        }, status=201)
+
+    async def get_stats(self, request):
+        return web.json_response(self.stats)
+
+
+def build_app(config):
+    api = MockApi(config)
+    app = web.Application()
+    app["api"] = api
+
+    app.router.add_post(LOGIN_PATH, api.login)
+    app.router.add_post(REFRESH_PATH, api.refresh_token)
+    app.router.add_get(SYLLABUS_PATH, api.syllabus)
+    app.router.add_get(TREE_PATH, api.tree)
+    app.router.add_post(QUESTION_PATH, api.question)
+    app.router.add_get(STATS_PATH, api.get_stats)
+    return app
+
+
+class MockServer:
+    """The mock on a background thread with its own event loop: start() -> base URL."""
+
+    def __init__(self, config, host="127.0.0.1", port=0):
+        self.app = build_app(config)
+        self.host = host
+        self.port = port
+
+        self._loop = None
+        self._runner = None
+        self._thread = None
+
+    @property
+    def stats(self):
+        return dict(self.app["api"].stats)
+
+    def reset(self):
+        async def reset():
+            self.app["api"].reset()
+        asyncio.run_coroutine_threadsafe(reset(), self._loop).result()
+
+    def start(self):
+        ready = threading.Event()
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+            self._runner = web.AppRunner(self.app, access_log=None)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, self.host, self.port)
+            self._loop.run_until_complete(site.start())
+            self.port = site._server.sockets[0].getsockname()[1]
+
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="mock-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return f"http://{self.host}:{self.port}"
+
+    def stop(self):
+        if self._loop is None:
+            return
+
+        future = asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop)
+        future.result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+
+def add_config_args(parser):
+    """Server behaviour options, shared with the benchmark harness."""
+    parser.add_argument("--latency", type=float, default=40, help="mean response delay in ms (default 40)")
+    parser.add_argument("--jitter", type=float, default=20, help="± random delay in ms (default 20)")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="share of creates answered 409")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of creates answered 429")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="share of creates answered 503")
+    parser.add_argument("--token-ttl", type=int, default=3600, help="access token lifetime in seconds")
+    parser.add_argument("--seed", type=int, help="random seed for repeatable runs")
+
+
+def config_from_args(args):
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        dup_rate=args.dup_rate,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        token_ttl=args.token_ttl,
+        seed=args.seed
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.mock_server", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8085)
+    add_config_args(parser)
+    args = parser.parse_args(argv)
+
+    print(f"Mock TopBrains API on http://{args.host}:{args.port}  (TOPBRAINS_API_BASE=http://{args.host}:{args.port})")
+    web.run_app(build_app(config_from_args(args)), host=args.host, port=args.port, print=None, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
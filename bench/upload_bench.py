@@ -0,0 +1,228 @@
+"""
+Upload benchmark: drives the real upload path against the local mock.
+
+    python -m bench.upload_bench --rows 2000 --concurrency 1,4,16 --latency 40 --jitter 20
+
+For every concurrency it logs in, loads the syllabus list and a chapter
+tree, and uploads a generated CSV with UploadRun. Each scenario runs in
+a fresh process with its own temporary app.db, so peak RSS and SQLite
+numbers belong to that scenario alone.
+"""
+import os
+import csv
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from csv_validator import REQUIRED_HEADERS
+from bench.mock_server import MockServer, add_config_args, config_from_args
+
+try:
+    import resource
+except ImportError:         # Windows
+    resource = None
+
+REPORT_COLUMNS = [
+    ("concurrency", "Conc", 5),
+    ("questions_per_second", "q/s", 8),
+    ("p50_ms", "p50 ms", 8),
+    ("p95_ms", "p95 ms", 8),
+    ("p99_ms", "p99 ms", 8),
+    ("error_rate", "err", 7),
+    ("retries", "retry", 6),
+    ("token_refreshes", "tok", 4),
+    ("db_write_s", "db s", 7),
+    ("peak_rss_mb", "RSS MB", 8),
+    ("catalog_s", "catalog s", 10),
+    ("elapsed_s", "total s", 8),
+]
+
+
+def write_csv(path, rows):
+    """A valid question CSV of `rows` distinct questions."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_HEADERS)
+        for i in range(rows):
+            writer.writerow([
+                f"Bench question {i}",
+                f"What is {i} + {i}? Some filler text to make the payload realistic.",
+                str(2 * i), str(2 * i + 1), str(i), str(i + 2),
+                "A", "1", ("EASY", "MEDIUM", "HARD")[i % 3]
+            ])
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(base_url, csv_file, concurrency, rate):
+    """One benchmark run in this (fresh) process. Returns its numbers."""
+    workdir = tempfile.mkdtemp(prefix="topbrains-bench-")
+
+    # both are read when the app modules are imported — set them first
+    os.environ["TOPBRAINS_API_BASE"] = base_url
+    os.environ["TOPBRAINS_DB"] = os.path.join(workdir, "app.db")
+
+    import asyncio
+
+    import db
+    from auth import LOGIN_URL, session_from_login
+    from api_guard import api_call
+    from token_manager import tokens
+    from rate_limiter import AdaptiveRateLimiter
+    from syllabus_selector import _fetch_syllabuses
+    from chapter_selector import _fetch_chapters
+    from bulk_question_uploader import UploadRun
+
+    try:
+        db.init_db()
+
+        data = api_call(None, "POST", LOGIN_URL,
+                        json={"userEmail": "bench@example.com", "password": "bench"})
+        session = session_from_login(data)
+        db.save_session(session)
+        token = session["access_token"]
+
+        started = time.perf_counter()
+        syllabus = _fetch_syllabuses(None, token).wait()[0]
+        chapter = _fetch_chapters(None, token, syllabus["subject"]["id"], syllabus["syllabusId"]).wait()[0]
+        catalog_s = time.perf_counter() - started
+
+        run = UploadRun(
+            csv_file,
+            chapter["chapterId"],
+            syllabus["subject"]["id"],
+            session["organization_id"],
+            user_id=session["user_id"],
+            concurrency=concurrency,
+            force=True
+        )
+        if rate != "app":
+            # fixed ceiling instead of the production slow start, so the engine is what gets measured
+            run.limiter = AdaptiveRateLimiter(rate=float(rate), max_rate=float(rate))
+
+        started = time.perf_counter()
+        asyncio.run(run.run())
+        elapsed = time.perf_counter() - started
+        run.results.close()
+
+        metrics = run.metrics_summary()
+        settled = run.done - run.counts["RESUMED"]
+
+        return {
+            "concurrency": concurrency,
+            "rows": settled,
+            "counts": run.counts,
+            "questions_per_second": round(settled / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": metrics["p50_ms"],
+            "p95_ms": metrics["p95_ms"],
+            "p99_ms": metrics["p99_ms"],
+            "error_rate": metrics["error_rate"],
+            "requests": metrics["requests"],
+            "retries": run.retries.scheduled,
+            "dead_lettered": run.dead_lettered,
+            "token_refreshes": tokens.refreshes,
+            "db_write_s": round(run.writer.flush_seconds, 3),
+            "db_flushes": run.writer.flushes,
+            "peak_rss_mb": _peak_rss_mb(),
+            "catalog_s": round(catalog_s, 3),
+            "elapsed_s": round(elapsed, 2)
+        }
+    finally:
+        db.close_db()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}" if value < 1 else f"{value:.1f}"
+    return str(value)
+
+
+def print_report(results):
+    print("  ".join(label.rjust(width) for _, label, width in REPORT_COLUMNS))
+    for result in results:
+        print("  ".join(_fmt(result[key]).rjust(width) for key, _, width in REPORT_COLUMNS))
+
+    print()
+    for result in results:
+        stats = "  ".join(f"{k} {v}" for k, v in result["server"].items())
+        print(f"server @ {result['concurrency']}: {stats}")
+
+
+def _concurrency_list(value):
+    try:
+        levels = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError("comma-separated integers, e.g. 1,4,16")
+    if not levels or min(levels) < 1:
+        raise argparse.ArgumentTypeError("concurrency must be at least 1")
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m bench.upload_bench",
+                                     description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="questions per run (default 1000)")
+    parser.add_argument("--concurrency", type=_concurrency_list, default=[1, 4, 16],
+                        help="comma-separated levels to run (default 1,4,16)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per level (default 1)")
+    parser.add_argument("--rate", default="1000",
+                        help="requests/sec ceiling, or 'app' for the production rate limiter (default 1000)")
+    parser.add_argument("--json", help="also write the results to this file")
+    add_config_args(parser)
+    args = parser.parse_args(argv)
+
+    if args.rate != "app":
+        try:
+            if float(args.rate) <= 0:
+                raise ValueError
+        except ValueError:
+            parser.error("--rate must be a positive number or 'app'")
+
+    server = MockServer(config_from_args(args))
+    base_url = server.start()
+
+    workdir = tempfile.mkdtemp(prefix="topbrains-bench-")
+    csv_file = os.path.join(workdir, "bench.csv")
+    write_csv(csv_file, args.rows)
+
+    results = []
+    context = multiprocessing.get_context("spawn")
+
+    try:
+        for concurrency in args.concurrency:
+            for _ in range(args.repeat):
+                # every scenario starts from an empty server, so nothing is a leftover duplicate
+                server.reset()
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(run_scenario, base_url, csv_file, concurrency, args.rate).result()
+                result["server"] = server.stats
+                results.append(result)
+                print(f"concurrency {concurrency}: {result['questions_per_second']} q/s", file=sys.stderr)
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print_report(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"args": {k: v for k, v in vars(args).items() if k != "json"},
+                       "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,79 @@
+import os
 import csv
 import json
 import curses
+import hashlib
 import asyncio
-import ssl
+import time
 import aiohttp
 
-from db import get_session, log_upload, save_question
-from table_renderer import draw_table, scrollable_table
-
-QUESTION_CREATE_URL = "https://topbrains.com/subject/v1/question"
+from db import (
+    JOURNAL_DONE,
+    get_session,
+    get_dead_letters,
+    get_dead_letter_summary,
+    get_completed_fingerprints,
+    get_content_hashes,
+    run_db,
+    question_content_hash
+)
+from table_renderer import scrollable_table, fit
+from csv_validator import REQUIRED_HEADERS, validate_row
+from rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from upload_transport import UploadTransport
+from write_behind import WriteBehindWriter
+from result_store import ResultStore
+from upload_metrics import RunMetrics, RequestTiming
+from token_manager import tokens
+from retry_queue import (
+    RetryQueue,
+    MAX_ATTEMPTS,
+    RETRYABLE_ERRORS,
+    retryable_status,
+    backoff
+)
+from api_guard import AuthExpired, ApiError, api_url
+from profiling import traced
+
+QUESTION_CREATE_URL = api_url("/subject/v1/question")
+
+# error text for rows found in the local questions table before sending
+LOCAL_DUPLICATE = "Already in this chapter (local check)"
+
+# questions kept in flight at once (one request per slot)
+DEFAULT_CONCURRENCY = 4
+CONCURRENCY_CHOICES = [1, 2, 4, 8, 16]
+
+# bounded queues between pipeline stages (rows / payloads waiting)
+STAGE_QUEUE_SIZE = 256
+
+_END = object()  # end-of-stream marker passed down the pipeline
+
+# how often the retry pump looks for due retries / the end of the run (s)
+RETRY_POLL = 0.05
+
+
+def _fingerprint(row, chapter_id):
+    """Stable id of one CSV row uploaded into one chapter (resume journal key)."""
+    parts = [chapter_id] + [(row.get(h) or "").strip() for h in REQUIRED_HEADERS]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _content_hash(row):
+    """Content hash of a CSV row, comparable with questions.content_hash."""
+    return question_content_hash(
+        row.get("questionTitle"),
+        row.get("questionDescription"),
+        {
+            "a": row.get("optionA"),
+            "b": row.get("optionB"),
+            "c": row.get("optionC"),
+            "d": row.get("optionD")
+        }
+    )
 
 
+@traced(cat="pipeline")
 def _build_payload(row, chapter_id, subject_id, organization_id):
     return {
         "questionTitle": row["questionTitle"],
@@ -48,33 +111,135 @@ def _build_payload(row, chapter_id, subject_id, organization_id):
     }
 
 
-def _draw_live(stdscr, results, total, success, duplicate, failed, skipped):
-    """Redraw screen with live-updating table after each upload."""
-    stdscr.clear()
-    h, w = stdscr.getmaxyx()
-
-    done = success + duplicate + failed + skipped
-    stdscr.addstr(1, 2, f"Uploading... {done} / {total}", curses.A_BOLD)
-    stdscr.addstr(2, 2, f"Success: {success}    Duplicate: {duplicate}    Failed: {failed}    Skipped: {skipped}")
-
-    table_headers = ["#", "Question Title", "Status", "Error"]
-
-    # show only rows that fit on screen, auto-scroll to latest
-    max_visible = h - 8
-    visible = results[-max_visible:] if len(results) > max_visible else results
-
-    draw_table(stdscr, table_headers, visible, start_y=4, max_rows=max_visible)
-
-    if done < total:
-        stdscr.addstr(h - 2, 2, "Uploading next question...")
-    else:
-        stdscr.addstr(h - 2, 2, "Done! Press any key for full report...")
-
-    stdscr.refresh()
+# live screen repaint cap (frames / sec), independent of upload speed
+LIVE_FPS = 10
+
+LIVE_HEADERS = ["#", "Question Title", "Status", "Error"]
+LIVE_TABLE_Y = 6
+
+
+class LiveView:
+    """
+    Live upload screen. Repaints at most LIVE_FPS times a second from a
+    ticker task instead of after every row, and only rewrites screen lines
+    whose text changed since the last frame (noutrefresh + doupdate), so
+    drawing cost no longer grows with upload throughput.
+    """
+
+    def __init__(self, stdscr, run):
+        self.stdscr = stdscr
+        self.run = run
+        self._lines = {}        # y -> (text, attr) currently on screen
+        self._size = None
+
+        stdscr.idlok(True)      # let curses scroll the table instead of repainting it
+
+    def _table_widths(self):
+        # fixed widths: titles / errors are cut to 30 columns, so columns never jump
+        digits = len(str(self.run.total or self.run.rows_read or 0))
+        return [max(digits, 1) + 2, 32, 11, 32]
+
+    @staticmethod
+    def _table_row(cells, widths):
+        return "|" + "|".join(fit(str(c), cw - 2) + "  " for c, cw in zip(cells, widths)) + "|"
+
+    @staticmethod
+    def _table_border(widths):
+        return "+" + "+".join("-" * cw for cw in widths) + "+"
+
+    def _compose(self, h):
+        run = self.run
+        counts = run.counts
+        lines = {}
+
+        total = run.total if run.total is not None else f"{run.rows_read}+"
+        counters = (
+            f"Success: {counts['SUCCESS']}    Duplicate: {counts['DUPLICATE']}"
+            f"    Failed: {counts['FAILED']}    Skipped: {counts['SKIPPED']}"
+        )
+        if counts["RESUMED"]:
+            counters += f"    Resumed: {counts['RESUMED']}"
+        if run.dead_lettered:
+            counters += f"    Dead letters: {run.dead_lettered}"
+
+        depths = "  ".join(f"{name}: {n}" for name, n in run.queue_depths().items())
+
+        lines[1] = (f"Uploading... {run.done} / {total}", curses.A_BOLD)
+        lines[2] = (counters, 0)
+        lines[3] = (f"Rate: {run.limiter.rate:.1f}/s    ({run.limiter.reason})    {run.transport.summary()}", 0)
+        if tokens.refreshes:
+            depths += f"    Token refreshed: {tokens.refreshes}x"
+        lines[4] = (f"Queues  {depths}", 0)
+
+        # table — only rows that fit on screen, auto-scroll to latest
+        widths = self._table_widths()
+        border = self._table_border(widths)
+        max_visible = max(0, h - LIVE_TABLE_Y - 4 - 2)
+        visible = run.results.tail(max_visible) if max_visible else []
+
+        y = LIVE_TABLE_Y
+        lines[y] = (border, 0)
+        lines[y + 1] = (self._table_row(LIVE_HEADERS, widths), 0)
+        lines[y + 2] = (border, 0)
+        y += 3
+        for row in visible:
+            lines[y] = (self._table_row(row, widths), 0)
+            y += 1
+        lines[y] = (border, 0)
+
+        if not run.finished:
+            lines[h - 2] = ("Uploading next question...", 0)
+        else:
+            lines[h - 2] = ("Done! Press any key for full report...", 0)
+
+        return lines
+
+    @traced(cat="ui")
+    def draw(self):
+        """Paint one frame, touching only lines that changed."""
+        stdscr = self.stdscr
+        h, w = stdscr.getmaxyx()
+
+        if (h, w) != self._size:
+            # resized (or first frame) — start from a blank screen
+            self._size = (h, w)
+            self._lines = {}
+            stdscr.clear()
+
+        frame = self._compose(h)
+
+        for y in set(self._lines) | set(frame):
+            if y >= h - 1:
+                continue
 
+            line = frame.get(y, ("", 0))
+            if self._lines.get(y) == line:
+                continue
 
-async def _upload_one(session, access_token, payload):
-    """Post one question and return parsed JSON."""
+            text, attr = line
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            if text:
+                stdscr.addstr(y, 2, text[: w - 3], attr)
+
+        self._lines = frame
+        stdscr.noutrefresh()
+        curses.doupdate()
+
+    async def animate(self):
+        """Repaint at LIVE_FPS until cancelled."""
+        while True:
+            self.draw()
+            await asyncio.sleep(1 / LIVE_FPS)
+
+
+@traced(cat="http")
+async def _upload_one(session, access_token, payload, limiter=None, timing=None):
+    """
+    Post one question and return parsed JSON. Feeds the response to `limiter`
+    and, with a RequestTiming, records its phases on `timing`.
+    TLS settings come from the session's connector (see upload_transport).
+    """
     headers = {"Authorization": f"Bearer {access_token}"}
 
     form = aiohttp.FormData()
@@ -84,113 +249,663 @@ async def _upload_one(session, access_token, payload):
         content_type="application/json"
     )
 
-    ssl_ctx = ssl.create_default_context()
-    ssl_ctx.check_hostname = False
-    ssl_ctx.verify_mode = ssl.CERT_NONE
+    started = time.monotonic()
+    if timing:
+        timing.sent = started
 
     async with session.post(
         QUESTION_CREATE_URL,
         headers=headers,
         data=form,
-        ssl=ssl_ctx
+        trace_request_ctx=timing
     ) as resp:
+        if timing:
+            timing.status = resp.status
+
+        if limiter:
+            limiter.observe(
+                resp.status,
+                time.monotonic() - started,
+                resp.headers.get("Retry-After")
+            )
+
+        # rejected token / overloaded server — the body may not even be JSON
+        if resp.status in (401, 403):
+            return {"statusCode": resp.status}
+        if retryable_status(resp.status):
+            return {
+                "statusCode": resp.status,
+                "response": f"HTTP {resp.status}",
+                "retryAfter": parse_retry_after(resp.headers.get("Retry-After"))
+            }
+
         data = await resp.json()
         return data
 
 
-async def _upload_all_async(stdscr, rows, chapter_id, subject_id, organization_id):
-    db_session = get_session()
-    if not db_session:
-        return
+class UploadRun:
+    """
+    One CSV -> chapter upload, run as a streaming pipeline:
+
+        parse -> prepare (resume, validate, payload, duplicate check) -> send (N workers)
+              -> persist (write-behind thread)
+                                                      retry pump <-'
+
+    Stages are joined by bounded queues, so memory for pending rows stays
+    flat however large the CSV is, and the first question goes out before
+    the file is fully read. `on_update(idx, title, status, qid, error)` is
+    called after every finished row (resumed rows are only counted).
+
+    Timeouts, dropped connections, 429 and 5xx are retried with backoff:
+    the row waits in a RetryQueue and the retry pump puts it back in the
+    send queue when due, so fresh rows keep going meanwhile. A row that
+    fails MAX_ATTEMPTS times is recorded FAILED / SKIPPED and saved as a
+    dead letter. With `dead_letters` (rows from db.get_dead_letters) the
+    run re-drives those instead of reading a CSV.
+
+    Every request's timing goes to upload_request_timing and the run's
+    latency / throughput summary to upload_run (see upload_metrics).
+    """
+
+    def __init__(
+        self,
+        csv_file,
+        chapter_id,
+        subject_id,
+        organization_id,
+        user_id,
+        concurrency=DEFAULT_CONCURRENCY,
+        resume=False,
+        force=False,
+        on_update=None,
+        dead_letters=None,
+        gate=None,
+        limiter=None,
+        transport=None
+    ):
+        self.csv_file = csv_file
+        self.dead_letters = dead_letters
+        self.chapter_id = chapter_id
+        self.subject_id = subject_id
+        self.organization_id = organization_id
+        self.user_id = user_id
+        self.concurrency = concurrency
+        self.resume = resume
+        self.force = force
+        self.on_update = on_update
+
+        self.results = ResultStore()
+        self.counts = {"SUCCESS": 0, "DUPLICATE": 0, "FAILED": 0, "SKIPPED": 0, "RESUMED": 0}
+        self.rows_read = 0
+        self.total = None          # known once the parser reaches end of file
+        self.expired = False
+        self.finished = False
+        self.dead_lettered = 0
+
+        self.retries = RetryQueue()
+        self.metrics = RunMetrics()
+
+        # shared with other runs when scheduled as one job of many (job_scheduler)
+        self.gate = gate
+        self.limiter = limiter or AdaptiveRateLimiter()
+        self.transport = transport or UploadTransport(per_host_limit=concurrency)
+        self.writer = None
+
+        self._parsed = None
+        self._ready = None
+        self._completed = set()
+        self._known = set()
+        self._prepared = False     # every row is in the send queue or already recorded
+        self._in_flight = 0
+
+    @property
+    def done(self):
+        return sum(self.counts.values())
+
+    def queue_depths(self):
+        """Items waiting in front of each stage — shows where the pipeline stalls."""
+        return {
+            "prepare": self._parsed.qsize() if self._parsed else 0,
+            "send": self._ready.qsize() if self._ready else 0,
+            "retry": len(self.retries),
+            "db": self.writer.pending() if self.writer else 0
+        }
+
+    def _record(self, idx, fingerprint, title, qid, status, error=None):
+        self.writer.log_upload(self.user_id, self.chapter_id, title, qid, status, error)
+        self.writer.journal(self.chapter_id, fingerprint, idx, status, qid)
+        if status in JOURNAL_DONE:
+            # on the server now — no longer a dead letter (if it was one)
+            self.writer.drop_dead_letter(self.chapter_id, fingerprint)
+        self.results.add(idx, title, status, error)
+        self.counts[status] += 1
+
+        if self.on_update:
+            self.on_update(idx, title, status, qid, error)
+
+    # -------- STAGES -------- #
+
+    async def _parse(self):
+        with open(self.csv_file, newline="", encoding="utf-8") as f:
+            for idx, row in enumerate(csv.DictReader(f), start=1):
+                if self.expired:
+                    break
+
+                self.rows_read = idx
+                await self._parsed.put((idx, row))
+
+        self.total = self.rows_read
+        await self._parsed.put(_END)
+
+    async def _prepare(self):
+        while True:
+            item = await self._parsed.get()
+            if item is _END:
+                break
+            if self.expired:
+                continue
 
-    user_id = db_session[0]
-    access_token = db_session[9]
+            idx, row = item
+            title = row.get("questionTitle") or f"Row {idx}"
 
-    total = len(rows)
-    results = []
-    success = 0
-    duplicate = 0
-    failed = 0
-    skipped = 0
+            fingerprint = _fingerprint(row, self.chapter_id)
+            if fingerprint in self._completed:
+                self.results.add(idx, title, "RESUMED")
+                self.counts["RESUMED"] += 1
+                continue
 
-    async with aiohttp.ClientSession() as session:
-        for idx, row in enumerate(rows, start=1):
+            # same checks as the pre-upload validator — bad rows never reach the network
+            problem = validate_row(row)
+            if problem:
+                self._record(idx, fingerprint, title, None, "SKIPPED", problem)
+                continue
 
             # build payload — skip row on error
             try:
-                payload = _build_payload(row, chapter_id, subject_id, organization_id)
+                payload = _build_payload(row, self.chapter_id, self.subject_id, self.organization_id)
             except Exception as e:
-                log_upload(user_id, chapter_id, row.get("questionTitle", f"Row {idx}"), None, "SKIPPED", str(e))
-                results.append([idx, row.get("questionTitle", f"Row {idx}")[:30], "SKIPPED", str(e)[:30]])
-                skipped += 1
-                _draw_live(stdscr, results, total, success, duplicate, failed, skipped)
-                if idx < total:
-                    await asyncio.sleep(1)
+                self._record(idx, fingerprint, title, None, "SKIPPED", str(e))
                 continue
 
-            # upload — skip on error
-            try:
-                data = await _upload_one(session, access_token, payload)
-                status_code = data.get("statusCode", 0)
+            content_hash = _content_hash(row)
+            if content_hash in self._known:
+                self._record(idx, fingerprint, title, None, "DUPLICATE", LOCAL_DUPLICATE)
+                continue
 
-                if status_code == 201 and "response" in data and "id" in data["response"]:
-                    resp = data["response"]
-                    qid = resp["id"]
-                    save_question(resp)
-                    log_upload(user_id, chapter_id, row["questionTitle"], qid, "SUCCESS")
-                    results.append([idx, row["questionTitle"][:30], "SUCCESS", ""])
-                    success += 1
-
-                elif status_code == 409:
-                    msg = data.get("response", "Duplicate")
-                    log_upload(user_id, chapter_id, row["questionTitle"], None, "DUPLICATE", str(msg))
-                    results.append([idx, row["questionTitle"][:30], "DUPLICATE", str(msg)[:30]])
-                    duplicate += 1
-
-                elif status_code in (401, 403):
-                    stdscr.clear()
-                    stdscr.addstr(5, 4, "Session expired. Please login again.")
-                    stdscr.getch()
-                    return
+            await self._ready.put((idx, fingerprint, title, content_hash, payload, 1))
 
-                else:
-                    msg = str(data.get("response", "Unknown error"))
-                    log_upload(user_id, chapter_id, row["questionTitle"], None, "FAILED", msg)
-                    results.append([idx, row["questionTitle"][:30], "FAILED", msg[:30]])
-                    failed += 1
+        self._prepared = True
 
-            except Exception as e:
-                log_upload(user_id, chapter_id, row["questionTitle"], None, "SKIPPED", str(e))
-                results.append([idx, row["questionTitle"][:30], "SKIPPED", str(e)[:30]])
-                skipped += 1
+    async def _load_dead_letters(self):
+        """Re-drive source: dead letter rows go straight to the send queue."""
+        for fingerprint, row_no, title, content_hash, payload, _ in self.dead_letters:
+            if self.expired:
+                break
+
+            self.rows_read += 1
+
+            if fingerprint in self._completed:
+                self.writer.drop_dead_letter(self.chapter_id, fingerprint)
+                self.results.add(row_no, title, "RESUMED")
+                self.counts["RESUMED"] += 1
+                continue
+
+            await self._ready.put((row_no, fingerprint, title, content_hash, json.loads(payload), 1))
+
+        self.total = self.rows_read
+        self._prepared = True
+
+    async def _retry_pump(self):
+        """Move due retries into the send queue; end the senders once no row is left."""
+        while True:
+            if self.expired:
+                self.retries.clear()
+
+            wait = self.retries.next_due()
+            if wait is not None and wait <= 0:
+                await self._ready.put(self.retries.pop())
+                continue
+
+            if wait is None and self._prepared and not self._in_flight and self._ready.empty():
+                break
+
+            await asyncio.sleep(RETRY_POLL if wait is None else min(wait, RETRY_POLL))
+
+        for _ in range(self.concurrency):
+            await self._ready.put(_END)
+
+    def _retry(self, item, error, status, retry_after=None):
+        """Schedule another attempt, or give up and keep the row as a dead letter."""
+        idx, fingerprint, title, content_hash, payload, attempt = item
+
+        if attempt < MAX_ATTEMPTS and not self.expired:
+            self.retries.schedule(item[:5] + (attempt + 1,), backoff(attempt, retry_after))
+            return
+
+        error = f"{error} (gave up after {attempt} attempts)"
+        self._record(idx, fingerprint, title, None, status, error)
+        self.writer.dead_letter(
+            self.chapter_id, fingerprint, idx, self.subject_id, self.organization_id,
+            title, content_hash, json.dumps(payload), attempt, error
+        )
+        self.dead_lettered += 1
+
+    async def _send(self, session):
+        while True:
+            item = await self._ready.get()
+            if item is _END:
+                return
+            if self.expired:
+                continue
 
-            # live update after each question
-            _draw_live(stdscr, results, total, success, duplicate, failed, skipped)
+            queued = time.monotonic()
+            self._in_flight += 1
+            try:
+                if self.gate:
+                    # global in-flight slot, handed out fairly between jobs
+                    await self.gate.acquire(self)
+                    try:
+                        await self._send_one(session, item, queued)
+                    finally:
+                        self.gate.release(self)
+                else:
+                    await self._send_one(session, item, queued)
+            finally:
+                self._in_flight -= 1
+
+    async def _post(self, session, token, payload, item, queued):
+        """_upload_one, with the request's timing recorded for the run metrics."""
+        timing = RequestTiming(queued)
+        try:
+            data = await _upload_one(session, token, payload, self.limiter, timing)
+            # the API reports its outcome in the body (HTTP 200 + statusCode 201 / 409 / ...)
+            if isinstance(data, dict) and data.get("statusCode"):
+                timing.status = data["statusCode"]
+            return data
+        except Exception as e:
+            timing.error = str(e) or type(e).__name__
+            raise
+        finally:
+            if timing.sent is not None:
+                timing.done = time.monotonic()
+                self.writer.request_timing(self.metrics.request(timing, item[0], item[5]))
+
+    async def _send_one(self, session, item, queued):
+        idx, fingerprint, title, content_hash, payload, attempt = item
+
+        # upload — retry transient errors, skip on anything else
+        try:
+            await self.limiter.acquire()
+            if self.expired:
+                return
+
+            token = await tokens.atoken()
+            data = await self._post(session, token, payload, item, queued)
+            status_code = data.get("statusCode", 0)
+
+            if status_code in (401, 403):
+                # token died mid-run: one shared refresh, then replay this row
+                queued = time.monotonic()
+                token = await tokens.arefresh(token)
+                data = await self._post(session, token, payload, item, queued)
+                status_code = data.get("statusCode", 0)
 
-            # 1 sec delay before next upload
-            if idx < total:
-                await asyncio.sleep(1)
+            if status_code == 201 and "response" in data and "id" in data["response"]:
+                resp = data["response"]
+                self.writer.save_question(resp)
+                if not self.force:
+                    # "send anyway" means every row goes out, even repeats within this CSV
+                    self._known.add(content_hash)
+                self._record(idx, fingerprint, title, resp["id"], "SUCCESS")
+
+            elif status_code == 409:
+                msg = data.get("response", "Duplicate")
+                self._record(idx, fingerprint, title, None, "DUPLICATE", str(msg))
+
+            elif status_code in (401, 403):
+                # refreshed token refused too — stop every stage; they drain their queues and exit
+                self.expired = True
+
+            elif retryable_status(status_code):
+                msg = str(data.get("response", f"HTTP {status_code}"))
+                self._retry(item, msg, "FAILED", data.get("retryAfter"))
+
+            else:
+                msg = str(data.get("response", "Unknown error"))
+                self._record(idx, fingerprint, title, None, "FAILED", msg)
+
+        except AuthExpired:
+            # refresh token refused — stop every stage
+            self.expired = True
+
+        except ApiError as e:
+            # the token refresh itself failed (network, timeout, 5xx) — try the row again
+            self._retry(item, str(e), "FAILED")
+
+        except RETRYABLE_ERRORS as e:
+            self._retry(item, str(e) or type(e).__name__, "SKIPPED")
+
+        except Exception as e:
+            self._record(idx, fingerprint, title, None, "SKIPPED", str(e))
+
+    # -------- RUN -------- #
+
+    async def run(self, session=None, writer=None):
+        """
+        Upload every row. A scheduler running several jobs passes its shared
+        aiohttp `session` and write-behind `writer` (closed by the scheduler).
+        """
+        # rows a previous run already got onto the server — one query, then set lookups
+        # (both reads run on the db pool, so jobs starting together don't stall the loop)
+        self._completed = (
+            await run_db(get_completed_fingerprints, self.chapter_id)
+            if self.resume or self.dead_letters is not None else set()
+        )
+
+        # content already saved in this chapter — classified DUPLICATE without a request
+        self._known = set() if self.force else await run_db(get_content_hashes, self.chapter_id)
+
+        self._parsed = asyncio.Queue(STAGE_QUEUE_SIZE)
+        self._ready = asyncio.Queue(STAGE_QUEUE_SIZE)
+
+        # db writes go through a background writer — flushed on exit, error or Ctrl-C
+        self.writer = writer or WriteBehindWriter()
+        try:
+            if session is None:
+                async with self.transport.session() as session:
+                    await self._pipeline(session)
+            else:
+                await self._pipeline(session)
+        finally:
+            self._save_metrics()
+            if writer is None:
+                self.writer.close()
+            self.finished = True
+
+    def metrics_summary(self):
+        """Latency / throughput of the run so far (RunMetrics.summary())."""
+        return self.metrics.summary(self.done - self.counts["RESUMED"])
+
+    def _save_metrics(self):
+        if not self.metrics.requests:
+            return      # nothing was sent — nothing to measure
+
+        summary = self.metrics_summary()
+        counts = self.counts
+        self.writer.upload_run((
+            self.metrics.run_id, self.metrics.started_at, self.user_id, self.chapter_id,
+            os.path.basename(self.csv_file) if self.csv_file else "dead letters",
+            summary["elapsed"], self.concurrency, self.done - counts["RESUMED"],
+            counts["SUCCESS"], counts["DUPLICATE"], counts["FAILED"], counts["SKIPPED"],
+            summary["requests"], summary["errors"],
+            summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["per_second"],
+            json.dumps(summary["timeline"])
+        ))
+
+    async def _pipeline(self, session):
+        if self.dead_letters is not None:
+            sources = [self._load_dead_letters()]
+        else:
+            sources = [self._parse(), self._prepare()]
+
+        tasks = [
+            asyncio.ensure_future(stage)
+            for stage in (
+                *sources,
+                self._retry_pump(),
+                *(self._send(session) for _ in range(self.concurrency))
+            )
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # one stage failed (e.g. unreadable CSV) — do not leave the others waiting
+            for task in tasks:
+                task.cancel()
+            raise
+
+
+async def _show_run(stdscr, run, report_title="Upload Report"):
+    """Run `run` under the live screen, then open its full report."""
+    view = LiveView(stdscr, run)
+    ticker = asyncio.create_task(view.animate())
+    try:
+        await run.run()
+    finally:
+        ticker.cancel()
+
+    if run.expired:
+        run.results.close()
+        stdscr.clear()
+        stdscr.addstr(5, 4, "Session expired. Please login again.")
+        stdscr.getch()
+        return
 
     # final live screen — wait for keypress then open scrollable report
-    _draw_live(stdscr, results, total, success, duplicate, failed, skipped)
+    view.draw()
     stdscr.getch()
 
+    counts = run.counts
+
     # scrollable full report
-    title = f"Upload Report  |  Success: {success}  Duplicate: {duplicate}  Failed: {failed}  Skipped: {skipped}"
+    title = (
+        f"{report_title}  |  Success: {counts['SUCCESS']}  Duplicate: {counts['DUPLICATE']}"
+        f"  Failed: {counts['FAILED']}  Skipped: {counts['SKIPPED']}"
+    )
+    if counts["RESUMED"]:
+        title += f"  Resumed: {counts['RESUMED']}"
+    if run.dead_lettered:
+        title += f"  Dead letters: {run.dead_lettered}"
+
+    # pages straight from the result store, in CSV order, with full error text
     report_headers = ["#", "Question Title", "Status", "Error"]
-    scrollable_table(stdscr, title, report_headers, results)
+    try:
+        scrollable_table(stdscr, title, report_headers, run.results.table(report_headers))
+    finally:
+        run.results.close()
 
 
-def upload_all_questions(
+async def _upload_all_async(
     stdscr,
     csv_file,
     chapter_id,
     subject_id,
-    organization_id
+    organization_id,
+    concurrency=DEFAULT_CONCURRENCY,
+    resume=False,
+    force=False
 ):
+    db_session = get_session()
+    if not db_session:
+        return
+
+    run = UploadRun(
+        csv_file,
+        chapter_id,
+        subject_id,
+        organization_id,
+        user_id=db_session[0],
+        concurrency=concurrency,
+        resume=resume,
+        force=force
+    )
+
+    await _show_run(stdscr, run)
+
+
+def select_concurrency(stdscr):
+    """Ask how many questions to keep in flight for this run."""
+    current = CONCURRENCY_CHOICES.index(DEFAULT_CONCURRENCY)
+
+    while True:
+        stdscr.clear()
+        stdscr.addstr(1, 2, "Parallel Uploads")
+        stdscr.addstr(2, 2, "-" * 16)
+
+        h, w = stdscr.getmaxyx()
+
+        for i, n in enumerate(CONCURRENCY_CHOICES):
+            label = f"{n} at a time" if n > 1 else "1 at a time (sequential)"
+
+            if i == current:
+                stdscr.addstr(4 + i, 4, label[: w - 8], curses.A_REVERSE)
+            else:
+                stdscr.addstr(4 + i, 4, label[: w - 8])
+
+        stdscr.addstr(h - 2, 2, "↑ ↓ move   Enter select   Esc cancel")
+        stdscr.refresh()
+
+        key = stdscr.getch()
+
+        if key == curses.KEY_UP:
+            current = (current - 1) % len(CONCURRENCY_CHOICES)
+        elif key == curses.KEY_DOWN:
+            current = (current + 1) % len(CONCURRENCY_CHOICES)
+        elif key in (10, 13):
+            return CONCURRENCY_CHOICES[current]
+        elif key == 27:
+            return None
+
+
+def select_resume(stdscr, csv_file, chapter_id):
+    """
+    If an earlier run already uploaded some of this CSV into the chapter,
+    ask whether to skip those rows. Returns True / False, or None on Esc.
+    """
+    completed = get_completed_fingerprints(chapter_id)
+    if not completed:
+        return False
+
     with open(csv_file, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
+        total = 0
+        done = 0
+        for row in csv.DictReader(f):
+            total += 1
+            if _fingerprint(row, chapter_id) in completed:
+                done += 1
+
+    if not done:
+        return False
+
+    stdscr.clear()
+    stdscr.addstr(1, 2, "Resume Upload")
+    stdscr.addstr(2, 2, "-" * 13)
+    stdscr.addstr(4, 4, f"{done} of {total} questions in this CSV were already uploaded to this chapter.")
+    stdscr.addstr(6, 4, "Enter / y   skip them and upload the rest")
+    stdscr.addstr(7, 4, "n           upload every row again")
+    stdscr.addstr(8, 4, "Esc         cancel")
+    stdscr.refresh()
+
+    while True:
+        key = stdscr.getch()
+
+        if key in (10, 13, ord("y"), ord("Y")):
+            return True
+        elif key in (ord("n"), ord("N")):
+            return False
+        elif key == 27:
+            return None
 
+
+def select_duplicate_check(stdscr, csv_file, chapter_id):
+    """
+    If rows of this CSV match questions already saved in the chapter, ask
+    whether to mark them DUPLICATE locally or send them anyway.
+    Returns `force` (True = send anyway), or None on Esc.
+    """
+    known = get_content_hashes(chapter_id)
+    if not known:
+        return False
+
+    with open(csv_file, newline="", encoding="utf-8") as f:
+        total = 0
+        matches = 0
+        for row in csv.DictReader(f):
+            total += 1
+            if _content_hash(row) in known:
+                matches += 1
+
+    if not matches:
+        return False
+
+    stdscr.clear()
+    stdscr.addstr(1, 2, "Duplicate Check")
+    stdscr.addstr(2, 2, "-" * 15)
+    stdscr.addstr(4, 4, f"{matches} of {total} questions in this CSV already exist in this chapter.")
+    stdscr.addstr(6, 4, "Enter       mark them DUPLICATE without sending")
+    stdscr.addstr(7, 4, "f           send them anyway")
+    stdscr.addstr(8, 4, "Esc         cancel")
+    stdscr.refresh()
+
+    while True:
+        key = stdscr.getch()
+
+        if key in (10, 13):
+            return False
+        elif key in (ord("f"), ord("F")):
+            return True
+        elif key == 27:
+            return None
+
+
+def upload_all_questions(
+    stdscr,
+    csv_file,
+    chapter_id,
+    subject_id,
+    organization_id,
+    concurrency=DEFAULT_CONCURRENCY,
+    resume=False,
+    force=False
+):
     asyncio.run(
-        _upload_all_async(stdscr, rows, chapter_id, subject_id, organization_id)
+        _upload_all_async(
+            stdscr, csv_file, chapter_id, subject_id, organization_id,
+            concurrency, resume, force
+        )
     )
+
+
+def redrive_dead_letters(stdscr):
+    """Send every dead letter again, one chapter at a time, with the normal live screen."""
+    summary = get_dead_letter_summary()
+
+    stdscr.clear()
+    if not summary:
+        stdscr.addstr(4, 4, "✅ No dead letters — every failed row has been retried or cleared.")
+        stdscr.addstr(6, 4, "Press any key to return...")
+        stdscr.getch()
+        return
+
+    rows = sum(r[3] for r in summary)
+    stdscr.addstr(4, 4, f"🔁 {rows} row(s) in {len(summary)} chapter(s) ran out of retry attempts.")
+    stdscr.addstr(5, 4, "They are sent again as one batch; rows that fail again stay dead letters.")
+    stdscr.addstr(7, 4, "y   retry now        any other key   cancel")
+    stdscr.refresh()
+
+    if stdscr.getch() not in (ord("y"), ord("Y")):
+        return
+
+    concurrency = select_concurrency(stdscr)
+    if not concurrency:
+        return
+
+    session = get_session()
+    if not session:
+        return
+
+    for chapter_id, subject_id, organization_id, count in summary:
+        run = UploadRun(
+            None,
+            chapter_id,
+            subject_id,
+            organization_id,
+            user_id=session[0],
+            concurrency=concurrency,
+            dead_letters=get_dead_letters(chapter_id)
+        )
+
+        asyncio.run(_show_run(stdscr, run, f"Re-drive {chapter_id}"))
+        if run.expired:
+            return
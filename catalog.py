@@ -0,0 +1,120 @@
+import time
+import threading
+
+from db import get_catalog, save_catalog, close_thread_conn
+
+# seconds a cached list counts as fresh
+TTL = {
+    "syllabus": 6 * 60 * 60,
+    "chapter": 60 * 60,
+    "batch": 60 * 60,
+}
+
+# how often a selector checks for a finished background refresh (ms)
+REFRESH_POLL_MS = 200
+
+# key that reloads the list in a selector (Ctrl-R; letters go to the search box)
+REFRESH_KEY = 18
+
+
+class Revalidation:
+    """
+    Fetches a fresh copy of one cached list on a background thread.
+
+    Stale cache: the selector keeps showing the cached list and swaps in
+    `items` once `done` is set. First load: `pages` is the PagedFetch
+    already holding page 0, and the selector shows its growing list while
+    the remaining pages stream in.
+
+    `fetch(stdscr)` returns a started PagedFetch; here it is called with
+    stdscr=None and must not draw anything.
+    """
+
+    def __init__(self, entity, key, fetch, pages=None):
+        self.entity = entity
+        self.key = key
+        self.items = None
+        self.error = None
+        self.done = False
+
+        self.pages = pages
+        self.streaming = pages is not None
+
+        self._fetch = fetch
+        self._thread = threading.Thread(target=self._run, name=f"catalog-{entity}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            if self.pages is None:
+                self.pages = self._fetch(None)
+            items = self.pages.wait()
+            save_catalog(self.entity, self.key, items, time.time())
+            self.items = items
+        except Exception as e:
+            self.error = e
+        finally:
+            close_thread_conn()
+            self.done = True
+
+    @property
+    def label(self):
+        """Title suffix while this runs."""
+        if self.streaming and self.pages:
+            return f"(loading {self.pages.progress()}...)"
+        return "(refreshing...)"
+
+
+def load(stdscr, entity, key, fetch):
+    """
+    Return (items, revalidation) for a catalog list.
+
+    - fresh cache  -> cached items, None
+    - stale cache  -> cached items at once, plus a background Revalidation
+    - no cache     -> page 0 now (blocking, shows its loader); if there are
+                      more pages, a streaming Revalidation fetching the rest
+
+    `fetch(stdscr)` returns a started PagedFetch and raises on API errors.
+    """
+    items, fetched_at = get_catalog(entity, key)
+
+    if items is None:
+        pages = fetch(stdscr)
+        if pages.done:
+            items = pages.wait()
+            save_catalog(entity, key, items, time.time())
+            return items, None
+        return pages.items, Revalidation(entity, key, fetch, pages=pages)
+
+    if time.time() - fetched_at > TTL[entity]:
+        return items, Revalidation(entity, key, fetch)
+
+    return items, None
+
+
+def refresh(entity, key, fetch):
+    """Start a background refetch of one list regardless of its age."""
+    return Revalidation(entity, key, fetch)
+
+
+def poll(items, revalidation):
+    """
+    Return (items to show, revalidation or None once it has finished).
+    A streaming first load shows its pages as they arrive; a refresh of a
+    cached list replaces it only when complete.
+    """
+    if revalidation is None:
+        return items, None
+
+    if revalidation.done:
+        if revalidation.items is not None:
+            return revalidation.items, None
+        if revalidation.streaming:
+            # a later page failed — keep what did arrive
+            return revalidation.pages.items, None
+        return items, None
+
+    if revalidation.streaming:
+        return revalidation.pages.items, revalidation
+
+    return items, revalidation
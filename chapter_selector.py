@@ -1,104 +1,77 @@
-import curses
-import requests
-import urllib3
+import catalog
+from api_guard import AuthExpired, ApiError, api_url
 from db import get_session
+from paginator import PagedFetch
+from list_view import pick
 
-urllib3.disable_warnings()
+TREE_URL = api_url("/subject/v1/tree/syllabus")
+PAGE_SIZE = 200
 
-TREE_URL = "https://topbrains.com/subject/v1/tree/syllabus"
 
+def _chapters(nodes):
+    """Extract CHAPTER nodes from one page of the syllabus tree."""
+    return [
+        {
+            "chapterId": n["_id"],
+            "chapterName": n["name"]
+        }
+        for n in nodes
+        if n.get("type") == "CHAPTER"
+    ]
 
-def select_chapter(stdscr, subject_id, syllabus_id):
-    session = get_session()
-    if not session:
-        return None
-
-    access_token = session[9]  # access_token index
 
+def _fetch_chapters(stdscr, access_token, subject_id, syllabus_id):
+    """Fetch every page of a syllabus tree (stdscr=None: no loader screen). Returns a PagedFetch."""
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
 
     params = {
         "resourceId": subject_id,   # ✅ IMPORTANT
-        "syllabusId": syllabus_id,  # ✅ IMPORTANT
-        "pageNo": 0,
-        "pageSize": 200
+        "syllabusId": syllabus_id   # ✅ IMPORTANT
     }
 
-    res = requests.get(
+    return PagedFetch(
+        stdscr,
         TREE_URL,
-        headers=headers,
-        params=params,
-        verify=False
+        headers,
+        params,
+        PAGE_SIZE,
+        parse=_chapters,
+        message="Loading chapters..."
     )
 
-    if res.status_code != 200:
-        stdscr.clear()
-        stdscr.addstr(4, 4, "❌ Failed to load chapters")
-        stdscr.addstr(6, 4, res.text)
-        stdscr.addstr(8, 4, "Press any key to return...")
-        stdscr.getch()
+
+def select_chapter(stdscr, subject_id, syllabus_id):
+    session = get_session()
+    if not session:
         return None
 
-    nodes = res.json()["response"]["content"]
+    access_token = session[9]  # access_token index
+    cache_key = f"{subject_id}:{syllabus_id}"
 
-    # Extract CHAPTER nodes
-    chapters = [
-        {
-            "chapterId": n["_id"],
-            "chapterName": n["name"]
-        }
-        for n in nodes
-        if n.get("type") == "CHAPTER"
-    ]
+    def fetch(scr):
+        return _fetch_chapters(scr, access_token, subject_id, syllabus_id)
 
-    if not chapters:
+    try:
+        chapters, refresh = catalog.load(stdscr, "chapter", cache_key, fetch)
+    except AuthExpired:
         stdscr.clear()
-        stdscr.addstr(4, 4, "❌ No chapters found")
-        stdscr.addstr(6, 4, "Press any key to return...")
+        stdscr.addstr(4, 4, "🔒 Session expired. Please login again.")
+        stdscr.addstr(6, 4, "Press any key to continue...")
         stdscr.getch()
         return None
-
-    current = 0
-
-    while True:
+    except ApiError as e:
         stdscr.clear()
-        stdscr.addstr(1, 2, "Select Chapter")
-        stdscr.addstr(2, 2, "-" * 14)
-
-        h, w = stdscr.getmaxyx()
-        visible_height = h - 8          # keep space for header/footer
-        start = max(0, current - visible_height + 1)
-        end = min(len(chapters), start + visible_height)
-
-        for idx in range(start, end):
-            y = 4 + (idx - start)
-            name = chapters[idx]["chapterName"][: w - 8]  # trim long text
-
-            if idx == current:
-                stdscr.addstr(y, 4, name, curses.A_REVERSE)
-            else:
-                stdscr.addstr(y, 4, name)
-
-        h, w = stdscr.getmaxyx()
-        footer_y = h - 2
-
-        stdscr.addstr(
-            footer_y,
-            2,
-            "↑ ↓ move   Enter select   Esc cancel"[: w - 4]
-        )
-
-        stdscr.refresh()
-
-        key = stdscr.getch()
+        stdscr.addstr(4, 4, "❌ Failed to load chapters")
+        stdscr.addstr(6, 4, str(e))
+        stdscr.addstr(8, 4, "Press any key to return...")
+        stdscr.getch()
+        return None
 
-        if key == curses.KEY_UP:
-            current = (current - 1) % len(chapters)
-        elif key == curses.KEY_DOWN:
-            current = (current + 1) % len(chapters)
-        elif key in (10, 13):
-            return chapters[current]
-        elif key == 27:
-            return None
+    return pick(
+        stdscr, "Select Chapter", chapters, lambda c: c["chapterName"],
+        refresh=refresh,
+        reload=lambda: catalog.refresh("chapter", cache_key, fetch),
+        empty="❌ No chapters found"
+    )
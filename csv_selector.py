@@ -1,73 +1,22 @@
-import curses
 import os
-import csv
 
-
-REQUIRED_HEADERS = [
-    "questionTitle",
-    "questionDescription",
-    "optionA",
-    "optionB",
-    "optionC",
-    "optionD",
-    "correctOption",
-    "marks",
-    "difficulty"
-]
+from csv_validator import REQUIRED_HEADERS, validate_file
+from table_renderer import scrollable_table
+from list_view import pick
 
 
 def select_csv(stdscr):
     files = [f for f in os.listdir(".") if f.lower().endswith(".csv")]
-
-    if not files:
-        stdscr.clear()
-        stdscr.addstr(4, 4, "❌ No CSV files found in current directory")
-        stdscr.addstr(6, 4, "Press any key to return...")
-        stdscr.getch()
-        return None
-
-    current = 0
-
-    while True:
-        stdscr.clear()
-        stdscr.addstr(1, 2, "Select CSV File")
-        stdscr.addstr(2, 2, "-" * 15)
-
-        h, w = stdscr.getmaxyx()
-        visible = h - 8
-        start = max(0, current - visible + 1)
-        end = min(len(files), start + visible)
-
-        for idx in range(start, end):
-            y = 4 + (idx - start)
-            name = files[idx][: w - 6]
-
-            if idx == current:
-                stdscr.addstr(y, 4, name, curses.A_REVERSE)
-            else:
-                stdscr.addstr(y, 4, name)
-
-        stdscr.addstr(h - 2, 2, "↑ ↓ move   Enter select   Esc cancel")
-        stdscr.refresh()
-
-        key = stdscr.getch()
-
-        if key == curses.KEY_UP:
-            current = (current - 1) % len(files)
-        elif key == curses.KEY_DOWN:
-            current = (current + 1) % len(files)
-        elif key in (10, 13):
-            return files[current]
-        elif key == 27:
-            return None
+    return pick(stdscr, "Select CSV File", files, str, empty="❌ No CSV files found in current directory")
 
 
 def validate_csv(stdscr, csv_file):
+    stdscr.clear()
+    stdscr.addstr(4, 4, f"Validating {csv_file}...")
+    stdscr.refresh()
+
     try:
-        with open(csv_file, newline="", encoding="utf-8") as f:
-            reader = csv.reader(f)
-            headers = next(reader)
-            first_row = next(reader, None)
+        report = validate_file(csv_file)
     except Exception as e:
         stdscr.clear()
         stdscr.addstr(4, 4, f"❌ Failed to read CSV: {e}")
@@ -75,7 +24,15 @@ def validate_csv(stdscr, csv_file):
         stdscr.getch()
         return False
 
-    if headers != REQUIRED_HEADERS:
+    if report.unreadable:
+        stdscr.clear()
+        stdscr.addstr(4, 4, f"❌ {csv_file} is not a UTF-8 text file")
+        stdscr.addstr(6, 6, f"{report.unreadable} — save it again as CSV UTF-8")
+        stdscr.addstr(8, 4, "Press any key to return...")
+        stdscr.getch()
+        return False
+
+    if not report.header_ok:
         stdscr.clear()
         stdscr.addstr(4, 4, "❌ CSV header mismatch")
         stdscr.addstr(6, 6, f"Expected: {', '.join(REQUIRED_HEADERS)}")
@@ -83,18 +40,43 @@ def validate_csv(stdscr, csv_file):
         stdscr.getch()
         return False
 
-    if not first_row:
+    if not report.total_rows:
         stdscr.clear()
         stdscr.addstr(4, 4, "❌ CSV has no data rows")
         stdscr.addstr(6, 4, "Press any key to return...")
         stdscr.getch()
         return False
 
+    difficulty = "   ".join(f"{d}: {n}" for d, n in report.by_difficulty.items())
+
     stdscr.clear()
-    stdscr.addstr(4, 4, "✅ CSV validation successful")
-    stdscr.addstr(6, 6, f"File : {csv_file}")
-    stdscr.addstr(7, 6, f"Questions detected (min): 1+")
-    stdscr.addstr(9, 4, "Press any key to continue...")
+    if report.error_count:
+        stdscr.addstr(4, 4, f"⚠ {report.error_count} invalid row(s) found")
+    else:
+        stdscr.addstr(4, 4, "✅ CSV validation successful")
+    stdscr.addstr(6, 6, f"File      : {csv_file}")
+    stdscr.addstr(7, 6, f"Questions : {report.total_rows}  ({report.valid_rows} valid)")
+    stdscr.addstr(8, 6, f"Difficulty: {difficulty}")
+
+    if not report.error_count:
+        stdscr.addstr(10, 4, "Press any key to continue...")
+        stdscr.getch()
+        return True
+
+    stdscr.addstr(10, 4, "Press any key to see the invalid rows...")
     stdscr.getch()
 
-    return True
+    title = f"Invalid rows in {csv_file}  |  {report.error_count} of {report.total_rows}"
+    if report.error_count > len(report.errors):
+        title += f"  (first {len(report.errors)} shown)"
+    scrollable_table(stdscr, title, ["Line", "Problem"], report.errors)
+
+    if not report.valid_rows:
+        return False
+
+    stdscr.clear()
+    stdscr.addstr(4, 4, f"Upload the {report.valid_rows} valid row(s)? Invalid rows are SKIPPED.")
+    stdscr.addstr(6, 4, "y   upload        any other key   cancel")
+    stdscr.refresh()
+
+    return stdscr.getch() in (ord("y"), ord("Y"))
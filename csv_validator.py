@@ -0,0 +1,283 @@
+import io
+import os
+import csv
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+
+REQUIRED_HEADERS = [
+    "questionTitle",
+    "questionDescription",
+    "optionA",
+    "optionB",
+    "optionC",
+    "optionD",
+    "correctOption",
+    "marks",
+    "difficulty"
+]
+
+CORRECT_OPTIONS = {"A", "B", "C", "D"}
+DIFFICULTIES = ("EASY", "MEDIUM", "HARD")
+
+# files at least this big are validated on several processes
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+CHUNK_BYTES = 4 * 1024 * 1024
+BLOCK_BYTES = 1024 * 1024
+
+# invalid rows kept with their messages (all of them are still counted)
+MAX_ERRORS = 10000
+
+# fields that must not be blank (questionDescription may be — it is sent as <p></p>)
+_TEXT_FIELDS = (
+    (0, "questionTitle"),
+    (2, "optionA"),
+    (3, "optionB"),
+    (4, "optionC"),
+    (5, "optionD"),
+)
+
+
+class ValidationReport:
+    """Outcome of validate_file()."""
+
+    def __init__(self, headers=None):
+        self.headers = headers
+        self.header_ok = headers == REQUIRED_HEADERS
+        self.total_rows = 0
+        self.by_difficulty = {d: 0 for d in DIFFICULTIES}
+        self.errors = []          # (line_no, message), first MAX_ERRORS only
+        self.error_count = 0      # invalid rows, all of them
+        self.unreadable = None    # why the file cannot be read as text (not UTF-8), else None
+
+    @property
+    def valid_rows(self):
+        return max(0, self.total_rows - self.error_count)
+
+    def _merge(self, rows, by_difficulty, errors, error_count, unreadable=None):
+        self.total_rows += rows
+        for d, n in by_difficulty.items():
+            self.by_difficulty[d] += n
+        self.errors.extend(errors[: MAX_ERRORS - len(self.errors)])
+        self.error_count += error_count
+        self.unreadable = self.unreadable or unreadable
+
+
+# ---------------- ROW CHECKS ---------------- #
+
+def _check_values(values):
+    """Return the first problem with one CSV record (list of fields), or None."""
+    if len(values) != len(REQUIRED_HEADERS):
+        return f"expected {len(REQUIRED_HEADERS)} fields, got {len(values)} (unquoted comma?)"
+
+    for i, name in _TEXT_FIELDS:
+        if not values[i].strip():
+            return f"{name} is empty"
+
+    if values[6].upper() not in CORRECT_OPTIONS:
+        return f"correctOption must be A, B, C or D (got {values[6]!r})"
+
+    try:
+        marks = float(values[7])
+    except ValueError:
+        return f"marks is not a number (got {values[7]!r})"
+    if not math.isfinite(marks) or marks <= 0:
+        return f"marks must be greater than 0 (got {values[7]!r})"
+
+    if values[8] not in DIFFICULTIES:
+        return f"difficulty must be EASY, MEDIUM or HARD (got {values[8]!r})"
+
+    return None
+
+
+def validate_row(row):
+    """Validate one csv.DictReader row. Returns an error message or None."""
+    if None in row:
+        return f"expected {len(REQUIRED_HEADERS)} fields, got more (unquoted comma?)"
+
+    values = [row.get(h) for h in REQUIRED_HEADERS]
+    if None in values:
+        count = len(REQUIRED_HEADERS) - values.count(None)
+        return f"expected {len(REQUIRED_HEADERS)} fields, got {count} (unquoted comma?)"
+
+    return _check_values(values)
+
+
+# ---------------- CHUNK WORKER ---------------- #
+
+def _validate_chunk(args):
+    """
+    Validate the records in bytes [start, end) of `path`.
+    `first_line` is the physical line number of the first record.
+    Runs in a worker process for big files. Returns the arguments of
+    ValidationReport._merge().
+    """
+    path, start, end, first_line = args
+
+    rows = 0
+    by_difficulty = {d: 0 for d in DIFFICULTIES}
+    errors = []
+    error_count = 0
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as e:
+        line = first_line + data.count(b"\n", 0, e.start)
+        return 0, by_difficulty, [], 0, f"not valid UTF-8 text (line {line})"
+
+    reader = csv.reader(io.StringIO(text, newline=""))
+    line_before = 0
+
+    while True:
+        try:
+            values = next(reader)
+        except StopIteration:
+            break
+        except csv.Error as e:
+            # e.g. a stray quote ran a field past the size limit — count it
+            # as one bad row; the reader carries on after it
+            rows += 1
+            error_count += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append((first_line + line_before, f"unreadable CSV: {e}"))
+            line_before = reader.line_num
+            continue
+
+        line_no = first_line + line_before
+        line_before = reader.line_num
+
+        # csv.DictReader skips blank lines, so they are not questions
+        if not values:
+            continue
+
+        rows += 1
+        problem = _check_values(values)
+
+        if problem:
+            error_count += 1
+            if len(errors) < MAX_ERRORS:
+                errors.append((line_no, problem))
+        else:
+            by_difficulty[values[8]] += 1
+
+    return rows, by_difficulty, errors, error_count, None
+
+
+# ---------------- CHUNK PLANNING ---------------- #
+
+def _record_end(block, i, quotes):
+    """
+    Offset just past the first newline at/after `i` that ends a record
+    (even number of quotes before it), or -1. `quotes` counts the quotes
+    before `block`.
+    """
+    while True:
+        nl = block.find(b"\n", i)
+        if nl == -1:
+            return -1
+        if (quotes + block.count(b'"', 0, nl)) % 2 == 0:
+            return nl + 1
+        i = nl + 1
+
+
+def _read_header(path):
+    """Return (header fields, byte offset of the first data record, header line count)."""
+    with open(path, "rb") as f:
+        head = b""
+        while True:
+            block = f.read(BLOCK_BYTES)
+            head += block
+            end = _record_end(head, 0, 0)
+            if end != -1 or not block:
+                break
+
+    if end == -1:
+        end = len(head)
+
+    header_bytes = head[:end]
+    fields = next(csv.reader(io.StringIO(header_bytes.decode("utf-8"), newline="")), [])
+    return fields, end, header_bytes.count(b"\n")
+
+
+def _plan_chunks(path, body_start, header_lines, size):
+    """
+    Split the body into ~CHUNK_BYTES pieces that start on record boundaries.
+    Only counts quotes and newlines (C speed), so it costs one fast read.
+    """
+    chunks = []
+    chunk_start = body_start
+    chunk_line = header_lines + 1
+
+    with open(path, "rb") as f:
+        f.seek(body_start)
+        offset = body_start
+        quotes = 0
+        lines = header_lines
+
+        while True:
+            block = f.read(BLOCK_BYTES)
+            if not block:
+                break
+
+            i = chunk_start + CHUNK_BYTES - offset
+            while i < len(block):
+                split = _record_end(block, max(i, 0), quotes)
+                if split == -1:
+                    break
+
+                chunks.append((path, chunk_start, offset + split, chunk_line))
+                chunk_line = lines + block.count(b"\n", 0, split) + 1
+                chunk_start = offset + split
+                i = chunk_start + CHUNK_BYTES - offset
+
+            quotes += block.count(b'"')
+            lines += block.count(b"\n")
+            offset += len(block)
+
+    if chunk_start < size:
+        chunks.append((path, chunk_start, size, chunk_line))
+
+    return chunks
+
+
+# ---------------- PUBLIC ---------------- #
+
+def validate_file(path, workers=None):
+    """
+    Stream the whole CSV once and check every row.
+    Returns a ValidationReport with the exact row count, per-difficulty
+    counts and every invalid row with its line number. Files of at least
+    PARALLEL_MIN_BYTES are split on record boundaries and checked on
+    `workers` processes (default: all CPUs). A file that is not UTF-8
+    comes back with `unreadable` set.
+    """
+    try:
+        headers, body_start, header_lines = _read_header(path)
+    except UnicodeDecodeError:
+        report = ValidationReport()
+        report.unreadable = "not valid UTF-8 text (line 1)"
+        return report
+
+    report = ValidationReport(headers)
+
+    if not report.header_ok:
+        return report
+
+    size = os.path.getsize(path)
+    workers = workers or os.cpu_count() or 1
+
+    if size < PARALLEL_MIN_BYTES or workers == 1:
+        report._merge(*_validate_chunk((path, body_start, size, header_lines + 1)))
+        return report
+
+    chunks = _plan_chunks(path, body_start, header_lines, size)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        for result in pool.map(_validate_chunk, chunks):
+            report._merge(*result)
+
+    return report
@@ -1,123 +1,340 @@
 import sqlite3
 import os
+import re
+import html
 import json
+import hashlib
+import atexit
+import asyncio
+import threading
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+from profiling import traced
 
 # ---------- DB PATH ----------
+# TOPBRAINS_DB points the app at another database file (benchmarks, tests)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "app.db")
+DB_PATH = os.environ.get("TOPBRAINS_DB") or os.path.join(BASE_DIR, "app.db")
+
+
+# ---------- CONNECTIONS ----------
+# One long-lived connection per thread instead of connect/close per call.
+# WAL lets readers run while a write is in progress, and synchronous=NORMAL
+# drops the per-commit fsync of the main database file (WAL is still
+# synced at checkpoints), which is safe for this app's data.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-8000",      # ~8 MB page cache
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+# threads used by run_db() so async callers never block the event loop
+DB_WORKERS = 2
+
+_local = threading.local()
+_open_conns = []
+_open_lock = threading.Lock()
+_executor = None
+
+
+def _connect():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+    with _open_lock:
+        _open_conns.append(conn)
+    return conn
 
 
 def get_conn():
-    return sqlite3.connect(DB_PATH)
+    """Return this thread's connection, opened (and tuned) on first use."""
+    cached = getattr(_local, "conn", None)
 
+    if cached is None or cached[0] != DB_PATH:
+        _local.conn = (DB_PATH, _connect())
 
-# ---------- INIT ----------
-def init_db():
-    conn = get_conn()
-    cur = conn.cursor()
+    return _local.conn[1]
 
-    # session table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS auth_session (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
 
-            user_id TEXT NOT NULL,
-            user_name TEXT NOT NULL,
-            user_email TEXT NOT NULL,
-            user_phone TEXT,
-            user_role TEXT NOT NULL,
-            user_status TEXT NOT NULL,
+def close_thread_conn():
+    """Close this thread's connection; background threads call it before they exit."""
+    cached = getattr(_local, "conn", None)
+    if cached is None:
+        return
+    _local.conn = None
 
-            organization_id TEXT NOT NULL,
-            organization_name TEXT NOT NULL,
-            organization_type TEXT NOT NULL,
+    conn = cached[1]
+    with _open_lock:
+        if conn not in _open_conns:
+            return      # already closed by close_db()
+        _open_conns.remove(conn)
 
-            access_token TEXT NOT NULL,
-            refresh_token TEXT NOT NULL,
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
 
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
 
-    # upload log table
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS question_upload_log (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id TEXT,
-            chapter_id TEXT,
-            question_title TEXT,
-            question_id TEXT,
-            status TEXT,
-            error TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+async def run_db(func, *args, **kwargs):
+    """Run a blocking db function on the DB worker pool and await its result."""
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DB_WORKERS, thread_name_prefix="db")
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+def close_db():
+    """Close every pooled connection (called automatically at exit)."""
+    global _executor
+
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+    with _open_lock:
+        while _open_conns:
+            try:
+                _open_conns.pop().close()
+            except sqlite3.Error:
+                pass
+
+    _local.__dict__.clear()
+
+
+atexit.register(close_db)
+
+
+# ---------- INIT ----------
+def init_db():
+    conn = get_conn()
+    with conn:
+        cur = conn.cursor()
+
+        # session table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS auth_session (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+
+                user_id TEXT NOT NULL,
+                user_name TEXT NOT NULL,
+                user_email TEXT NOT NULL,
+                user_phone TEXT,
+                user_role TEXT NOT NULL,
+                user_status TEXT NOT NULL,
+
+                organization_id TEXT NOT NULL,
+                organization_name TEXT NOT NULL,
+                organization_type TEXT NOT NULL,
+
+                access_token TEXT NOT NULL,
+                refresh_token TEXT NOT NULL,
+
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # upload log table
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS question_upload_log (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT,
+                chapter_id TEXT,
+                question_title TEXT,
+                question_id TEXT,
+                status TEXT,
+                error TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # questions table – stores full API response
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                question_id TEXT UNIQUE NOT NULL,
+                version_id TEXT,
+                question_title TEXT,
+                question_description TEXT,
+                question_type TEXT,
+                difficulty_level TEXT,
+                marks REAL,
+                duration REAL,
+                options_json TEXT,
+                correct_options TEXT,
+                answer_explanation TEXT,
+                parent_id TEXT,
+                parent_type TEXT,
+                subject_reference TEXT,
+                organization_reference TEXT,
+                status TEXT,
+                scope TEXT,
+                source_category TEXT,
+                source TEXT,
+                applications TEXT,
+                created_by_name TEXT,
+                created_by_email TEXT,
+                api_created_at TEXT,
+                content_hash TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        _migrate_questions(cur)
+
+        # catalog cache – syllabus / chapter / batch lists as last fetched
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS catalog_cache (
+                entity TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (entity, cache_key)
+            )
+        """)
+
+        # dead letters – rows that ran out of retry attempts, kept with their payload
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS dead_letter (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                chapter_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                row_no INTEGER,
+                subject_id TEXT,
+                organization_id TEXT,
+                question_title TEXT,
+                content_hash TEXT,
+                payload TEXT NOT NULL,
+                attempts INTEGER NOT NULL,
+                last_error TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (chapter_id, fingerprint)
+            )
+        """)
+
+        # upload metrics – one row per run, and the timing of every request it made
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS upload_run (
+                run_id TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                user_id TEXT,
+                chapter_id TEXT,
+                source TEXT,
+                elapsed REAL,
+                concurrency INTEGER,
+                questions INTEGER,
+                success INTEGER,
+                duplicate INTEGER,
+                failed INTEGER,
+                skipped INTEGER,
+                requests INTEGER,
+                errors INTEGER,
+                p50_ms REAL,
+                p95_ms REAL,
+                p99_ms REAL,
+                per_second REAL,
+                timeline TEXT
+            )
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS upload_request_timing (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                row_no INTEGER,
+                attempt INTEGER,
+                http_status INTEGER,
+                error TEXT,
+                wait_ms REAL,
+                pool_ms REAL,
+                connect_ms REAL,
+                ttfb_ms REAL,
+                total_ms REAL,
+                offset_s REAL
+            )
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_request_timing_run
+            ON upload_request_timing (run_id)
+        """)
+
+        # resume journal – one row per (chapter, CSV row fingerprint)
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS upload_journal (
+                chapter_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                row_no INTEGER,
+                status TEXT NOT NULL,
+                question_id TEXT,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (chapter_id, fingerprint)
+            )
+        """)
+
+
+def _migrate_questions(cur):
+    """Add and backfill questions.content_hash on databases created before it existed."""
+    cols = {r[1] for r in cur.execute("PRAGMA table_info(questions)")}
+    if "content_hash" not in cols:
+        cur.execute("ALTER TABLE questions ADD COLUMN content_hash TEXT")
+
+    missing = cur.execute("""
+        SELECT id, question_title, question_description, options_json
+        FROM questions
+        WHERE content_hash IS NULL
+    """).fetchall()
+
+    if missing:
+        cur.executemany(
+            "UPDATE questions SET content_hash = ? WHERE id = ?",
+            [
+                (question_content_hash(title, desc, json.loads(opts or "{}")), qid)
+                for qid, title, desc, opts in missing
+            ]
         )
-    """)
 
-    # questions table – stores full API response
     cur.execute("""
-        CREATE TABLE IF NOT EXISTS questions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            question_id TEXT UNIQUE NOT NULL,
-            version_id TEXT,
-            question_title TEXT,
-            question_description TEXT,
-            question_type TEXT,
-            difficulty_level TEXT,
-            marks REAL,
-            duration REAL,
-            options_json TEXT,
-            correct_options TEXT,
-            answer_explanation TEXT,
-            parent_id TEXT,
-            parent_type TEXT,
-            subject_reference TEXT,
-            organization_reference TEXT,
-            status TEXT,
-            scope TEXT,
-            source_category TEXT,
-            source TEXT,
-            applications TEXT,
-            created_by_name TEXT,
-            created_by_email TEXT,
-            api_created_at TEXT,
-            created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
+        CREATE INDEX IF NOT EXISTS idx_questions_parent_hash
+        ON questions (parent_id, content_hash)
     """)
 
-    conn.commit()
-    conn.close()
-
 
 # ---------- SESSION ----------
+@traced(cat="db")
 def save_session(s):
     conn = get_conn()
-    cur = conn.cursor()
-
-    cur.execute("DELETE FROM auth_session")
-
-    cur.execute("""
-        INSERT INTO auth_session (
-            user_id, user_name, user_email, user_phone,
-            user_role, user_status,
-            organization_id, organization_name, organization_type,
-            access_token, refresh_token
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        s["user_id"],
-        s["user_name"],
-        s["user_email"],
-        s["user_phone"],
-        s["user_role"],
-        s["user_status"],
-        s["organization_id"],
-        s["organization_name"],
-        s["organization_type"],
-        s["access_token"],
-        s["refresh_token"]
-    ))
-
-    conn.commit()
-    conn.close()
+    with conn:
+        cur = conn.cursor()
+
+        cur.execute("DELETE FROM auth_session")
+
+        cur.execute("""
+            INSERT INTO auth_session (
+                user_id, user_name, user_email, user_phone,
+                user_role, user_status,
+                organization_id, organization_name, organization_type,
+                access_token, refresh_token
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            s["user_id"],
+            s["user_name"],
+            s["user_email"],
+            s["user_phone"],
+            s["user_role"],
+            s["user_status"],
+            s["organization_id"],
+            s["organization_name"],
+            s["organization_type"],
+            s["access_token"],
+            s["refresh_token"]
+        ))
 
 
 def get_session():
@@ -135,31 +352,40 @@ def get_session():
     """)
 
     row = cur.fetchone()
-    conn.close()
     return row
 
 
+@traced(cat="db")
+def update_tokens(access_token, refresh_token):
+    conn = get_conn()
+    with conn:
+        conn.execute(
+            "UPDATE auth_session SET access_token = ?, refresh_token = ?",
+            (access_token, refresh_token)
+        )
+
+
+@traced(cat="db")
 def clear_session():
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM auth_session")
-    conn.commit()
-    conn.close()
+    with conn:
+        cur = conn.cursor()
+        cur.execute("DELETE FROM auth_session")
 
 
 # ---------- UPLOAD LOG ----------
-def log_upload(user_id, chapter_id, title, qid, status, error=None):
-    conn = get_conn()
-    cur = conn.cursor()
+LOG_UPLOAD_SQL = """
+    INSERT INTO question_upload_log
+    (user_id, chapter_id, question_title, question_id, status, error)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
 
-    cur.execute("""
-        INSERT INTO question_upload_log
-        (user_id, chapter_id, question_title, question_id, status, error)
-        VALUES (?, ?, ?, ?, ?, ?)
-    """, (user_id, chapter_id, title, qid, status, error))
 
-    conn.commit()
-    conn.close()
+@traced(cat="db")
+def log_upload(user_id, chapter_id, title, qid, status, error=None):
+    conn = get_conn()
+    with conn:
+        conn.execute(LOG_UPLOAD_SQL, (user_id, chapter_id, title, qid, status, error))
 
 def get_upload_report(user_id, chapter_id):
     conn = get_conn()
@@ -178,31 +404,49 @@ def get_upload_report(user_id, chapter_id):
     """, (user_id, chapter_id))
 
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 
 # ---------- QUESTIONS ----------
-def save_question(resp):
-    """Save full question API response to questions table."""
-    conn = get_conn()
-    cur = conn.cursor()
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
 
+
+def _normalize(text):
+    text = html.unescape(_TAG_RE.sub(" ", text or ""))
+    return _SPACE_RE.sub(" ", text).strip().casefold()
+
+
+def question_content_hash(title, description, options):
+    """
+    Hash of a question's normalized content (title, description, options a-d).
+    HTML tags, entities, case and whitespace are ignored, so a CSV row and
+    the API response it produced hash the same.
+    """
+    parts = [_normalize(title), _normalize(description)]
+    parts += [_normalize((options or {}).get(k)) for k in ("a", "b", "c", "d")]
+    return hashlib.sha1("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+SAVE_QUESTION_SQL = """
+    INSERT OR IGNORE INTO questions (
+        question_id, version_id, question_title,
+        question_description, question_type, difficulty_level,
+        marks, duration, options_json, correct_options,
+        answer_explanation, parent_id, parent_type,
+        subject_reference, organization_reference,
+        status, scope, source_category, source,
+        applications, created_by_name, created_by_email,
+        api_created_at, content_hash
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _question_params(resp):
     ver = resp.get("version", {})
     sol = ver.get("solution", {})
 
-    cur.execute("""
-        INSERT OR IGNORE INTO questions (
-            question_id, version_id, question_title,
-            question_description, question_type, difficulty_level,
-            marks, duration, options_json, correct_options,
-            answer_explanation, parent_id, parent_type,
-            subject_reference, organization_reference,
-            status, scope, source_category, source,
-            applications, created_by_name, created_by_email,
-            api_created_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    return (
         resp.get("id"),
         ver.get("id"),
         resp.get("questionTitle"),
@@ -226,10 +470,20 @@ def save_question(resp):
         ver.get("createdByName"),
         ver.get("createdByEmail"),
         ver.get("createdOn"),
-    ))
+        question_content_hash(
+            resp.get("questionTitle"),
+            ver.get("questionDescription"),
+            sol.get("options", {})
+        ),
+    )
+
 
-    conn.commit()
-    conn.close()
+@traced(cat="db")
+def save_question(resp):
+    """Save full question API response to questions table."""
+    conn = get_conn()
+    with conn:
+        conn.execute(SAVE_QUESTION_SQL, _question_params(resp))
 
 
 def get_questions_by_chapter(chapter_id):
@@ -247,5 +501,267 @@ def get_questions_by_chapter(chapter_id):
     """, (chapter_id,))
 
     rows = cur.fetchall()
-    conn.close()
     return rows
+
+
+def get_content_hashes(chapter_id):
+    """Return the content hashes of every saved question in a chapter."""
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT content_hash
+        FROM questions
+        WHERE parent_id = ? AND content_hash IS NOT NULL
+    """, (chapter_id,))
+
+    return {r[0] for r in cur}
+
+
+# ---------- CATALOG CACHE ----------
+def get_catalog(entity, key):
+    """Return (items, fetched_at) of a cached list, or (None, None)."""
+    conn = get_conn()
+    row = conn.execute("""
+        SELECT payload, fetched_at
+        FROM catalog_cache
+        WHERE entity = ? AND cache_key = ?
+    """, (entity, key)).fetchone()
+
+    if not row:
+        return None, None
+    return json.loads(row[0]), row[1]
+
+
+@traced(cat="db")
+def save_catalog(entity, key, items, fetched_at):
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            INSERT OR REPLACE INTO catalog_cache (entity, cache_key, payload, fetched_at)
+            VALUES (?, ?, ?, ?)
+        """, (entity, key, json.dumps(items), fetched_at))
+
+
+@traced(cat="db")
+def expire_catalog():
+    """Mark every cached list stale (still shown, refetched in background)."""
+    conn = get_conn()
+    with conn:
+        conn.execute("UPDATE catalog_cache SET fetched_at = 0")
+
+
+@traced(cat="db")
+def clear_catalog():
+    conn = get_conn()
+    with conn:
+        conn.execute("DELETE FROM catalog_cache")
+
+
+# ---------- RESUME JOURNAL ----------
+# statuses that mean the row is on the server and must not be sent again
+JOURNAL_DONE = ("SUCCESS", "DUPLICATE")
+
+JOURNAL_SQL = """
+    INSERT INTO upload_journal (chapter_id, fingerprint, row_no, status, question_id)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (chapter_id, fingerprint) DO UPDATE SET
+        row_no = excluded.row_no,
+        status = excluded.status,
+        question_id = excluded.question_id,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+@traced(cat="db")
+def journal_row(chapter_id, fingerprint, row_no, status, qid=None):
+    conn = get_conn()
+    with conn:
+        conn.execute(JOURNAL_SQL, (chapter_id, fingerprint, row_no, status, qid))
+
+
+def get_completed_fingerprints(chapter_id):
+    """Return the set of row fingerprints already uploaded to a chapter."""
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT fingerprint
+        FROM upload_journal
+        WHERE chapter_id = ? AND status IN (?, ?)
+    """, (chapter_id, *JOURNAL_DONE))
+
+    return {r[0] for r in cur}
+
+
+# ---------- DEAD LETTERS ----------
+DEAD_LETTER_SQL = """
+    INSERT INTO dead_letter (
+        chapter_id, fingerprint, row_no, subject_id, organization_id,
+        question_title, content_hash, payload, attempts, last_error
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (chapter_id, fingerprint) DO UPDATE SET
+        row_no = excluded.row_no,
+        payload = excluded.payload,
+        attempts = dead_letter.attempts + excluded.attempts,
+        last_error = excluded.last_error,
+        created_at = CURRENT_TIMESTAMP
+"""
+
+DROP_DEAD_LETTER_SQL = "DELETE FROM dead_letter WHERE chapter_id = ? AND fingerprint = ?"
+
+
+@traced(cat="db")
+def dead_letter_row(chapter_id, fingerprint, row_no, subject_id, organization_id,
+                    title, content_hash, payload, attempts, error):
+    conn = get_conn()
+    with conn:
+        conn.execute(DEAD_LETTER_SQL, (
+            chapter_id, fingerprint, row_no, subject_id, organization_id,
+            title, content_hash, payload, attempts, error
+        ))
+
+
+@traced(cat="db")
+def drop_dead_letter(chapter_id, fingerprint):
+    conn = get_conn()
+    with conn:
+        conn.execute(DROP_DEAD_LETTER_SQL, (chapter_id, fingerprint))
+
+
+def get_dead_letter_summary():
+    """Return [(chapter_id, subject_id, organization_id, rows)] with dead letters."""
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT chapter_id, MAX(subject_id), MAX(organization_id), COUNT(*)
+        FROM dead_letter
+        GROUP BY chapter_id
+        ORDER BY MIN(id)
+    """)
+    return cur.fetchall()
+
+
+def count_dead_letters():
+    return get_conn().execute("SELECT COUNT(*) FROM dead_letter").fetchone()[0]
+
+
+def get_dead_letters(chapter_id):
+    """Return (fingerprint, row_no, title, content_hash, payload, attempts) rows of one chapter."""
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT fingerprint, row_no, question_title, content_hash, payload, attempts
+        FROM dead_letter
+        WHERE chapter_id = ?
+        ORDER BY row_no, id
+    """, (chapter_id,))
+    return cur.fetchall()
+
+
+# ---------- UPLOAD METRICS ----------
+# runs whose metrics are kept; older runs and their request timings are dropped
+KEEP_METRIC_RUNS = 100
+
+REQUEST_TIMING_SQL = """
+    INSERT INTO upload_request_timing (
+        run_id, row_no, attempt, http_status, error,
+        wait_ms, pool_ms, connect_ms, ttfb_ms, total_ms, offset_s
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+UPLOAD_RUN_SQL = """
+    INSERT OR REPLACE INTO upload_run (
+        run_id, started_at, user_id, chapter_id, source, elapsed, concurrency,
+        questions, success, duplicate, failed, skipped,
+        requests, errors, p50_ms, p95_ms, p99_ms, per_second, timeline
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _prune_metrics(conn):
+    """Drop runs beyond the newest KEEP_METRIC_RUNS, with their request timings."""
+    old = [r[0] for r in conn.execute("""
+        SELECT run_id FROM upload_run
+        ORDER BY started_at DESC
+        LIMIT -1 OFFSET ?
+    """, (KEEP_METRIC_RUNS,))]
+
+    if old:
+        conn.executemany("DELETE FROM upload_request_timing WHERE run_id = ?", [(r,) for r in old])
+        conn.executemany("DELETE FROM upload_run WHERE run_id = ?", [(r,) for r in old])
+
+
+@traced(cat="db")
+def log_request_timing(*row):
+    conn = get_conn()
+    with conn:
+        conn.execute(REQUEST_TIMING_SQL, row)
+
+
+@traced(cat="db")
+def save_upload_run(*row):
+    conn = get_conn()
+    with conn:
+        conn.execute(UPLOAD_RUN_SQL, row)
+        _prune_metrics(conn)
+
+
+def get_recent_runs(limit):
+    """
+    Return the newest runs as (run_id, started_at, chapter_id, source,
+    elapsed, concurrency, questions, requests, errors, p50_ms, p95_ms,
+    p99_ms, per_second, timeline).
+    """
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT run_id, started_at, chapter_id, source, elapsed, concurrency, questions,
+               requests, errors, p50_ms, p95_ms, p99_ms, per_second, timeline
+        FROM upload_run
+        ORDER BY started_at DESC
+        LIMIT ?
+    """, (limit,))
+    return cur.fetchall()
+
+
+def get_run_timings(run_id):
+    """Return (row_no, attempt, http_status, wait, pool, connect, ttfb, total, offset, error) in send order."""
+    conn = get_conn()
+    cur = conn.execute("""
+        SELECT row_no, attempt, http_status, wait_ms, pool_ms, connect_ms,
+               ttfb_ms, total_ms, offset_s, error
+        FROM upload_request_timing
+        WHERE run_id = ?
+        ORDER BY offset_s, id
+    """, (run_id,))
+    return cur.fetchall()
+
+
+# ---------- BATCH WRITES ----------
+@traced(cat="db", detail=lambda *batches: {"rows": sum(len(b) for b in batches)})
+def write_upload_batch(logs, questions, journal=(), dead=(), undead=(), timings=(), runs=()):
+    """
+    Write many upload log rows (tuples in log_upload argument order),
+    question API responses, journal entries (tuples in journal_row
+    argument order), dead letters (dead_letter_row order), dead letter
+    removals ((chapter_id, fingerprint)), request timings and run
+    summaries (log_request_timing / save_upload_run order) in a single
+    transaction.
+    """
+    conn = get_conn()
+    with conn:
+        if questions:
+            conn.executemany(SAVE_QUESTION_SQL, [_question_params(r) for r in questions])
+        if logs:
+            conn.executemany(LOG_UPLOAD_SQL, logs)
+        if journal:
+            conn.executemany(JOURNAL_SQL, journal)
+        if undead:
+            conn.executemany(DROP_DEAD_LETTER_SQL, undead)
+        if dead:
+            conn.executemany(DEAD_LETTER_SQL, dead)
+        if timings:
+            conn.executemany(REQUEST_TIMING_SQL, timings)
+        if runs:
+            conn.executemany(UPLOAD_RUN_SQL, runs)
+            _prune_metrics(conn)
+
+
+@traced(cat="db")
+def checkpoint():
+    """Force the WAL into the main database file and sync it to disk."""
+    get_conn().execute("PRAGMA wal_checkpoint(FULL)")
@@ -0,0 +1,351 @@
+import os
+import csv
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+from db import get_session, get_dead_letter_summary, get_dead_letters
+from token_manager import tokens
+from csv_validator import validate_file
+from bulk_question_uploader import UploadRun, DEFAULT_CONCURRENCY
+from job_scheduler import UploadJob, UploadScheduler
+
+# exit codes
+EXIT_OK = 0              # every row uploaded, duplicate or resumed
+EXIT_ROW_ERRORS = 1      # finished, but some rows FAILED or were SKIPPED
+EXIT_BAD_INPUT = 2       # bad arguments, missing file, header mismatch, --strict
+EXIT_AUTH = 3            # not logged in, or session expired mid-run
+
+# seconds between two "progress" events
+PROGRESS_INTERVAL = 5
+
+# invalid rows listed in the "validation" event
+MAX_REPORTED_ERRORS = 100
+
+
+def _emit(event, **fields):
+    """Write one JSON line to stdout."""
+    sys.stdout.write(json.dumps({"event": event, **fields}) + "\n")
+    sys.stdout.flush()
+
+
+# ---------------- UPLOAD ---------------- #
+
+def _progress_fields(run, started):
+    elapsed = time.monotonic() - started
+    return {
+        "done": run.done,
+        "total": run.total,
+        "rows_read": run.rows_read,
+        "counts": run.counts,
+        "rate": round(run.limiter.rate, 2),
+        "rate_reason": run.limiter.reason,
+        "per_second": round(run.done / elapsed, 2) if elapsed else 0.0,
+        "elapsed": round(elapsed, 1),
+        "queues": run.queue_depths(),
+        "retries_scheduled": run.retries.scheduled,
+        "dead_lettered": run.dead_lettered,
+        "token_refreshes": tokens.refreshes
+    }
+
+
+def run_upload(args):
+    """Upload one CSV into one chapter without curses. Returns an exit code."""
+    if not os.path.isfile(args.csv):
+        _emit("error", message=f"CSV not found: {args.csv}")
+        return EXIT_BAD_INPUT
+
+    session = get_session()
+    if not session:
+        _emit("error", message="Not logged in. Run the app once and log in first.")
+        return EXIT_AUTH
+
+    if not args.skip_validation:
+        report = validate_file(args.csv)
+
+        if report.unreadable:
+            _emit("error", message=f"CSV is not a UTF-8 text file: {report.unreadable}")
+            return EXIT_BAD_INPUT
+
+        if not report.header_ok:
+            _emit("error", message="CSV header mismatch", headers=report.headers)
+            return EXIT_BAD_INPUT
+
+        _emit(
+            "validation",
+            rows=report.total_rows,
+            valid=report.valid_rows,
+            invalid=report.error_count,
+            by_difficulty=report.by_difficulty,
+            errors=[
+                {"line": line, "problem": problem}
+                for line, problem in report.errors[:MAX_REPORTED_ERRORS]
+            ]
+        )
+
+        if not report.total_rows:
+            _emit("error", message="CSV has no data rows")
+            return EXIT_BAD_INPUT
+
+        if report.error_count and args.strict:
+            _emit("error", message="CSV has invalid rows (--strict)")
+            return EXIT_BAD_INPUT
+
+    run = UploadRun(
+        args.csv,
+        args.chapter,
+        args.subject,
+        session[6],
+        user_id=session[0],
+        concurrency=args.concurrency,
+        resume=args.resume,
+        force=args.force
+    )
+
+    _emit(
+        "start",
+        csv=args.csv,
+        subject=args.subject,
+        chapter=args.chapter,
+        concurrency=args.concurrency,
+        resume=args.resume,
+        force=args.force
+    )
+
+    return _execute(run, args)
+
+
+def _execute(run, args):
+    """Run an UploadRun to the end, emitting row / progress / done events."""
+    started = time.monotonic()
+    last_progress = started
+
+    def on_update(idx, title, status, qid, error):
+        nonlocal last_progress
+
+        if not args.quiet:
+            _emit("row", row=idx, title=title, status=status, question_id=qid, error=error)
+
+        now = time.monotonic()
+        if now - last_progress >= PROGRESS_INTERVAL:
+            last_progress = now
+            _emit("progress", **_progress_fields(run, started))
+
+    run.on_update = on_update
+
+    try:
+        asyncio.run(run.run())
+    except KeyboardInterrupt:
+        _emit("interrupted", **_progress_fields(run, started))
+        return EXIT_ROW_ERRORS
+    finally:
+        run.results.close()
+
+    if run.expired:
+        _emit("error", message="Session expired. Please login again.", **_progress_fields(run, started))
+        return EXIT_AUTH
+
+    _emit("done", **_progress_fields(run, started), metrics=run.metrics_summary())
+
+    if run.counts["FAILED"] or run.counts["SKIPPED"]:
+        return EXIT_ROW_ERRORS
+    return EXIT_OK
+
+
+# ---------------- REDRIVE ---------------- #
+
+def run_redrive(args):
+    """Send the dead letters again (all chapters, or --chapter). Returns an exit code."""
+    session = get_session()
+    if not session:
+        _emit("error", message="Not logged in. Run the app once and log in first.")
+        return EXIT_AUTH
+
+    summary = [r for r in get_dead_letter_summary() if not args.chapter or r[0] == args.chapter]
+    if not summary:
+        _emit("done", message="No dead letters")
+        return EXIT_OK
+
+    code = EXIT_OK
+
+    for chapter_id, subject_id, organization_id, count in summary:
+        run = UploadRun(
+            None,
+            chapter_id,
+            subject_id,
+            organization_id,
+            user_id=session[0],
+            concurrency=args.concurrency,
+            dead_letters=get_dead_letters(chapter_id)
+        )
+
+        _emit("start", redrive=True, chapter=chapter_id, subject=subject_id, rows=count,
+              concurrency=args.concurrency)
+
+        code = max(code, _execute(run, args))
+        if code == EXIT_AUTH:
+            break
+
+    return code
+
+
+# ---------------- BATCH ---------------- #
+
+def _read_jobs(path):
+    """Jobs file: CSV with columns csv, chapter, subject (header row required)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    jobs = []
+    for line, row in enumerate(rows, start=2):
+        if not all((row.get(k) or "").strip() for k in ("csv", "chapter", "subject")):
+            raise ValueError(f"line {line}: csv, chapter and subject are required")
+        jobs.append(UploadJob(row["csv"].strip(), row["chapter"].strip(), row["subject"].strip()))
+    return jobs
+
+
+def run_batch(args):
+    """Upload several CSVs into several chapters at once. Returns an exit code."""
+    try:
+        jobs = _read_jobs(args.jobs)
+    except (OSError, ValueError, csv.Error) as e:
+        _emit("error", message=f"Bad jobs file: {e}")
+        return EXIT_BAD_INPUT
+
+    missing = [job.csv_file for job in jobs if not os.path.isfile(job.csv_file)]
+    if not jobs or missing:
+        _emit("error", message="No jobs" if not jobs else f"CSV not found: {', '.join(missing)}")
+        return EXIT_BAD_INPUT
+
+    session = get_session()
+    if not session:
+        _emit("error", message="Not logged in. Run the app once and log in first.")
+        return EXIT_AUTH
+
+    for job in jobs:
+        job.resume, job.force = args.resume, args.force
+
+    started = time.monotonic()
+    last_progress = started
+
+    def progress():
+        return {
+            "elapsed": round(time.monotonic() - started, 1),
+            "in_flight": scheduler.gate.in_flight,
+            "rate": round(scheduler.limiter.rate, 2),
+            "totals": scheduler.totals(),
+            "jobs": [
+                {"job": i, "state": job.state, "done": job.run.done, "total": job.run.total,
+                 "counts": job.run.counts, "error": job.error}
+                for i, job in enumerate(jobs)
+            ]
+        }
+
+    def on_update(job, idx, title, status, qid, error):
+        nonlocal last_progress
+
+        if not args.quiet:
+            _emit("row", job=jobs.index(job), row=idx, title=title, status=status,
+                  question_id=qid, error=error)
+
+        now = time.monotonic()
+        if now - last_progress >= PROGRESS_INTERVAL:
+            last_progress = now
+            _emit("progress", **progress())
+
+    scheduler = UploadScheduler(jobs, session[6], session[0], args.concurrency, on_update)
+
+    _emit(
+        "start",
+        jobs=[{"job": i, "csv": job.csv_file, "chapter": job.chapter_id, "subject": job.subject_id}
+              for i, job in enumerate(jobs)],
+        concurrency=args.concurrency
+    )
+
+    try:
+        asyncio.run(scheduler.run())
+    except KeyboardInterrupt:
+        _emit("interrupted", **progress())
+        return EXIT_ROW_ERRORS
+    finally:
+        scheduler.close()
+
+    if scheduler.expired:
+        _emit("error", message="Session expired. Please login again.", **progress())
+        return EXIT_AUTH
+
+    _emit("done", **progress(), metrics=[job.run.metrics_summary() for job in jobs])
+
+    totals = scheduler.totals()
+    if totals.get("FAILED") or totals.get("SKIPPED") or any(job.state == "error" for job in jobs):
+        return EXIT_ROW_ERRORS
+    return EXIT_OK
+
+
+# ---------------- ENTRY ---------------- #
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="TopBrains CLI — headless commands (run without arguments for the menu)."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    upload = commands.add_parser("upload", help="upload an MCQ CSV into a chapter")
+    upload.add_argument("--csv", required=True, help="path to the question CSV")
+    upload.add_argument("--subject", required=True, help="subject ID (subjectReference)")
+    upload.add_argument("--chapter", required=True, help="chapter ID to upload into")
+    upload.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"requests in flight at once (default {DEFAULT_CONCURRENCY})")
+    upload.add_argument("--resume", action="store_true",
+                        help="skip rows a previous run already uploaded")
+    upload.add_argument("--force", action="store_true",
+                        help="send rows even if they match a locally saved question")
+    upload.add_argument("--strict", action="store_true",
+                        help="refuse to upload when any row is invalid")
+    upload.add_argument("--skip-validation", action="store_true",
+                        help="do not pre-validate the whole file")
+    upload.add_argument("--quiet", action="store_true",
+                        help="no per-row events, only progress and summary")
+    upload.set_defaults(func=run_upload)
+
+    redrive = commands.add_parser("redrive", help="send rows that ran out of retries again")
+    redrive.add_argument("--chapter", help="only this chapter's dead letters")
+    redrive.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                         help=f"requests in flight at once (default {DEFAULT_CONCURRENCY})")
+    redrive.add_argument("--quiet", action="store_true",
+                         help="no per-row events, only progress and summary")
+    redrive.set_defaults(func=run_redrive)
+
+    batch = commands.add_parser("batch", help="upload several CSVs into several chapters at once")
+    batch.add_argument("--jobs", required=True,
+                       help="CSV file with columns csv,chapter,subject — one job per line")
+    batch.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+                       help=f"requests in flight across all jobs (default {DEFAULT_CONCURRENCY})")
+    batch.add_argument("--resume", action="store_true",
+                       help="skip rows a previous run already uploaded")
+    batch.add_argument("--force", action="store_true",
+                       help="send rows even if they match a locally saved question")
+    batch.add_argument("--quiet", action="store_true",
+                       help="no per-row events, only progress and summary")
+    batch.set_defaults(func=run_batch)
+
+    return parser
+
+
+def run_cli(argv):
+    """Parse headless arguments and run the command. Returns an exit code."""
+    parser = _parser()
+
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_BAD_INPUT if e.code else EXIT_OK
+
+    if getattr(args, "concurrency", 1) < 1:
+        _emit("error", message="--concurrency must be at least 1")
+        return EXIT_BAD_INPUT
+
+    return args.func(args)
@@ -0,0 +1,346 @@
+import os
+import curses
+import asyncio
+from collections import OrderedDict, deque
+
+from db import get_session
+from table_renderer import scrollable_table, fit
+from rate_limiter import AdaptiveRateLimiter
+from upload_transport import UploadTransport
+from write_behind import WriteBehindWriter
+from list_view import ListView
+from syllabus_selector import select_syllabus
+from chapter_selector import select_chapter
+from csv_selector import select_csv, validate_csv
+from bulk_question_uploader import (
+    UploadRun,
+    LiveView,
+    DEFAULT_CONCURRENCY,
+    select_concurrency,
+    select_resume,
+    select_duplicate_check
+)
+
+REPORT_HEADERS = ["#", "Question Title", "Status", "Error"]
+
+
+class FairGate:
+    """
+    Global cap on requests in flight, shared by every job of a batch.
+
+    A slot that frees up goes to the next job in round-robin order that has
+    a request waiting. A big job with many rows therefore gets the same
+    share as each small one, instead of queueing ahead of them.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiting = OrderedDict()   # job -> deque of futures, in turn order
+
+    async def acquire(self, job):
+        if self.in_flight < self.limit and not self._waiting:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(job, deque()).append(future)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(job)       # granted just as we were cancelled
+            raise
+
+    def release(self, job):
+        self.in_flight -= 1
+        self._grant()
+
+    def _grant(self):
+        while self.in_flight < self.limit and self._waiting:
+            job, waiters = self._waiting.popitem(last=False)
+            future = waiters.popleft()
+
+            # this job had its turn — back of the line if it still waits
+            if waiters:
+                self._waiting[job] = waiters
+
+            if future.cancelled():
+                continue
+
+            self.in_flight += 1
+            future.set_result(None)
+
+
+class UploadJob:
+    """One (CSV, chapter, subject) entry of a batch, with its own run and report."""
+
+    def __init__(self, csv_file, chapter_id, subject_id, chapter_name=None, resume=False, force=False):
+        self.csv_file = csv_file
+        self.chapter_id = chapter_id
+        self.subject_id = subject_id
+        self.chapter_name = chapter_name or chapter_id
+        self.resume = resume
+        self.force = force
+
+        self.run = None
+        self.state = "queued"       # queued / running / done / expired / error
+        self.error = None
+
+    @property
+    def label(self):
+        return f"{os.path.basename(self.csv_file)} -> {self.chapter_name}"
+
+
+class UploadScheduler:
+    """
+    Runs many UploadJobs at once in one event loop. They share one
+    FairGate (the global in-flight cap), one rate limiter, one aiohttp
+    session and one write-behind writer. Each job keeps its own counters,
+    results and report.
+    """
+
+    def __init__(self, jobs, organization_id, user_id, max_in_flight=DEFAULT_CONCURRENCY, on_update=None):
+        self.jobs = jobs
+        self.gate = FairGate(max_in_flight)
+        self.limiter = AdaptiveRateLimiter()
+        self.transport = UploadTransport(per_host_limit=max_in_flight)
+        self.finished = False
+
+        for job in jobs:
+            job.run = UploadRun(
+                job.csv_file,
+                job.chapter_id,
+                job.subject_id,
+                organization_id,
+                user_id=user_id,
+                # a job alone may use every slot; the gate keeps the total
+                concurrency=max_in_flight,
+                resume=job.resume,
+                force=job.force,
+                on_update=(lambda *row, job=job: on_update(job, *row)) if on_update else None,
+                gate=self.gate,
+                limiter=self.limiter,
+                transport=self.transport
+            )
+
+    @property
+    def expired(self):
+        return any(job.state == "expired" for job in self.jobs)
+
+    def totals(self):
+        totals = {}
+        for job in self.jobs:
+            for status, n in job.run.counts.items():
+                totals[status] = totals.get(status, 0) + n
+        return totals
+
+    async def _run_job(self, job, session, writer):
+        job.state = "running"
+        try:
+            await job.run.run(session=session, writer=writer)
+        except Exception as e:
+            job.state = "error"
+            job.error = str(e)
+            return
+
+        job.state = "expired" if job.run.expired else "done"
+
+    async def run(self):
+        writer = WriteBehindWriter()
+        try:
+            async with self.transport.session() as session:
+                await asyncio.gather(*(self._run_job(job, session, writer) for job in self.jobs))
+        finally:
+            writer.close()
+            self.finished = True
+
+    def close(self):
+        for job in self.jobs:
+            if job.run:
+                job.run.results.close()
+
+
+# ---------------- LIVE SCREEN ---------------- #
+
+class JobsView(LiveView):
+    """Live screen for a batch: one line per job, same frame diffing as LiveView."""
+
+    COLUMNS = [("Job", 34), ("Progress", 12), ("Success", 8), ("Dup", 6),
+               ("Failed", 7), ("Skipped", 8), ("State", 8)]
+
+    def _row(self, cells):
+        return "  ".join(fit(str(c), cw) for c, (_, cw) in zip(cells, self.COLUMNS))
+
+    def _compose(self, h):
+        scheduler = self.run
+        jobs = scheduler.jobs
+        totals = scheduler.totals()
+        lines = {}
+
+        finished = sum(job.state not in ("queued", "running") for job in jobs)
+        lines[1] = (
+            f"Upload Jobs  {finished} / {len(jobs)} finished    "
+            f"In flight: {scheduler.gate.in_flight} / {scheduler.gate.limit}",
+            curses.A_BOLD
+        )
+        lines[2] = (
+            f"Success: {totals.get('SUCCESS', 0)}    Duplicate: {totals.get('DUPLICATE', 0)}"
+            f"    Failed: {totals.get('FAILED', 0)}    Skipped: {totals.get('SKIPPED', 0)}",
+            0
+        )
+        lines[3] = (f"Rate: {scheduler.limiter.rate:.1f}/s    ({scheduler.limiter.reason})    "
+                    f"{scheduler.transport.summary()}", 0)
+
+        lines[5] = (self._row([name for name, _ in self.COLUMNS]), curses.A_BOLD)
+
+        y = 6
+        for job in jobs[: max(0, h - 9)]:
+            run = job.run
+            total = run.total if run.total is not None else f"{run.rows_read}+"
+            counts = run.counts
+            lines[y] = (self._row([
+                job.label, f"{run.done}/{total}", counts["SUCCESS"], counts["DUPLICATE"],
+                counts["FAILED"], counts["SKIPPED"], job.state
+            ]), 0)
+            y += 1
+
+        if len(jobs) > h - 9:
+            lines[y] = (f"... {len(jobs) - (h - 9)} more job(s)", 0)
+
+        if not scheduler.finished:
+            lines[h - 2] = ("Uploading...", 0)
+        else:
+            lines[h - 2] = ("Done! Press any key to pick a job report...", 0)
+
+        return lines
+
+
+# ---------------- SCREENS ---------------- #
+
+def _add_job(stdscr):
+    """Walk syllabus -> chapter -> CSV -> checks for one job. Returns an UploadJob or None."""
+    syllabus = select_syllabus(stdscr)
+    if not syllabus:
+        return None
+
+    chapter = select_chapter(stdscr, syllabus["subjectId"], syllabus["syllabusId"])
+    if not chapter:
+        return None
+
+    csv_file = select_csv(stdscr)
+    if not csv_file or not validate_csv(stdscr, csv_file):
+        return None
+
+    resume = select_resume(stdscr, csv_file, chapter["chapterId"])
+    if resume is None:
+        return None
+
+    force = select_duplicate_check(stdscr, csv_file, chapter["chapterId"])
+    if force is None:
+        return None
+
+    return UploadJob(
+        csv_file,
+        chapter["chapterId"],
+        syllabus["subjectId"],
+        chapter_name=chapter["chapterName"],
+        resume=resume,
+        force=force
+    )
+
+
+def _show_reports(stdscr, scheduler):
+    """Pick a job and open its report until Esc."""
+    jobs = scheduler.jobs
+    menu = ListView(stdscr, "Job Reports", "↑ ↓ move   Enter open report   Esc return")
+
+    def label(pos):
+        job = jobs[pos]
+        c = job.run.counts
+        return (f"{job.label}   [{job.state}]  S:{c['SUCCESS']} D:{c['DUPLICATE']}"
+                f" F:{c['FAILED']} K:{c['SKIPPED']}" + (f"  {job.error}" if job.error else ""))
+
+    while True:
+        menu.draw(len(jobs), label)
+        key = stdscr.getch()
+
+        if key == 27:
+            return
+        if key in (10, 13):
+            job = jobs[menu.current]
+            scrollable_table(
+                stdscr,
+                f"{job.label}  |  {job.state}",
+                REPORT_HEADERS,
+                job.run.results.table(REPORT_HEADERS)
+            )
+            menu.invalidate()
+            continue
+
+        menu.key(key, len(jobs))
+
+
+async def _run_scheduler(stdscr, scheduler):
+    view = JobsView(stdscr, scheduler)
+    ticker = asyncio.create_task(view.animate())
+    try:
+        await scheduler.run()
+    finally:
+        ticker.cancel()
+
+    view.draw()
+
+
+def upload_job_queue(stdscr):
+    """Queue several CSV -> chapter uploads, then run them together."""
+    jobs = []
+    menu = ListView(stdscr, "Upload Job Queue", "a add job   d remove job   Enter start all   Esc cancel")
+
+    while True:
+        if jobs:
+            menu.draw(len(jobs), lambda pos: jobs[pos].label,
+                      status=f"({len(jobs)} job(s))")
+        else:
+            menu.draw(0, str, search="No jobs yet — press a to add one.")
+
+        key = stdscr.getch()
+
+        if key == 27:
+            return
+        elif key in (ord("a"), ord("A")):
+            job = _add_job(stdscr)
+            if job:
+                jobs.append(job)
+                menu.current = len(jobs) - 1
+            menu.invalidate()
+        elif key in (ord("d"), ord("D")) and jobs:
+            jobs.pop(menu.current)
+        elif key in (10, 13) and jobs:
+            break
+        else:
+            menu.key(key, len(jobs))
+
+    max_in_flight = select_concurrency(stdscr)
+    if not max_in_flight:
+        return
+
+    session = get_session()
+    if not session:
+        return
+
+    scheduler = UploadScheduler(jobs, session[6], session[0], max_in_flight)
+
+    try:
+        asyncio.run(_run_scheduler(stdscr, scheduler))
+
+        if scheduler.expired:
+            stdscr.clear()
+            stdscr.addstr(5, 4, "Session expired. Please login again.")
+            stdscr.addstr(7, 4, "Press any key to see what was uploaded...")
+        stdscr.getch()
+
+        _show_reports(stdscr, scheduler)
+    finally:
+        scheduler.close()
@@ -0,0 +1,190 @@
+import curses
+
+import catalog
+from table_renderer import fit
+from search_index import TypeAhead
+from profiling import traced
+
+# first screen row of the list (title, underline and search line above it)
+LIST_Y = 4
+
+
+class ListView:
+    """
+    Scrolling pick-one list shared by the selectors and the main menu.
+
+    Only the rows inside the visible window are drawn, and each draw()
+    rewrites just the screen lines whose text or highlight changed —
+    moving the cursor within the window touches two rows, typing a search
+    touches the rows whose entry changed. A new terminal size starts over
+    from a blank screen.
+    """
+
+    def __init__(self, stdscr, title, footer, title_attr=0):
+        self.stdscr = stdscr
+        self.title = title
+        self.footer = footer
+        self.title_attr = title_attr
+
+        self.current = 0
+        self.top = 0            # list position shown on the first row
+
+        self._lines = {}        # y -> (x, text, attr) currently on screen
+        self._size = None
+        self._visible = 1
+
+    def reset(self):
+        """Back to the first entry (e.g. the list was filtered)."""
+        self.current = 0
+        self.top = 0
+
+    def invalidate(self):
+        """Forget what is on screen; the next draw() repaints everything."""
+        self._size = None
+
+    # -------- KEYS -------- #
+
+    def key(self, key, count):
+        """Apply a navigation key for a list of `count` entries. True if handled."""
+        if key == curses.KEY_RESIZE:
+            self.invalidate()
+            return True
+
+        if not count:
+            return False
+
+        if key == curses.KEY_UP:
+            self.current = (self.current - 1) % count
+        elif key == curses.KEY_DOWN:
+            self.current = (self.current + 1) % count
+        elif key == curses.KEY_PPAGE:
+            self.current = max(0, self.current - self._visible)
+        elif key == curses.KEY_NPAGE:
+            self.current = min(count - 1, self.current + self._visible)
+        elif key == curses.KEY_HOME:
+            self.current = 0
+        elif key == curses.KEY_END:
+            self.current = count - 1
+        else:
+            return False
+
+        return True
+
+    # -------- DRAW -------- #
+
+    def _compose(self, h, w, count, label, status, search):
+        lines = {}
+
+        title = self.title + (f"   {status}" if status else "")
+        lines[1] = (2, title, self.title_attr)
+        lines[2] = (2, "-" * min(len(self.title), w - 4), 0)
+        if search:
+            lines[3] = (2, search, 0)
+
+        # keep the cursor inside the window, scrolling as little as possible
+        visible = self._visible = max(1, h - LIST_Y - 4)
+        self.current = min(self.current, max(0, count - 1))
+        if self.current < self.top:
+            self.top = self.current
+        elif self.current >= self.top + visible:
+            self.top = self.current - visible + 1
+        self.top = max(0, min(self.top, count - visible))
+
+        for pos in range(self.top, min(count, self.top + visible)):
+            text = fit(label(pos), w - 8).rstrip()
+            attr = curses.A_REVERSE if pos == self.current else 0
+            lines[LIST_Y + pos - self.top] = (4, text, attr)
+
+        lines[h - 2] = (2, self.footer, 0)
+        return lines
+
+    @traced(cat="ui")
+    def draw(self, count, label, status="", search=""):
+        """
+        Paint the list. `label(pos)` gives the text of entry `pos`;
+        `status` follows the title, `search` goes on the line below it.
+        """
+        stdscr = self.stdscr
+        h, w = stdscr.getmaxyx()
+
+        if (h, w) != self._size:
+            # resized (or first frame) — start from a blank screen
+            self._size = (h, w)
+            self._lines = {}
+            stdscr.clear()
+
+        frame = self._compose(h, w, count, label, status, search)
+
+        for y in set(self._lines) | set(frame):
+            if y >= h - 1:
+                continue
+
+            line = frame.get(y, (0, "", 0))
+            if self._lines.get(y) == line:
+                continue
+
+            x, text, attr = line
+            stdscr.move(y, 0)
+            stdscr.clrtoeol()
+            if text and w - x - 1 > 0:
+                stdscr.addstr(y, x, fit(text, w - x - 1).rstrip(), attr)
+
+        self._lines = frame
+        stdscr.refresh()
+
+
+def pick(stdscr, title, items, label, refresh=None, reload=None, empty="❌ Nothing to select"):
+    """
+    Pick-one screen with type-ahead search over `items`, shown as
+    `label(item)`. Returns the chosen item, or None on Esc / empty list.
+
+    `refresh` is a running catalog.Revalidation whose list replaces
+    `items` when it arrives; `reload()` starts a new one on Ctrl-R.
+    """
+    search = TypeAhead(items, label)
+    keys = "↑ ↓ move   Enter select   type to search   "
+    menu = ListView(stdscr, title, keys + ("Ctrl-R refresh   " if reload else "") + "Esc cancel")
+
+    while True:
+        # swap in the background refresh / streamed pages
+        items, refresh = catalog.poll(items, refresh)
+        search.sync(items)
+        view = search.matches
+
+        if not items and not refresh:
+            stdscr.clear()
+            stdscr.addstr(4, 4, empty)
+            stdscr.addstr(6, 4, "Press any key to return...")
+            stdscr.getch()
+            return None
+
+        menu.draw(
+            len(view),
+            lambda pos: label(items[view[pos]]),
+            status=refresh.label if refresh else "",
+            search=f"Search: {search.query}   ({len(view)} of {len(items)})" if search.query else ""
+        )
+
+        stdscr.timeout(catalog.REFRESH_POLL_MS if refresh else -1)
+        key = stdscr.getch()
+        stdscr.timeout(-1)
+
+        if key == 27:
+            # Esc clears the search first, then cancels
+            if not search.query:
+                return None
+            search.clear()
+            menu.reset()
+            continue
+
+        if search.key(key):
+            menu.reset()
+            continue
+
+        if menu.key(key, len(view)) or key == -1 or not view:
+            continue
+
+        if key in (10, 13):
+            return items[view[menu.current]]
+        elif key == catalog.REFRESH_KEY and reload and not refresh:
+            refresh = reload()
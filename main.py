@@ -1,36 +1,31 @@
+import sys
 import curses
 
-from db import init_db, get_session
+import profiling
+
+from db import init_db, get_session, expire_catalog, count_dead_letters
 from auth import login, logout
 from syllabus_selector import select_syllabus
 from chapter_selector import select_chapter
 from csv_selector import select_csv, validate_csv
-from bulk_question_uploader import upload_all_questions
+from bulk_question_uploader import (
+    upload_all_questions,
+    select_concurrency,
+    select_resume,
+    select_duplicate_check,
+    redrive_dead_letters
+)
 from updater import update_app
+from headless import run_cli
+from job_scheduler import upload_job_queue
+from upload_metrics import show_upload_metrics
+from list_view import ListView
 
 
 # ---------------- UI HELPERS ---------------- #
 
-def draw_menu(stdscr, title, options, selected):
-    stdscr.clear()
-    h, w = stdscr.getmaxyx()
-
-    stdscr.addstr(1, 2, title[: w - 4], curses.A_BOLD)
-    stdscr.addstr(2, 2, "-" * min(len(title), w - 4))
-
-    for i, opt in enumerate(options):
-        y = 4 + i
-        if y >= h - 3:
-            break
-
-        text = opt[: w - 8]
-        if i == selected:
-            stdscr.addstr(y, 4, text, curses.A_REVERSE)
-        else:
-            stdscr.addstr(y, 4, text)
-
-    stdscr.addstr(h - 2, 2, "↑ ↓ move   Enter select")
-    stdscr.refresh()
+def draw_menu(menu, options):
+    menu.draw(len(options), options.__getitem__)
 
 
 # ---------------- MAIN MENU LOOP ---------------- #
@@ -53,27 +48,33 @@ def menu_loop(stdscr):
             title = f"Welcome {user_name} ({user_role}) | {org_name}"
             options = [
                 "Add MCQ Question",
+                "Upload Job Queue",
                 "Add Programming Question",
+                "Upload Metrics",
+                "Refresh Catalog",
                 "Update App",
                 "Logout",
                 "Exit"
             ]
 
-        selected = 0
+            # only offered while some rows ran out of retries
+            dead = count_dead_letters()
+            if dead:
+                options.insert(3, f"Retry Dead Letters ({dead})")
+
+        menu = ListView(stdscr, title, "↑ ↓ move   Enter select", title_attr=curses.A_BOLD)
 
         # -------- Navigation -------- #
         while True:
-            draw_menu(stdscr, title, options, selected)
+            draw_menu(menu, options)
             key = stdscr.getch()
 
-            if key == curses.KEY_UP:
-                selected = (selected - 1) % len(options)
-            elif key == curses.KEY_DOWN:
-                selected = (selected + 1) % len(options)
-            elif key in (10, 13):
-                choice = options[selected]
+            if key in (10, 13):
+                choice = options[menu.current]
                 break
 
+            menu.key(key, len(options))
+
         # -------- Action Handling -------- #
 
         try:
@@ -104,6 +105,18 @@ def menu_loop(stdscr):
                 if not validate_csv(stdscr, csv_file):
                     continue
 
+                resume = select_resume(stdscr, csv_file, chapter["chapterId"])
+                if resume is None:
+                    continue
+
+                force = select_duplicate_check(stdscr, csv_file, chapter["chapterId"])
+                if force is None:
+                    continue
+
+                concurrency = select_concurrency(stdscr)
+                if not concurrency:
+                    continue
+
                 session = get_session()
                 if not session:
                     continue
@@ -113,7 +126,10 @@ def menu_loop(stdscr):
                     csv_file,
                     chapter["chapterId"],
                     syllabus["subjectId"],
-                    session[6]
+                    session[6],
+                    concurrency,
+                    resume,
+                    force
                 )
 
             elif choice == "Add Programming Question":
@@ -122,6 +138,23 @@ def menu_loop(stdscr):
                 stdscr.addstr(7, 4, "Press any key to return...")
                 stdscr.getch()
 
+            elif choice == "Upload Job Queue":
+                upload_job_queue(stdscr)
+
+            elif choice == "Upload Metrics":
+                show_upload_metrics(stdscr)
+
+            elif choice.startswith("Retry Dead Letters"):
+                redrive_dead_letters(stdscr)
+
+            elif choice == "Refresh Catalog":
+                expire_catalog()
+                stdscr.clear()
+                stdscr.addstr(5, 4, "🔄 Catalog marked for refresh")
+                stdscr.addstr(6, 4, "Syllabus, chapter and batch lists reload in the background next time you open them.")
+                stdscr.addstr(8, 4, "Press any key to return...")
+                stdscr.getch()
+
             elif choice == "Update App":
                 update_app(stdscr)
 
@@ -139,7 +172,14 @@ def menu_loop(stdscr):
 # ---------------- ENTRY POINT ---------------- #
 
 def main():
+    # opt-in: TOPBRAINS_PROFILE=trace,cprofile,memory (see profiling.py)
+    profiling.start()
     init_db()
+
+    # any arguments -> headless command (no curses, JSON lines on stdout)
+    if len(sys.argv) > 1:
+        sys.exit(run_cli(sys.argv[1:]))
+
     curses.wrapper(menu_loop)
 
 
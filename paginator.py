@@ -0,0 +1,152 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from api_guard import api_call, ApiError
+from db import close_thread_conn
+
+# pages fetched at once after the first one
+PAGE_WORKERS = 4
+
+# safety stop when the server does not report totalPages
+MAX_PAGES = 500
+
+
+def _page_content(data):
+    """Return (content list, totalPages or None) from a paged API response."""
+    try:
+        page = data["response"]
+        content = page["content"]
+    except (KeyError, TypeError):
+        raise ApiError("Invalid paged response")
+
+    total = page.get("totalPages") if isinstance(page, dict) else None
+    return content, total if isinstance(total, int) else None
+
+
+class PagedFetch:
+    """
+    Fetches every page of a paged list endpoint (pageNo / pageSize).
+
+    - page 0 is fetched in the caller's thread (with the loader screen,
+      errors raised right away) and tells how many pages there are
+    - the remaining pages are fetched on a background thread pool of
+      up to PAGE_WORKERS requests at once
+    - `items` grows in page order as pages land, so a selector can show
+      it while the rest is still loading
+
+    `parse(content)` turns one page's content into list entries.
+    Call wait() for the complete list; it raises the first page error.
+    """
+
+    def __init__(self, stdscr, url, headers, params, page_size, parse, message="Loading..."):
+        self.url = url
+        self.headers = headers
+        self.params = params
+        self.page_size = page_size
+        self.parse = parse
+
+        self.items = []
+        self.pages_done = 0
+        self.total_pages = None     # None until known (server did not say)
+        self.error = None
+        self.done = False
+
+        content, total = self._get(stdscr, 0, message)
+        self._add(content)
+
+        if total is not None:
+            self.total_pages = max(total, 1)
+            more = self.total_pages > 1
+        else:
+            more = len(content) >= page_size
+
+        if not more:
+            self.total_pages = self.pages_done
+            self.done = True
+            self._thread = None
+            return
+
+        self._thread = threading.Thread(target=self._run, name="paged-fetch", daemon=True)
+        self._thread.start()
+
+    def _get(self, stdscr, page_no, message=None):
+        data = api_call(
+            stdscr,
+            "GET",
+            self.url,
+            headers=self.headers,
+            params={**self.params, "pageNo": page_no, "pageSize": self.page_size},
+            message=message
+        )
+        return _page_content(data)
+
+    def _add(self, content):
+        self.items.extend(self.parse(content))
+        self.pages_done += 1
+
+    def _run(self):
+        try:
+            if self.total_pages is None:
+                self._run_sequential()
+            else:
+                self._run_concurrent()
+        except Exception as e:
+            self.error = e
+        finally:
+            close_thread_conn()
+            self.done = True
+
+    def _get_in_worker(self, page_no):
+        """_get() on a pool thread, which closes the SQLite connection the token lookup opened."""
+        try:
+            return self._get(None, page_no)
+        finally:
+            close_thread_conn()
+
+    def _run_concurrent(self):
+        """Fetch pages 1..total-1, releasing them to `items` in page order."""
+        landed = {}
+        next_page = 1
+
+        with ThreadPoolExecutor(max_workers=min(PAGE_WORKERS, self.total_pages - 1)) as pool:
+            futures = {
+                pool.submit(self._get_in_worker, page_no): page_no
+                for page_no in range(1, self.total_pages)
+            }
+
+            try:
+                for future in as_completed(futures):
+                    landed[futures[future]] = future.result()[0]
+
+                    while next_page in landed:
+                        self._add(landed.pop(next_page))
+                        next_page += 1
+            except Exception:
+                for future in futures:
+                    future.cancel()
+                raise
+
+    def _run_sequential(self):
+        """No page count from the server: read on until a short page."""
+        page_no = 1
+        while page_no < MAX_PAGES:
+            content, _ = self._get(None, page_no)
+            self._add(content)
+            if len(content) < self.page_size:
+                break
+            page_no += 1
+
+        self.total_pages = self.pages_done
+
+    def progress(self):
+        """Short label like '3/10 pages'."""
+        total = self.total_pages if self.total_pages is not None else "?"
+        return f"{self.pages_done}/{total} pages"
+
+    def wait(self):
+        """Block until every page is in; return the full list."""
+        if self._thread:
+            self._thread.join()
+        if self.error:
+            raise self.error
+        return self.items
@@ -0,0 +1,248 @@
+import os
+import sys
+import json
+import time
+import atexit
+import asyncio
+import inspect
+import cProfile
+import functools
+import threading
+import tracemalloc
+
+# Opt-in instrumentation of the hot paths, off unless the flag is set:
+#
+#   TOPBRAINS_PROFILE=1                       span trace only
+#   TOPBRAINS_PROFILE=trace,cprofile,memory   any mix of the three
+#   TOPBRAINS_PROFILE=all                     all three
+#
+# When off, @traced returns the function untouched and span() does
+# nothing, so normal runs pay no cost.
+ENV_FLAG = "TOPBRAINS_PROFILE"
+ENV_DIR = "TOPBRAINS_PROFILE_DIR"
+DEFAULT_DIR = "profiles"
+
+MODES_ALL = ("trace", "cprofile", "memory")
+
+# spans kept per run; later ones are counted, not stored
+MAX_EVENTS = 500_000
+
+# tracemalloc: frames kept per allocation, lines in the text summary
+MEMORY_FRAMES = 10
+MEMORY_TOP = 30
+
+
+def _modes(value):
+    value = (value or "").strip().lower()
+    if value in ("", "0", "off", "false", "no"):
+        return frozenset()
+    if value in ("1", "on", "true", "yes"):
+        return frozenset({"trace"})
+    if value == "all":
+        return frozenset(MODES_ALL)
+    return frozenset(m.strip() for m in value.split(",") if m.strip())
+
+
+MODES = _modes(os.environ.get(ENV_FLAG))
+TRACING = "trace" in MODES
+
+_PID = os.getpid()
+_T0 = time.perf_counter()
+
+_events = []
+_dropped = 0
+_lanes = {}                 # ("task" | "thread", id) -> trace tid
+_lanes_lock = threading.Lock()
+
+_profile = None
+_started = False
+
+
+# ---------------- SPANS ---------------- #
+
+def _lane():
+    """
+    Trace row of the caller: one per asyncio task, so overlapping upload
+    workers get their own rows in the viewer, else one per thread.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+
+    key = ("task", id(task)) if task else ("thread", threading.get_ident())
+    tid = _lanes.get(key)
+
+    if tid is None:
+        with _lanes_lock:
+            tid = _lanes.get(key)
+            if tid is None:
+                tid = _lanes[key] = len(_lanes) + 1
+                name = task.get_name() if task else threading.current_thread().name
+                _events.append({"name": "thread_name", "ph": "M", "pid": _PID, "tid": tid,
+                                "args": {"name": name}})
+
+    return tid
+
+
+def _record(name, cat, start, end, tid, args):
+    global _dropped
+
+    if len(_events) >= MAX_EVENTS:
+        _dropped += 1
+        return
+
+    event = {
+        "name": name,
+        "cat": cat,
+        "ph": "X",
+        "ts": round((start - _T0) * 1e6, 1),
+        "dur": round((end - start) * 1e6, 1),
+        "pid": _PID,
+        "tid": tid
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+class span:
+    """`with span("name", "cat", key=value):` — one complete event in the trace."""
+
+    __slots__ = ("name", "cat", "args", "_tid", "_start")
+
+    def __init__(self, name, cat="app", **args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        if TRACING:
+            self._tid = _lane()
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if TRACING:
+            if exc_type is not None:
+                self.args["error"] = exc_type.__name__
+            _record(self.name, self.cat, self._start, time.perf_counter(), self._tid, self.args)
+        return False
+
+
+def traced(name=None, cat="app", detail=None):
+    """
+    Decorator: time every call of a function or coroutine as a span.
+    `detail(*args, **kwargs)` may return a dict stored with the span.
+    With tracing off the function is returned unchanged.
+    """
+    def wrap(func):
+        if not TRACING:
+            return func
+
+        label = name or func.__qualname__
+
+        def args_of(args, kwargs):
+            if detail is None:
+                return {}
+            try:
+                return detail(*args, **kwargs)
+            except Exception:
+                return {}
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def inner(*args, **kwargs):
+                with span(label, cat, **args_of(args, kwargs)):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def inner(*args, **kwargs):
+                with span(label, cat, **args_of(args, kwargs)):
+                    return func(*args, **kwargs)
+
+        return inner
+
+    return wrap
+
+
+# ---------------- RUN ---------------- #
+
+def start():
+    """Start the profilers the flag asks for (once, at startup). Output is written at exit."""
+    global _profile, _started
+
+    if not MODES or _started:
+        return
+    _started = True
+
+    unknown = MODES - set(MODES_ALL)
+    if unknown:
+        sys.stderr.write(f"{ENV_FLAG}: ignoring unknown mode(s) {', '.join(sorted(unknown))}\n")
+
+    if "memory" in MODES:
+        tracemalloc.start(MEMORY_FRAMES)
+
+    if "cprofile" in MODES:
+        # cProfile sees the main thread only — the curses UI and the upload event loop
+        _profile = cProfile.Profile()
+        _profile.enable()
+
+    atexit.register(stop)
+
+
+def _write_memory(base):
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    snapshot.dump(base + ".snapshot")
+
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(f"current {current / 1024:.0f} KiB    peak {peak / 1024:.0f} KiB\n\n")
+        f.write(f"Top {MEMORY_TOP} allocation sites still alive at exit:\n")
+        for stat in snapshot.statistics("lineno")[:MEMORY_TOP]:
+            f.write(f"{stat}\n")
+
+    return [base + ".snapshot", base + ".txt"]
+
+
+def stop():
+    """Write this run's trace / profile / memory files. Returns their paths."""
+    global _profile, _started
+
+    if not _started:
+        return []
+    _started = False
+    atexit.unregister(stop)
+
+    out_dir = os.environ.get(ENV_DIR) or DEFAULT_DIR
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{_PID}")
+    written = []
+
+    if _profile is not None:
+        _profile.disable()
+        _profile.dump_stats(base + ".prof")
+        _profile = None
+        written.append(base + ".prof")
+
+    if TRACING:
+        # Chrome trace event format — open in chrome://tracing or ui.perfetto.dev
+        with open(base + ".trace.json", "w", encoding="utf-8") as f:
+            json.dump({
+                "traceEvents": [
+                    {"name": "process_name", "ph": "M", "pid": _PID, "args": {"name": "topbrains"}},
+                    *_events
+                ],
+                "displayTimeUnit": "ms",
+                "otherData": {"argv": sys.argv, "dropped_spans": _dropped}
+            }, f)
+        written.append(base + ".trace.json")
+
+    if tracemalloc.is_tracing():
+        written += _write_memory(base + ".memory")
+
+    if written:
+        sys.stderr.write("Profiling output:\n" + "".join(f"  {p}\n" for p in written))
+    return written
@@ -1,12 +1,9 @@
 import csv
 import json
-import requests
-import urllib3
 from db import get_session
+from api_guard import api_call, api_url, AuthExpired, ApiError
 
-urllib3.disable_warnings()
-
-QUESTION_CREATE_URL = "https://topbrains.com/subject/v1/question"
+QUESTION_CREATE_URL = api_url("/subject/v1/question")
 
 
 def upload_first_question(
@@ -76,24 +73,31 @@ def upload_first_question(
         "questionRequest": (None, json.dumps(payload), "application/json")
     }
 
-    res = requests.post(
-        QUESTION_CREATE_URL,
-        headers=headers,
-        files=files,
-        verify=False
-    )
+    try:
+        data = api_call(
+            stdscr,
+            "POST",
+            QUESTION_CREATE_URL,
+            headers=headers,
+            files=files,
+            message="Uploading question..."
+        )
+    except AuthExpired:
+        data = {"statusCode": 401, "response": "Session expired. Please login again."}
+    except ApiError as e:
+        data = {"statusCode": 0, "response": str(e)}
 
     stdscr.clear()
 
-    if res.status_code in (200, 201):
-        body = res.json()["response"]
+    body = data.get("response")
+    if data.get("statusCode") in (200, 201) and isinstance(body, dict) and "id" in body:
         stdscr.addstr(4, 4, "✅ Question uploaded successfully")
         stdscr.addstr(6, 6, f"Question ID : {body['id']}")
         stdscr.addstr(7, 6, f"Title       : {body['questionTitle']}")
     else:
         stdscr.addstr(4, 4, "❌ Upload failed")
-        stdscr.addstr(6, 6, f"Status : {res.status_code}")
-        stdscr.addstr(7, 6, res.text[:200])
+        stdscr.addstr(6, 6, f"Status : {data.get('statusCode')}")
+        stdscr.addstr(7, 6, str(body)[:200])
 
     stdscr.addstr(10, 4, "Press any key to return...")
     stdscr.getch()
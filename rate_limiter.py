@@ -0,0 +1,139 @@
+import time
+import asyncio
+from email.utils import parsedate_to_datetime
+
+
+# ---------------- TUNING ---------------- #
+
+START_RATE = 1.0          # questions / sec — same pace as the old fixed sleep
+MIN_RATE = 0.2
+MAX_RATE = 50.0
+
+INCREASE_STEP = 0.5       # additive increase per healthy interval
+ADJUST_INTERVAL = 1.0     # seconds between two adjustments of the same kind
+
+BACKOFF_429 = 0.5         # multiplicative decrease factors
+BACKOFF_5XX = 0.7
+BACKOFF_SLOW = 0.85
+
+SLOW_FACTOR = 2.0         # latency this many times the baseline counts as "slow"
+LATENCY_ALPHA = 0.2       # EWMA smoothing for observed latency
+
+
+def parse_retry_after(value):
+    """Return Retry-After header as seconds (float) or None."""
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, when.timestamp() - time.time())
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket whose refill rate follows AIMD:
+    healthy responses raise it step by step, 429 / 5xx / latency growth cut it.
+    `rate` and `reason` describe the latest change for the live screen.
+    """
+
+    def __init__(self, rate=START_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.reason = "starting conservative"
+
+        self._tokens = 1.0
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self._latency = None
+        self._baseline = None
+        self._last_increase = 0.0
+        self._last_decrease = 0.0
+
+    # -------- SENDING SIDE -------- #
+
+    def _refill(self, now):
+        burst = max(1.0, self.rate)
+        self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self):
+        """Wait until one request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    # -------- FEEDBACK SIDE -------- #
+
+    def _set_rate(self, rate, reason):
+        self._refill(time.monotonic())
+        self.rate = max(self.min_rate, min(self.max_rate, rate))
+        self.reason = f"{reason} -> {self.rate:.1f}/s"
+
+    def _decrease(self, factor, reason, now):
+        # one cut per interval: a burst of errors from requests that were
+        # already in flight should not collapse the rate to the floor
+        if now - self._last_decrease < ADJUST_INTERVAL:
+            return
+        self._last_decrease = now
+        self._set_rate(self.rate * factor, reason)
+
+    def observe(self, status, latency, retry_after=None):
+        """Feed one response (HTTP status, seconds to headers, Retry-After header)."""
+        now = time.monotonic()
+
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += LATENCY_ALPHA * (latency - self._latency)
+
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
+
+        wait = parse_retry_after(retry_after)
+        if wait:
+            self._blocked_until = max(self._blocked_until, now + wait)
+
+        if status == 429:
+            # one cut per interval like any other error; the server's
+            # Retry-After (above) is what pauses sending
+            self._decrease(BACKOFF_429, "429 rate limited", now)
+            if wait:
+                self.reason = f"429 rate limited -> {self.rate:.1f}/s, paused {wait:.0f}s (Retry-After)"
+
+        elif status >= 500:
+            self._decrease(BACKOFF_5XX, f"server error {status}", now)
+
+        elif self._latency > self._baseline * SLOW_FACTOR:
+            self._decrease(
+                BACKOFF_SLOW,
+                f"latency {self._latency * 1000:.0f}ms > {SLOW_FACTOR:g}x baseline",
+                now
+            )
+
+        elif now - self._last_increase >= ADJUST_INTERVAL and now - self._last_decrease >= ADJUST_INTERVAL:
+            self._last_increase = now
+            if self.rate < self.max_rate:
+                self._set_rate(self.rate + INCREASE_STEP, "healthy")
@@ -0,0 +1,198 @@
+import os
+import tempfile
+from array import array
+
+from table_renderer import TableData, text_width
+
+
+# rows whose titles stay in memory before they move to a temp file
+SPILL_AFTER = 50000
+
+STATUSES = ("SUCCESS", "DUPLICATE", "FAILED", "SKIPPED", "RESUMED")
+_STATUS_CODE = {s: i for i, s in enumerate(STATUSES)}
+
+
+class ResultStore:
+    """
+    Per-row outcome of an upload run, kept compact:
+
+    - CSV row number, status code and error id in fixed-width arrays
+      (9 bytes / row)
+    - error messages interned — each distinct text is stored once
+    - titles in memory up to SPILL_AFTER rows, then appended to a temp file
+      and read back by offset only for the rows being displayed
+
+    Titles and errors are stored untruncated; views cut them for display.
+    """
+
+    def __init__(self, spill_after=SPILL_AFTER):
+        self.spill_after = spill_after
+
+        self._idx = array("I")
+        self._status = array("B")
+        self._error = array("I")
+
+        self._errors = [""]
+        self._error_ids = {"": 0}
+
+        self._titles = []
+        self._spill = None          # temp file once spilled
+        self._spill_end = 0
+        self._spill_reading = False
+        self._offsets = array("Q")
+        self._lengths = array("I")
+
+        self.title_width = 0        # widest title / error seen (display columns)
+        self.error_width = 0
+
+    def __len__(self):
+        return len(self._idx)
+
+    @property
+    def spilled(self):
+        return self._spill is not None
+
+    # -------- WRITE -------- #
+
+    def add(self, idx, title, status, error=None):
+        error = error or ""
+
+        error_id = self._error_ids.get(error)
+        if error_id is None:
+            error_id = self._error_ids[error] = len(self._errors)
+            self._errors.append(error)
+            self.error_width = max(self.error_width, text_width(error))
+
+        if len(title) * 2 > self.title_width:
+            self.title_width = max(self.title_width, text_width(title))
+
+        self._idx.append(idx)
+        self._status.append(_STATUS_CODE[status])
+        self._error.append(error_id)
+
+        if self._spill is None:
+            self._titles.append(title)
+            if len(self._titles) > self.spill_after:
+                self._spill_titles()
+        else:
+            self._write_title(title)
+
+    def _spill_titles(self):
+        self._spill = tempfile.TemporaryFile(prefix="qspider-results-")
+        for title in self._titles:
+            self._write_title(title)
+        self._titles = []
+
+    def _write_title(self, title):
+        data = title.encode("utf-8")
+
+        # appends stay buffered; only seek back to the end after a read
+        if self._spill_reading:
+            self._spill.seek(0, os.SEEK_END)
+            self._spill_reading = False
+
+        self._offsets.append(self._spill_end)
+        self._lengths.append(len(data))
+        self._spill.write(data)
+        self._spill_end += len(data)
+
+    # -------- READ -------- #
+
+    def title(self, pos):
+        if self._spill is None:
+            return self._titles[pos]
+
+        self._spill_reading = True
+        self._spill.seek(self._offsets[pos])
+        return self._spill.read(self._lengths[pos]).decode("utf-8")
+
+    def row(self, pos):
+        """(row number, title, status, error) of the pos-th result added."""
+        return (
+            self._idx[pos],
+            self.title(pos),
+            STATUSES[self._status[pos]],
+            self._errors[self._error[pos]]
+        )
+
+    def tail(self, n):
+        """Last n results, most recent last."""
+        start = max(0, len(self) - n)
+        return [self.row(pos) for pos in range(start, len(self))]
+
+    def csv_order(self):
+        """
+        Positions sorted by CSV row number (stable counting sort, 4 bytes /
+        row). Row numbers may repeat — dead letters re-driven from several
+        CSVs — and such rows keep their arrival order.
+        """
+        if not len(self):
+            return array("I")
+
+        # start[idx] = first output slot of that row number
+        start = array("I", [0]) * (max(self._idx) + 2)
+        for idx in self._idx:
+            start[idx + 1] += 1
+        for i in range(1, len(start)):
+            start[i] += start[i - 1]
+
+        order = array("I", [0]) * len(self._idx)
+        for pos, idx in enumerate(self._idx):
+            order[start[idx]] = pos
+            start[idx] += 1
+
+        return order
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+    def table(self, headers):
+        """Report view over this store, in CSV order."""
+        return ResultTableData(headers, self)
+
+
+class _OrderedRows:
+    """Read-only sequence of store rows in a given position order."""
+
+    def __init__(self, store, order):
+        self.store = store
+        self.order = order
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, i):
+        return self.store.row(self.order[i])
+
+
+class ResultTableData(TableData):
+    """
+    TableData paging straight from a ResultStore: column widths come from
+    the store's running maxima and the status filter from its status
+    array, so opening the report never reads every title back.
+    """
+
+    def __init__(self, headers, store):
+        order = store.csv_order()
+        digits = len(str(store._idx[order[-1]])) if len(order) else 1
+
+        super().__init__(
+            headers,
+            _OrderedRows(store, order),
+            widths=[digits, store.title_width, max(map(len, STATUSES)), store.error_width]
+        )
+
+        self.store = store
+
+    def _status_groups(self):
+        if self._groups is None:
+            # one pass over the status array in report order — titles are never read
+            status = self.store._status
+            buckets = [[] for _ in STATUSES]
+            for i, pos in enumerate(self.rows.order):
+                buckets[status[pos]].append(i)
+
+            self._groups = {s: rows for s, rows in zip(STATUSES, buckets) if rows}
+        return self._groups
@@ -0,0 +1,67 @@
+import time
+import heapq
+import random
+import asyncio
+
+import aiohttp
+
+# attempts per row, the first send included
+MAX_ATTEMPTS = 5
+
+# backoff before retry n: random in [0, min(MAX_DELAY, BASE_DELAY * 2^(n-1))]
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# failures worth another try: the request may well succeed later
+RETRYABLE_ERRORS = (
+    asyncio.TimeoutError,
+    aiohttp.ClientConnectionError,     # refused, reset, server disconnected
+    aiohttp.ClientPayloadError,        # body cut off mid-transfer
+)
+
+
+def retryable_status(status):
+    return status == 429 or 500 <= status <= 599
+
+
+def backoff(attempt, retry_after=None):
+    """
+    Seconds to wait before retrying after failed attempt number `attempt`:
+    exponential with full jitter, so rows that failed together do not
+    come back together. A server Retry-After is a lower bound.
+    """
+    delay = random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** (attempt - 1)))
+    return max(delay, retry_after or 0)
+
+
+class RetryQueue:
+    """
+    Rows waiting for their next attempt, ordered by due time.
+    The upload pipeline's retry pump moves due rows back into the send
+    queue, so fresh rows keep flowing while these wait.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+        self.scheduled = 0      # retries scheduled so far (all rows)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, item, delay):
+        self._seq += 1
+        self.scheduled += 1
+        heapq.heappush(self._heap, (time.monotonic() + delay, self._seq, item))
+
+    def next_due(self):
+        """Seconds until the earliest row is due (<= 0: now), None if empty."""
+        if not self._heap:
+            return None
+        return self._heap[0][0] - time.monotonic()
+
+    def pop(self):
+        return heapq.heappop(self._heap)[2]
+
+    def clear(self):
+        self._heap = []
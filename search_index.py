@@ -0,0 +1,167 @@
+import curses
+from array import array
+
+
+def _fold(text):
+    return " ".join(str(text).casefold().split())
+
+
+def _term_score(term, label):
+    """
+    Rank of one search term inside one label, lower is better, or None.
+
+    0  substring at a word start    ("oop" in "intro to oop")
+    1  substring anywhere
+    2+ letters in order with gaps   ("lnkl" in "linked list"), plus the gap
+    """
+    pos = label.find(term)
+    if pos != -1:
+        return 0 if pos == 0 or label[pos - 1] == " " else 1
+
+    # fuzzy: every letter of the term, in order
+    first = last = -1
+    for ch in term:
+        last = label.find(ch, last + 1)
+        if last == -1:
+            return None
+        if first == -1:
+            first = last
+
+    return 2 + (last - first + 1 - len(term))
+
+
+class SearchIndex:
+    """
+    Fuzzy type-ahead over a fixed list of labels.
+
+    Built once per list: every label is case-folded and every character
+    gets a posting list of the labels containing it, so a fresh query
+    only looks at labels that have all of its letters. Typing one more
+    letter narrows the previous matches instead of rescanning, and
+    backspace returns the cached result of the shorter query.
+    """
+
+    def __init__(self, labels=()):
+        self.labels = []
+        self._postings = {}
+        self._cache = {"": None}    # query -> matching ids (None: everything)
+        self.extend(labels)
+
+    def __len__(self):
+        return len(self.labels)
+
+    def extend(self, labels):
+        """Index more labels (e.g. a page that arrived later)."""
+        start = len(self.labels)
+
+        for i, label in enumerate(labels, start):
+            label = _fold(label)
+            self.labels.append(label)
+            for ch in set(label):
+                ids = self._postings.get(ch)
+                if ids is None:
+                    ids = self._postings[ch] = array("I")
+                ids.append(i)
+
+        if len(self.labels) > start:
+            self._cache = {"": None}
+
+    def _candidates(self, query):
+        """Ids that contain every letter of query, narrowest posting first."""
+        letters = set(query.replace(" ", ""))
+        postings = sorted((self._postings.get(ch, ()) for ch in letters), key=len)
+
+        if not postings:
+            return range(len(self.labels))
+
+        ids = set(postings[0])
+        for more in postings[1:]:
+            ids.intersection_update(more)
+            if not ids:
+                break
+        return sorted(ids)
+
+    def _match(self, query, ids):
+        terms = query.split()
+        matched = []
+
+        for i in ids:
+            label = self.labels[i]
+            score = 0
+            for term in terms:
+                s = _term_score(term, label)
+                if s is None:
+                    break
+                score += s
+            else:
+                matched.append((score, i))
+
+        matched.sort()
+        return [i for _, i in matched]
+
+    def search(self, query):
+        """Ids of the labels matching query, best first (all ids for '')."""
+        query = _fold(query)
+        if not query:
+            return list(range(len(self.labels)))
+
+        cached = self._cache.get(query)
+        if cached is not None:
+            return cached
+
+        # narrow the longest cached query this one extends
+        base = None
+        for n in range(len(query) - 1, 0, -1):
+            base = self._cache.get(query[:n])
+            if base is not None:
+                break
+
+        ids = self._candidates(query) if base is None else sorted(base)
+        result = self._cache[query] = self._match(query, ids)
+        return result
+
+
+class TypeAhead:
+    """
+    Search box state for a curses selector: printable keys edit the
+    query, Backspace deletes, `matches` holds the positions (into the
+    selector's list) that are shown.
+    """
+
+    def __init__(self, items, label):
+        self.label = label
+        self.query = ""
+        self._items = items
+        self.index = SearchIndex(label(item) for item in items)
+        self.matches = self.index.search("")
+
+    def sync(self, items):
+        """Follow a list that grew (streamed pages) or was replaced (refresh)."""
+        if items is self._items and len(items) == len(self.index):
+            return
+
+        if items is self._items and len(items) > len(self.index):
+            self.index.extend(self.label(item) for item in items[len(self.index):])
+        else:
+            self._items = items
+            self.index = SearchIndex(self.label(item) for item in items)
+
+        self.matches = self.index.search(self.query)
+
+    def key(self, key):
+        """Apply a keypress. Returns True if it changed the query."""
+        if key in (curses.KEY_BACKSPACE, 127, 8):
+            if not self.query:
+                return False
+            self.query = self.query[:-1]
+        elif 32 <= key < 127:
+            self.query += chr(key)
+        else:
+            return False
+
+        self.matches = self.index.search(self.query)
+        return True
+
+    def clear(self):
+        self.query = ""
+        self.matches = self.index.search("")
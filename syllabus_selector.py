@@ -1,9 +1,28 @@
-import curses
-
-from api_guard import api_call, AuthExpired
+import catalog
+from api_guard import AuthExpired, ApiError, api_url
 from db import get_session
+from paginator import PagedFetch
+from list_view import pick
+
+SYLLABUS_URL = api_url("/subject/v1/syllabus/get-syllabus-trainer")
+PAGE_SIZE = 20
+
+
+def _fetch_syllabuses(stdscr, access_token):
+    """Fetch every syllabus page (stdscr=None: no loader screen). Returns a PagedFetch."""
+    headers = {
+        "Authorization": f"Bearer {access_token}"
+    }
 
-SYLLABUS_URL = "https://topbrains.com/subject/v1/syllabus/get-syllabus-trainer"
+    return PagedFetch(
+        stdscr,
+        SYLLABUS_URL,
+        headers,
+        {},
+        PAGE_SIZE,
+        parse=list,
+        message="Loading syllabus..."
+    )
 
 
 def select_syllabus(stdscr):
@@ -11,75 +30,40 @@ def select_syllabus(stdscr):
     if not session:
         return None
 
+    user_id = session[0]
     access_token = session[9]
 
-    headers = {
-        "Authorization": f"Bearer {access_token}"
-    }
+    def fetch(scr):
+        return _fetch_syllabuses(scr, access_token)
 
     try:
-        data = api_call(
-            stdscr,
-            "GET",
-            SYLLABUS_URL,
-            headers=headers,
-            params={
-                "pageNo": 0,
-                "pageSize": 20
-            },
-            message="Loading syllabus..."
-        )
+        items, refresh = catalog.load(stdscr, "syllabus", user_id, fetch)
     except AuthExpired:
         stdscr.clear()
         stdscr.addstr(4, 4, "🔒 Session expired. Please login again.")
         stdscr.addstr(6, 4, "Press any key to continue...")
         stdscr.getch()
         return None
-
-    items = data["response"]["content"]
-    if not items:
+    except ApiError as e:
         stdscr.clear()
-        stdscr.addstr(4, 4, "❌ No syllabus found")
-        stdscr.addstr(6, 4, "Press any key to return...")
+        stdscr.addstr(4, 4, "❌ Failed to load syllabus")
+        stdscr.addstr(6, 4, str(e)[:100])
+        stdscr.addstr(8, 4, "Press any key to return...")
         stdscr.getch()
         return None
 
-    current = 0
-
-    while True:
-        stdscr.clear()
-        stdscr.addstr(1, 2, "Select Syllabus")
-        stdscr.addstr(2, 2, "-" * 15)
-
-        h, w = stdscr.getmaxyx()
-        visible = h - 8
-        start = max(0, current - visible + 1)
-        end = min(len(items), start + visible)
-
-        for idx in range(start, end):
-            y = 4 + (idx - start)
-            name = items[idx]["subject"]["name"][: w - 8]
-
-            if idx == current:
-                stdscr.addstr(y, 4, name, curses.A_REVERSE)
-            else:
-                stdscr.addstr(y, 4, name)
-
-        stdscr.addstr(h - 2, 2, "↑ ↓ move   Enter select   Esc cancel")
-        stdscr.refresh()
-
-        key = stdscr.getch()
+    item = pick(
+        stdscr, "Select Syllabus", items, lambda s: s["subject"]["name"],
+        refresh=refresh,
+        reload=lambda: catalog.refresh("syllabus", user_id, fetch),
+        empty="❌ No syllabus found"
+    )
+    if item is None:
+        return None
 
-        if key == curses.KEY_UP:
-            current = (current - 1) % len(items)
-        elif key == curses.KEY_DOWN:
-            current = (current + 1) % len(items)
-        elif key in (10, 13):
-            subject = items[current]["subject"]
-            return {
-                "subjectId": subject["id"],
-                "subjectName": subject["name"],
-                "syllabusId": items[current]["syllabusId"]
-            }
-        elif key == 27:
-            return None
+    subject = item["subject"]
+    return {
+        "subjectId": subject["id"],
+        "subjectName": subject["name"],
+        "syllabusId": item["syllabusId"]
+    }
@@ -1,6 +1,22 @@
 import curses
+import textwrap
+from collections import OrderedDict
 
+from wcwidth import wcwidth, wcswidth
 
+from profiling import traced
+
+# widest a report column may get (longer cells are cut)
+MAX_CELL_WIDTH = 80
+
+# column whose values can be filtered on in scrollable_table
+FILTER_HEADER = "Status"
+
+# rendered report lines kept (least recently drawn dropped first) — a few screens' worth
+LINE_CACHE_ROWS = 512
+
+
+@traced(cat="ui")
 def draw_table(stdscr, headers, rows, start_y=2, start_x=2, max_rows=None):
     """
     Draws a formatted table inside curses screen.
@@ -74,33 +90,234 @@ def draw_table(stdscr, headers, rows, start_y=2, start_x=2, max_rows=None):
     stdscr.refresh()
 
 
+# ---------------- DISPLAY WIDTH ---------------- #
+
+def text_width(text):
+    """Terminal columns needed for `text` (wide / emoji chars count 2)."""
+    if text.isascii() and text.isprintable():
+        return len(text)
+
+    n = wcswidth(text)
+    return n if n >= 0 else len(text)
+
+
+def fit(text, width):
+    """Cut or pad `text` to exactly `width` terminal columns."""
+    used = text_width(text)
+    if used <= width:
+        return text + " " * (width - used)
+
+    out = []
+    used = 0
+    for ch in text:
+        cw = max(wcwidth(ch), 0)
+        if used + cw > width:
+            break
+        out.append(ch)
+        used += cw
+
+    return "".join(out) + " " * (width - used)
+
+
+# ---------------- SCROLLABLE REPORT ---------------- #
+
+class TableData:
+    """
+    Rows prepared once for the scrollable report: column widths (by
+    display width) are computed a single time and rendered lines are kept
+    in a small LRU, so scrolling and redraws only touch the visible rows
+    and memory does not grow with the row count.
+    """
+
+    def __init__(self, headers, rows, widths=None):
+        self.headers = [str(h) for h in headers]
+        self.rows = rows
+        self.filter_col = self.headers.index(FILTER_HEADER) if FILTER_HEADER in self.headers else None
+
+        cols = len(self.headers)
+
+        if widths is not None:
+            # caller already knows the content widths — no pass over the rows
+            widths = [
+                min(max(cw, text_width(h)), MAX_CELL_WIDTH)
+                for cw, h in zip(widths, self.headers)
+            ]
+            rows = ()
+        else:
+            widths = [text_width(h) for h in self.headers]
+
+        for row in rows:
+            for i in range(min(cols, len(row))):
+                cell = str(row[i])
+                # a cell is at most 2 columns per char — skip ones that cannot widen
+                if len(cell) * 2 <= widths[i]:
+                    continue
+                cw = text_width(cell)
+                if cw > widths[i]:
+                    widths[i] = min(cw, MAX_CELL_WIDTH)
+
+        # +2 padding, same as draw_table
+        self.widths = [cw + 2 for cw in widths]
+        self.border = "+" + "+".join("-" * cw for cw in self.widths) + "+"
+        self.header_line = self._render(self.headers)
+        self.line_width = text_width(self.border)
+
+        self._lines = OrderedDict()     # row index -> rendered line, LRU
+        self._groups = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _render(self, cells):
+        parts = []
+        for i, cw in enumerate(self.widths):
+            cell = str(cells[i]) if i < len(cells) else ""
+            parts.append(fit(cell, cw))
+        return "|" + "|".join(parts) + "|"
+
+    def line(self, i):
+        """Rendered table line for row i (cached while it is among the recently drawn)."""
+        text = self._lines.get(i)
+        if text is not None:
+            self._lines.move_to_end(i)
+            return text
+
+        text = self._lines[i] = self._render(self.rows[i])
+        if len(self._lines) > LINE_CACHE_ROWS:
+            self._lines.popitem(last=False)
+        return text
+
+    def detail(self, i):
+        """(header, full cell text) pairs of row i, untruncated."""
+        row = self.rows[i]
+        return [
+            (h, str(row[k]) if k < len(row) else "")
+            for k, h in enumerate(self.headers)
+        ]
+
+    def filter_values(self):
+        """Distinct values of the filter column, in first-seen order."""
+        return list(self._status_groups())
+
+    def _status_groups(self):
+        # one pass over the rows, then reused for every filter change
+        if self._groups is None:
+            self._groups = {}
+            if self.filter_col is not None:
+                col = self.filter_col
+                for i, row in enumerate(self.rows):
+                    self._groups.setdefault(str(row[col]), []).append(i)
+        return self._groups
+
+    def indices(self, value):
+        """Row indices having `value` in the filter column."""
+        return self._status_groups().get(value, [])
+
+
+def _read_number(stdscr, y, prompt):
+    """Read digits on line y. Returns int or None on Esc / empty input."""
+    h, w = stdscr.getmaxyx()
+    buf = ""
+
+    while True:
+        stdscr.move(y, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(y, 2, f"{prompt}{buf}"[: w - 4])
+        stdscr.refresh()
+
+        ch = stdscr.getch()
+
+        if ch in (10, 13):
+            return int(buf) if buf else None
+        elif ch == 27:
+            return None
+        elif ch in (8, 127, curses.KEY_BACKSPACE):
+            buf = buf[:-1]
+        elif ord("0") <= ch <= ord("9") and len(buf) < 9:
+            buf += chr(ch)
+
+
+def _show_detail(stdscr, fields):
+    """Full-screen view of one row with long cells wrapped."""
+    stdscr.erase()
+    h, w = stdscr.getmaxyx()
+    width = max(10, w - 8)
+    label_w = max(text_width(name) for name, _ in fields)
+
+    y = 1
+    for name, value in fields:
+        lines = textwrap.wrap(value, width - label_w - 3) or [""]
+        for k, line in enumerate(lines):
+            if y >= h - 3:
+                break
+            label = fit(name, label_w) + " : " if k == 0 else " " * (label_w + 3)
+            stdscr.addstr(y, 2, fit(label + line, w - 4))
+            y += 1
+
+    stdscr.addstr(h - 2, 2, "Press any key to return..."[: w - 4])
+    stdscr.refresh()
+    stdscr.getch()
+
+
 def scrollable_table(stdscr, title, headers, rows):
     """
     Full-screen scrollable table with keyboard navigation.
-    Up/Down to scroll, Esc or q to exit.
+    Up/Down/PgUp/PgDn/Home/End scroll, g jumps to a row, d shows one row
+    untruncated, f cycles a filter on the Status column, Esc or q exits.
+    `rows` may be a prepared TableData. Only the visible rows are drawn
+    on each keypress.
     """
     curses.curs_set(0)
+
+    data = rows if isinstance(rows, TableData) else TableData(headers, rows)
+    filters = [None] + data.filter_values()
+    current_filter = 0
+    view = None           # None = all rows, else list of row indices
     scroll = 0
 
     while True:
-        stdscr.clear()
+        stdscr.erase()
         h, w = stdscr.getmaxyx()
 
-        stdscr.addstr(1, 2, title[: w - 4], curses.A_BOLD)
-
-        visible_rows = h - 8  # header(3 lines) + footer(2) + table borders(3)
-        total = len(rows)
+        visible_rows = max(1, h - 9)  # title(3 lines) + table borders(4) + footer(2)
+        total = len(view) if view is not None else len(data)
 
         max_scroll = max(0, total - visible_rows)
         scroll = max(0, min(scroll, max_scroll))
 
-        page = rows[scroll: scroll + visible_rows]
-        draw_table(stdscr, headers, page, start_y=3, max_rows=visible_rows)
+        avail = w - 3
+        clip = data.line_width > avail
+
+        def put(y, text):
+            stdscr.addstr(y, 2, fit(text, avail) if clip else text)
+
+        stdscr.addstr(1, 2, title[: w - 4], curses.A_BOLD)
+
+        y = 3
+        put(y, data.border)
+        put(y + 1, data.header_line)
+        put(y + 2, data.border)
+        y += 3
+
+        end = min(total, scroll + visible_rows)
+        for pos in range(scroll, end):
+            put(y, data.line(view[pos] if view is not None else pos))
+            y += 1
+        put(y, data.border)
 
         # footer
-        pos_text = f"Showing {scroll + 1}-{scroll + len(page)} of {total}"
-        stdscr.addstr(h - 2, 2, pos_text)
-        stdscr.addstr(h - 1, 2, "Up/Down scroll   Esc/q return"[: w - 4])
+        label = filters[current_filter]
+        pos_text = f"Showing {scroll + 1 if total else 0}-{end} of {total}"
+        if label:
+            pos_text += f"  (filter: {label}, {len(data)} total)"
+
+        keys = "Up/Down scroll   g go to row   d details   "
+        if len(filters) > 1:
+            keys += "f filter   "
+        keys += "Esc/q return"
+
+        stdscr.addstr(h - 2, 2, pos_text[: w - 4])
+        stdscr.addstr(h - 1, 2, keys[: w - 4])
         stdscr.refresh()
 
         key = stdscr.getch()
@@ -113,5 +330,22 @@ def scrollable_table(stdscr, title, headers, rows):
             scroll = max(0, scroll - visible_rows)
         elif key == curses.KEY_NPAGE:  # Page Down
             scroll = min(max_scroll, scroll + visible_rows)
+        elif key == curses.KEY_HOME:
+            scroll = 0
+        elif key == curses.KEY_END:
+            scroll = max_scroll
+        elif key in (ord("g"), ord("G")):
+            target = _read_number(stdscr, h - 2, f"Go to row (1-{total}): ")
+            if target:
+                scroll = min(max_scroll, target - 1)
+        elif key in (ord("d"), ord("D")) and total:
+            target = _read_number(stdscr, h - 2, f"Show details of row (1-{total}): ")
+            if target and target <= total:
+                _show_detail(stdscr, data.detail(view[target - 1] if view is not None else target - 1))
+        elif key in (ord("f"), ord("F")) and len(filters) > 1:
+            current_filter = (current_filter + 1) % len(filters)
+            label = filters[current_filter]
+            view = data.indices(label) if label else None
+            scroll = 0
         elif key in (27, ord('q')):  # Esc or q
             break
@@ -0,0 +1,80 @@
+import csv
+
+import pytest
+
+import csv_validator
+from csv_validator import REQUIRED_HEADERS, validate_file
+
+GOOD = ["Stack", "", "LIFO", "FIFO", "Both", "None", "A", "1", "EASY"]
+
+
+def _write(path, rows, encoding="utf-8"):
+    with open(path, "w", newline="", encoding=encoding) as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_HEADERS)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_valid_file(tmp_path):
+    report = validate_file(_write(tmp_path / "ok.csv", [GOOD] * 3))
+
+    assert report.unreadable is None
+    assert (report.total_rows, report.valid_rows, report.error_count) == (3, 3, 0)
+    assert report.by_difficulty["EASY"] == 3
+
+
+def test_non_utf8_file_is_unreadable(tmp_path):
+    rows = [GOOD, ["Café é ü"] + GOOD[1:]]
+    report = validate_file(_write(tmp_path / "latin1.csv", rows, encoding="latin-1"))
+
+    assert report.unreadable and "UTF-8" in report.unreadable
+    assert report.valid_rows == 0
+
+
+def test_non_utf8_header_is_unreadable(tmp_path):
+    path = tmp_path / "header.csv"
+    path.write_bytes(b"questionTitle\xff," + ",".join(REQUIRED_HEADERS[1:]).encode() + b"\n")
+
+    report = validate_file(str(path))
+
+    assert report.unreadable
+    assert report.valid_rows == 0
+
+
+def test_malformed_quote_keeps_counting(tmp_path):
+    # a stray quote opens a field that runs past csv's field size limit
+    path = tmp_path / "quote.csv"
+    _write(path, [GOOD])
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write('"' + "x" * 200_000 + "\n")
+        csv.writer(f).writerows([GOOD] * 3)
+
+    report = validate_file(str(path))
+
+    assert report.unreadable is None
+    assert report.total_rows == 5
+    assert report.error_count == 1
+    assert report.valid_rows == 4
+    assert "unreadable CSV" in report.errors[0][1]
+
+
+@pytest.mark.parametrize("name", ["quote", "bad_marks"])
+def test_parallel_matches_serial(tmp_path, monkeypatch, name):
+    path = tmp_path / f"{name}.csv"
+    rows = [GOOD] * 50 + [GOOD[:7] + ["two", "HARD"]] * 5 + [GOOD] * 50
+    _write(path, rows)
+    if name == "quote":
+        with open(path, "a", encoding="utf-8", newline="") as f:
+            f.write('"' + "x" * 200_000 + "\n")
+            csv.writer(f).writerows([GOOD] * 20)
+
+    serial = validate_file(str(path), workers=1)
+
+    monkeypatch.setattr(csv_validator, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(csv_validator, "CHUNK_BYTES", 2048)
+    parallel = validate_file(str(path), workers=2)
+
+    assert parallel.total_rows == serial.total_rows
+    assert parallel.error_count == serial.error_count
+    assert parallel.by_difficulty == serial.by_difficulty
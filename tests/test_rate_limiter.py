@@ -0,0 +1,58 @@
+import time
+
+import rate_limiter
+from rate_limiter import AdaptiveRateLimiter, BACKOFF_429, BACKOFF_5XX
+
+
+def _warm(limiter):
+    """Give the limiter a latency baseline (a healthy response may also step the rate up)."""
+    limiter.observe(200, 0.05)
+
+
+def test_concurrent_429s_cut_the_rate_once():
+    limiter = AdaptiveRateLimiter(rate=50.0, max_rate=50.0)
+    _warm(limiter)
+
+    # eight requests that were in flight together all come back 429
+    for _ in range(8):
+        limiter.observe(429, 0.05)
+
+    assert limiter.rate == 50.0 * BACKOFF_429
+
+
+def test_429_cuts_again_after_the_interval(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+
+    limiter = AdaptiveRateLimiter(rate=40.0)
+    _warm(limiter)
+    start = limiter.rate
+
+    limiter.observe(429, 0.05)
+    limiter.observe(429, 0.05)
+    now[0] += rate_limiter.ADJUST_INTERVAL
+    limiter.observe(429, 0.05)
+
+    assert limiter.rate == start * BACKOFF_429 * BACKOFF_429
+
+
+def test_429_and_5xx_share_the_interval():
+    limiter = AdaptiveRateLimiter(rate=50.0, max_rate=50.0)
+    _warm(limiter)
+
+    limiter.observe(503, 0.05)
+    limiter.observe(429, 0.05)
+
+    assert limiter.rate == 50.0 * BACKOFF_5XX
+
+
+def test_retry_after_pauses_sending():
+    limiter = AdaptiveRateLimiter(rate=50.0, max_rate=50.0)
+    _warm(limiter)
+
+    for _ in range(8):
+        limiter.observe(429, 0.05, retry_after="3")
+
+    assert limiter._blocked_until >= time.monotonic() + 2.5
+    assert "Retry-After" in limiter.reason
+    assert limiter.rate == 50.0 * BACKOFF_429
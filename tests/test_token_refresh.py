@@ -0,0 +1,90 @@
+import csv
+import asyncio
+
+import pytest
+
+import db
+import token_manager
+import bulk_question_uploader
+from api_guard import ApiError, api_call
+from auth import session_from_login
+from csv_validator import REQUIRED_HEADERS
+from rate_limiter import AdaptiveRateLimiter
+from token_manager import tokens
+from bulk_question_uploader import UploadRun
+from bench.mock_server import (
+    MockConfig,
+    MockServer,
+    LOGIN_PATH,
+    REFRESH_PATH,
+    QUESTION_PATH
+)
+
+ROWS = 3
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "app.db"))
+    db.init_db()
+    tokens.reset()
+
+    mock = MockServer(MockConfig(latency=1, jitter=0, seed=1))
+    base = mock.start()
+    monkeypatch.setattr(token_manager, "REFRESH_URL", base + REFRESH_PATH)
+    monkeypatch.setattr(bulk_question_uploader, "QUESTION_CREATE_URL", base + QUESTION_PATH)
+
+    data = api_call(None, "POST", base + LOGIN_PATH, json={"userEmail": "t@example.com", "password": "t"})
+    session = session_from_login(data)
+    db.save_session(session)
+
+    yield mock, session
+
+    mock.stop()
+    tokens.reset()
+    db.close_db()
+
+
+def _csv(path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(REQUIRED_HEADERS)
+        for i in range(ROWS):
+            writer.writerow([f"Question {i}", "", "1", "2", "3", "4", "A", "1", "EASY"])
+    return str(path)
+
+
+def test_failed_refresh_retries_the_row(server, tmp_path, monkeypatch):
+    mock, session = server
+
+    # the server forgets every access token: the first request gets 401
+    mock.app["api"].access.clear()
+
+    # ... and the refresh that follows times out once
+    real_request = token_manager.request
+    failures = []
+
+    def flaky(method, url, **kwargs):
+        if url == token_manager.REFRESH_URL and not failures:
+            failures.append(url)
+            raise ApiError("Request timed out")
+        return real_request(method, url, **kwargs)
+
+    monkeypatch.setattr(token_manager, "request", flaky)
+
+    run = UploadRun(
+        _csv(tmp_path / "questions.csv"),
+        "chapter-1",
+        "subject-1",
+        session["organization_id"],
+        user_id=session["user_id"],
+        concurrency=1,
+        limiter=AdaptiveRateLimiter(rate=100.0, max_rate=100.0)
+    )
+    asyncio.run(run.run())
+    run.results.close()
+
+    assert failures
+    assert run.counts["SUCCESS"] == ROWS
+    assert run.dead_lettered == 0
+    assert not run.expired
@@ -0,0 +1,174 @@
+import io
+import os
+import json
+import stat
+import hashlib
+import zipfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import updater
+
+VERSION = "9.9.9"
+
+
+class Release:
+    """What the fake GitHub serves: raw files, manifest.json and the zip."""
+
+    def __init__(self):
+        self.files = {
+            "app.py": (b"print('new')\n", 0o644),
+            "setup.sh": (b"#!/bin/sh\necho new\n", 0o755),
+            "same.txt": (b"same\n", 0o644),
+        }
+        self.manifest_version = VERSION
+        self.has_manifest = True
+        self.corrupt = False
+        self.hits = []
+
+    def manifest(self):
+        return json.dumps({
+            "version": self.manifest_version,
+            "files": {
+                name: {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data), "mode": mode}
+                for name, (data, mode) in self.files.items()
+            }
+        }).encode()
+
+    def archive(self):
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w") as zf:
+            for name, (data, mode) in self.files.items():
+                info = zipfile.ZipInfo("Repo-main/" + name)
+                info.external_attr = (stat.S_IFREG | mode) << 16
+                zf.writestr(info, data)
+        return buf.getvalue()
+
+    def body(self, path):
+        if path == "manifest.json":
+            return self.manifest() if self.has_manifest else None
+        if path == "main.zip":
+            return self.archive()
+        if path in self.files:
+            return b"garbage" if self.corrupt else self.files[path][0]
+        return None
+
+
+@pytest.fixture
+def release(tmp_path, monkeypatch):
+    rel = Release()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            path = self.path.lstrip("/")
+            rel.hits.append(path)
+            body = rel.body(path)
+            if body is None:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/"
+
+    install = tmp_path / "app"
+    install.mkdir()
+    (install / "same.txt").write_bytes(b"same\n")
+    (install / "app.db").write_bytes(b"keep")
+    (install / "setup.sh").write_bytes(b"#!/bin/sh\necho old\n")
+    os.chmod(install / "setup.sh", 0o755)
+
+    monkeypatch.setattr(updater, "APP_DIR", str(install))
+    monkeypatch.setattr(updater, "REMOTE_RAW_BASE", base)
+    monkeypatch.setattr(updater, "REMOTE_MANIFEST_URL", base + "manifest.json")
+    monkeypatch.setattr(updater, "REMOTE_ZIP_URL", base + "main.zip")
+
+    yield rel, install
+    server.shutdown()
+
+
+def _mode(path):
+    return stat.S_IMODE(os.stat(path).st_mode)
+
+
+def test_delta_fetches_only_changed_files(release):
+    rel, install = release
+
+    written, _ = updater.update_files(version=VERSION)
+
+    assert written == 2
+    assert sorted(rel.hits) == ["app.py", "manifest.json", "setup.sh"]
+    assert (install / "setup.sh").read_bytes() == rel.files["setup.sh"][0]
+    assert (install / "app.db").read_bytes() == b"keep"
+    assert _mode(install / "setup.sh") & 0o111
+
+
+def test_nothing_downloaded_when_current(release):
+    rel, install = release
+    updater.update_files(version=VERSION)
+    rel.hits.clear()
+
+    assert updater.update_files(version=VERSION) == (0, 0)
+    assert rel.hits == ["manifest.json"]
+
+
+def test_checksum_mismatch_falls_back_to_zip(release):
+    rel, install = release
+    rel.corrupt = True
+
+    updater.update_files(version=VERSION)
+
+    assert "main.zip" in rel.hits
+    assert (install / "app.py").read_bytes() == rel.files["app.py"][0]
+    assert _mode(install / "setup.sh") & 0o111
+    assert not [f for f in os.listdir(install) if f.endswith(".part")]
+
+
+def test_stale_manifest_is_ignored(release):
+    rel, install = release
+    rel.manifest_version = "1.0.0"
+
+    updater.update_files(version=VERSION)
+
+    assert "main.zip" in rel.hits
+    assert (install / "app.py").read_bytes() == rel.files["app.py"][0]
+
+
+def test_zip_keeps_executable_bit(release):
+    rel, install = release
+    rel.has_manifest = False
+
+    updater.update_files(version=VERSION)
+
+    assert (install / "setup.sh").read_bytes() == rel.files["setup.sh"][0]
+    assert _mode(install / "setup.sh") & 0o111
+    assert not _mode(install / "app.py") & 0o111
+
+
+def test_write_keeps_mode_of_replaced_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(updater, "APP_DIR", str(tmp_path))
+    script = tmp_path / "run.sh"
+    script.write_bytes(b"old")
+    os.chmod(script, 0o750)
+
+    updater._write_verified(str(script), [b"new"])
+
+    assert script.read_bytes() == b"new"
+    assert _mode(script) == 0o750
+
+
+def test_path_outside_app_dir_is_refused(tmp_path, monkeypatch):
+    monkeypatch.setattr(updater, "APP_DIR", str(tmp_path))
+
+    with pytest.raises(updater.ApiError):
+        updater._dest("../evil.py")
@@ -0,0 +1,192 @@
+import json
+import time
+import base64
+import asyncio
+import threading
+
+from api_guard import AuthExpired, ApiError, request, api_url, use_token_manager
+from db import get_session, update_tokens
+
+REFRESH_URL = api_url("/subject/v1/auth/refresh-token")
+
+# refresh this many seconds before the JWT `exp` — at most this share of a
+# short-lived token's lifetime, so it is not refreshed on every use
+REFRESH_MARGIN = 120
+REFRESH_MARGIN_SHARE = 0.25
+
+
+def _claims(token):
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+    except Exception:
+        return {}
+
+    return claims if isinstance(claims, dict) else {}
+
+
+def _number(value):
+    return value if isinstance(value, (int, float)) else None
+
+
+def jwt_expiry(token):
+    """`exp` (unix seconds) of a JWT access token, or None if it has none."""
+    return _number(_claims(token).get("exp"))
+
+
+def refresh_margin(token):
+    """Seconds before `exp` at which `token` counts as expiring."""
+    claims = _claims(token)
+    exp, iat = _number(claims.get("exp")), _number(claims.get("iat"))
+
+    if exp is None or iat is None or exp <= iat:
+        return REFRESH_MARGIN
+    return min(REFRESH_MARGIN, (exp - iat) * REFRESH_MARGIN_SHARE)
+
+
+def _read_tokens(data):
+    """(access, refresh) from a refresh response; refresh may be None."""
+    body = data.get("response") if isinstance(data, dict) else None
+    if isinstance(body, dict) and isinstance(body.get("userLoginResponse"), dict):
+        body = body["userLoginResponse"]
+
+    if not isinstance(body, dict) or not body.get("accessToken"):
+        raise ApiError("Invalid token refresh response")
+
+    return body["accessToken"], body.get("refreshToken")
+
+
+class TokenManager:
+    """
+    Keeps the session's access token valid.
+
+    - proactive: a token within REFRESH_MARGIN of its JWT `exp` is
+      refreshed before it is used
+    - reactive: a request that got 401/403 calls refresh(token) with the
+      token it sent, then replays itself with the returned one
+
+    Refreshes are single-flight. Threads queue on one lock, and whoever
+    comes second finds the token already replaced and just takes it.
+    Coroutines share one in-flight task, so a pool of upload workers hitting
+    401 together makes one refresh call and all replay with its result.
+    New tokens are written back to auth_session.
+    """
+
+    def __init__(self):
+        self.access_token = None
+        self.refresh_token = None
+        self.refreshes = 0
+
+        self._lock = threading.Lock()
+        self._task = None
+
+    def reset(self):
+        """Forget cached tokens (login / logout); next use re-reads the session."""
+        with self._lock:
+            self.access_token = None
+            self.refresh_token = None
+
+    def _load(self):
+        if self.access_token is None:
+            session = get_session()
+            if session:
+                self.access_token, self.refresh_token = session[9], session[10]
+
+    def _expiring(self, token):
+        exp = jwt_expiry(token)
+        return exp is not None and exp - time.time() < refresh_margin(token)
+
+    # -------- SYNC -------- #
+
+    def current(self):
+        """Access token to send now (refreshed first if about to expire)."""
+        self._load()
+        token = self.access_token
+
+        if token and self.refresh_token and self._expiring(token):
+            try:
+                token = self.refresh(token)
+            except ApiError:
+                pass    # network trouble — the old token still has a little time
+
+        return token
+
+    def valid(self, token):
+        """`token` as a caller read it from the session, swapped for the newest one."""
+        return self.current() or token
+
+    def refresh(self, stale):
+        """
+        Replace `stale` (the token a request was rejected with) and return
+        the new access token. Raises AuthExpired if the refresh token is
+        missing or refused.
+        """
+        with self._lock:
+            self._load()
+
+            # someone else already refreshed while we waited for the lock
+            if self.access_token and self.access_token != stale:
+                return self.access_token
+
+            if not self.refresh_token:
+                raise AuthExpired("Session expired")
+
+            res = request("POST", REFRESH_URL, json={"refreshToken": self.refresh_token})
+
+            if res.status_code in (400, 401, 403):
+                raise AuthExpired("Session expired")
+
+            # overloaded / down — the refresh token may still be good, so the caller can retry
+            if res.status_code == 429 or res.status_code >= 500:
+                raise ApiError(f"Token refresh failed: HTTP {res.status_code}")
+
+            try:
+                data = res.json()
+            except Exception:
+                raise ApiError("Server returned non-JSON response")
+
+            if res.status_code >= 300 or data.get("statusCode", 200) in (400, 401, 403):
+                raise AuthExpired("Session expired")
+
+            access, refresh = _read_tokens(data)
+            refresh = refresh or self.refresh_token
+
+            update_tokens(access, refresh)
+            self.access_token, self.refresh_token = access, refresh
+            self.refreshes += 1
+
+            return access
+
+    # -------- ASYNC -------- #
+
+    async def atoken(self):
+        """current() for coroutines; waits for a refresh already in flight."""
+        if self._task and not self._task.done():
+            return await asyncio.shield(self._task)
+
+        self._load()
+        token = self.access_token
+
+        if token and self.refresh_token and self._expiring(token):
+            try:
+                token = await self.arefresh(token)
+            except ApiError:
+                pass
+
+        return token
+
+    async def arefresh(self, stale):
+        """refresh() for coroutines: every caller awaits the same single request."""
+        if self._task is None or self._task.done():
+            if self.access_token and self.access_token != stale:
+                return self.access_token
+
+            loop = asyncio.get_running_loop()
+            self._task = asyncio.ensure_future(loop.run_in_executor(None, self.refresh, stale))
+
+        return await asyncio.shield(self._task)
+
+
+tokens = TokenManager()
+use_token_manager(tokens)
@@ -1,27 +1,43 @@
 import os
-import io
+import sys
+import json
 import shutil
+import hashlib
 import zipfile
+import tempfile
 import subprocess
-import requests
-import urllib3
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from version import VERSION
-
-urllib3.disable_warnings()
+from api_guard import request, ApiError
 
 APP_DIR = os.path.dirname(os.path.abspath(__file__))
 
-REMOTE_VERSION_URL = "https://raw.githubusercontent.com/meikuraledutech/Qspider_Console/main/version.json"
+REMOTE_RAW_BASE = "https://raw.githubusercontent.com/meikuraledutech/Qspider_Console/main/"
+REMOTE_VERSION_URL = REMOTE_RAW_BASE + "version.json"
+REMOTE_MANIFEST_URL = REMOTE_RAW_BASE + "manifest.json"
 REMOTE_ZIP_URL = "https://github.com/meikuraledutech/Qspider_Console/archive/refs/heads/main.zip"
 
+# release file listing every app file with its sha256 (python updater.py manifest)
+MANIFEST_FILE = "manifest.json"
+
 # files to never overwrite during update
 PROTECTED = {"app.db", ".env"}
 
+# downloads are streamed to disk in chunks of this size
+CHUNK_SIZE = 64 * 1024
+
+# changed files fetched at once
+DOWNLOAD_WORKERS = 4
+
+# more changed files than this: one zip download beats many small requests
+MAX_DELTA_FILES = 40
+
 
 def _fetch_remote_version():
     """Fetch remote version.json and return (version, changelog)."""
-    res = requests.get(REMOTE_VERSION_URL, verify=False, timeout=15)
+    res = request("GET", REMOTE_VERSION_URL)
     res.raise_for_status()
     data = res.json()
     return data["version"], data.get("changelog", "")
@@ -34,43 +50,235 @@ def _compare_versions(local, remote):
     return to_tuple(remote) > to_tuple(local)
 
 
-def _download_and_extract():
-    """Download repo zip and overwrite app files."""
-    res = requests.get(REMOTE_ZIP_URL, verify=False, timeout=60)
-    res.raise_for_status()
+# ---------------- FILES ---------------- #
+
+def _skipped(rel_path):
+    """Paths an update never writes: protected files, venv, caches, git."""
+    if os.path.basename(rel_path) in PROTECTED:
+        return True
+    return any(part in rel_path for part in [".venv", "__pycache__", ".git"])
+
+
+def _dest(rel_path):
+    """Absolute install path of `rel_path`; refuses paths that leave APP_DIR."""
+    dest = os.path.normpath(os.path.join(APP_DIR, rel_path))
+    if os.path.commonpath([APP_DIR, dest]) != APP_DIR:
+        raise ApiError(f"Unsafe path in update: {rel_path}")
+    return dest
+
+
+def _sha256_file(path):
+    """sha256 of a file on disk, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+def _write_verified(dest, chunks, expected=None, mode=None):
+    """
+    Write `chunks` to dest via a .part file and swap it in. With `expected`
+    (sha256) a mismatch raises ApiError and leaves dest untouched. The new
+    file gets permission bits `mode`, else those of the file it replaces
+    (so scripts stay executable). Returns (sha256, bytes written).
+    """
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+
+    tmp = dest + ".part"
+    digest = hashlib.sha256()
+    size = 0
+
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+
+        if expected and digest.hexdigest() != expected:
+            raise ApiError(f"Checksum mismatch: {os.path.relpath(dest, APP_DIR)}")
+
+        if mode:
+            os.chmod(tmp, mode)
+        elif os.path.exists(dest):
+            shutil.copymode(dest, tmp)
+
+        os.replace(tmp, dest)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    return digest.hexdigest(), size
+
+
+def _stream(url):
+    """Yield the body of `url` in CHUNK_SIZE pieces (never held in memory whole)."""
+    with request("GET", url, stream=True) as res:
+        res.raise_for_status()
+        yield from res.iter_content(CHUNK_SIZE)
+
+
+# ---------------- DELTA UPDATE (manifest) ---------------- #
+
+def _fetch_manifest(version=None):
+    """
+    Remote {rel_path: {"sha256", "size", "mode"}}, or None if the release
+    has no usable manifest. With `version`, a manifest written for another
+    version is stale (not regenerated at release) and is ignored too.
+    """
+    try:
+        res = request("GET", REMOTE_MANIFEST_URL)
+        if res.status_code == 404:
+            return None
+        res.raise_for_status()
+        manifest = res.json()
+        files = manifest["files"]
+    except Exception:
+        return None     # unreachable or malformed — the caller falls back to the zip
+
+    if version is not None and manifest.get("version") != version:
+        return None
+
+    return files if isinstance(files, dict) else None
+
 
-    with zipfile.ZipFile(io.BytesIO(res.content)) as zf:
-        # zip contains a root folder like "Qspider_Console-main/"
-        root = zf.namelist()[0].split("/")[0]
+def _changed_files(files):
+    """[(rel_path, info)] of manifest entries whose installed copy differs."""
+    return [
+        (rel_path, info)
+        for rel_path, info in sorted(files.items())
+        if not _skipped(rel_path) and _sha256_file(_dest(rel_path)) != info["sha256"]
+    ]
 
-        for member in zf.namelist():
-            # skip directories
-            if member.endswith("/"):
-                continue
 
-            # get relative path after root folder
-            rel_path = member[len(root) + 1:]
-            if not rel_path:
-                continue
+def _download_changed(changed, on_progress):
+    """Fetch only the changed files, checksum-verified. Returns bytes downloaded."""
+    total = 0
 
-            # skip protected files
-            if os.path.basename(rel_path) in PROTECTED:
-                continue
+    def fetch(rel_path, info):
+        url = REMOTE_RAW_BASE + quote(rel_path)
+        return _write_verified(_dest(rel_path), _stream(url), info["sha256"], info.get("mode"))[1]
 
-            # skip .venv, __pycache__, .git
-            if any(part in rel_path for part in [".venv", "__pycache__", ".git"]):
-                continue
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = [pool.submit(fetch, rel_path, info) for rel_path, info in changed]
 
-            dest = os.path.join(APP_DIR, rel_path)
+        for done, future in enumerate(as_completed(futures), start=1):
+            total += future.result()
+            on_progress(f"Downloading changed files... {done} / {len(changed)}")
 
-            # create subdirectories if needed
-            dest_dir = os.path.dirname(dest)
-            if not os.path.exists(dest_dir):
-                os.makedirs(dest_dir)
+    return total
 
-            # extract file
-            with zf.open(member) as src, open(dest, "wb") as dst:
-                dst.write(src.read())
+
+# ---------------- FULL UPDATE (zip) ---------------- #
+
+def _download_and_extract(on_progress):
+    """
+    Stream the repo zip to a temp file, then write only the files whose
+    content differs from the installed copy. Returns (files written, bytes).
+    """
+    written = 0
+    size = 0
+
+    with tempfile.TemporaryFile() as archive:
+        for chunk in _stream(REMOTE_ZIP_URL):
+            archive.write(chunk)
+            size += len(chunk)
+            on_progress(f"Downloading full update... {size // 1024} KB")
+
+        archive.seek(0)
+
+        with zipfile.ZipFile(archive) as zf:
+            # zip contains a root folder like "Qspider_Console-main/"
+            root = zf.namelist()[0].split("/")[0]
+
+            for member in zf.infolist():
+                # skip directories
+                if member.is_dir():
+                    continue
+
+                # get relative path after root folder
+                rel_path = member.filename[len(root) + 1:]
+                if not rel_path or _skipped(rel_path):
+                    continue
+
+                dest = _dest(rel_path)
+                local = _sha256_file(dest)
+
+                # hash the member first — unchanged files are not rewritten
+                digest = hashlib.sha256()
+                with zf.open(member) as src:
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                if digest.hexdigest() == local:
+                    continue
+
+                # unix permission bits sit in the high word of external_attr
+                mode = (member.external_attr >> 16) & 0o777
+                with zf.open(member) as src:
+                    _write_verified(dest, iter(lambda: src.read(CHUNK_SIZE), b""), mode=mode)
+                written += 1
+
+    return written, size
+
+
+def update_files(on_progress=lambda message: None, version=None):
+    """
+    Bring the installed files in line with the remote release.
+
+    With a manifest (for `version`, if given) only the files whose sha256
+    differs are downloaded (nothing at all if every hash matches); without
+    one, or when most files changed or a delta download fails, the zip is
+    streamed to disk instead. Returns (files written, bytes downloaded).
+    """
+    files = _fetch_manifest(version)
+
+    if files is not None:
+        on_progress("Comparing installed files...")
+        changed = _changed_files(files)
+
+        if not changed:
+            return 0, 0
+
+        if len(changed) <= MAX_DELTA_FILES:
+            try:
+                return len(changed), _download_changed(changed, on_progress)
+            except Exception:
+                pass    # bad checksum / missing raw file — fall back to the zip
+
+    return _download_and_extract(on_progress)
+
+
+def build_manifest():
+    """manifest.json content for the files git tracks in APP_DIR (run before each release)."""
+    try:
+        # "<mode> <blob> <stage>\t<path>" — git's mode is 100755 / 100644 on every OS
+        listed = subprocess.run(
+            ["git", "ls-files", "--stage"], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout.splitlines()
+    except (OSError, subprocess.CalledProcessError):
+        raise SystemExit("git ls-files failed — run this from a git checkout")
+
+    files = {}
+    for entry in listed:
+        meta, rel_path = entry.split("\t", 1)
+        if rel_path == MANIFEST_FILE or _skipped(rel_path):
+            continue
+        path = os.path.join(APP_DIR, rel_path)
+        if os.path.isfile(path):
+            files[rel_path] = {
+                "sha256": _sha256_file(path),
+                "size": os.path.getsize(path),
+                "mode": 0o755 if meta.startswith("100755") else 0o644
+            }
+
+    with open(os.path.join(APP_DIR, "version.json"), encoding="utf-8") as f:
+        version = json.load(f)["version"]
+
+    return {"version": version, "files": files}
 
 
 def _install_deps():
@@ -118,11 +326,17 @@ def update_app(stdscr):
         lines = changelog.split("\n")
         for i, line in enumerate(lines[:5]):
             stdscr.addstr(4 + i, 6, line[:70])
-    stdscr.addstr(10, 4, "Downloading update...")
+    stdscr.addstr(10, 4, "Checking which files changed...")
     stdscr.refresh()
 
+    def progress(message):
+        stdscr.move(10, 0)
+        stdscr.clrtoeol()
+        stdscr.addstr(10, 4, message[:70])
+        stdscr.refresh()
+
     try:
-        _download_and_extract()
+        written, downloaded = update_files(progress, remote_ver)
     except Exception as e:
         stdscr.clear()
         stdscr.addstr(2, 4, "Download failed")
@@ -131,16 +345,19 @@ def update_app(stdscr):
         stdscr.getch()
         return
 
-    stdscr.addstr(11, 4, "Installing dependencies...")
-    stdscr.refresh()
+    # dependencies only change with requirements.txt — skip pip when the file set did not change
+    if written:
+        stdscr.addstr(11, 4, "Installing dependencies...")
+        stdscr.refresh()
 
-    try:
-        _install_deps()
-    except Exception:
-        pass  # non-critical, app may still work
+        try:
+            _install_deps()
+        except Exception:
+            pass  # non-critical, app may still work
 
     stdscr.clear()
-    stdscr.addstr(2, 4, f"Updated to v{remote_ver}!")
+    stdscr.addstr(2, 4, f"Updated to v{remote_ver}!  "
+                        f"({written} file(s) changed, {downloaded // 1024} KB downloaded)")
     if changelog:
         stdscr.addstr(4, 4, "What's new:")
         lines = changelog.split("\n")
@@ -149,3 +366,13 @@ def update_app(stdscr):
     stdscr.addstr(11, 4, "Restart the app for changes to take effect.")
     stdscr.addstr(13, 4, "Press any key to return...")
     stdscr.getch()
+
+
+if __name__ == "__main__":
+    # maintainers: python updater.py manifest  (writes manifest.json for the release)
+    if sys.argv[1:] != ["manifest"]:
+        raise SystemExit("usage: python updater.py manifest")
+
+    with open(os.path.join(APP_DIR, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(build_manifest(), f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -0,0 +1,284 @@
+import time
+import uuid
+import curses
+from datetime import datetime
+
+from db import get_recent_runs, get_run_timings
+from table_renderer import scrollable_table, fit
+from list_view import ListView
+
+# width of one error-rate-over-time bucket (seconds of run time)
+TIMELINE_BUCKET = 10
+
+# runs listed on the metrics screen
+RECENT_RUNS = 50
+
+# API statuses that settle a row (created / duplicate); anything else is an error
+OK_STATUSES = (201, 409)
+
+# request phases, in the order they happen (all in milliseconds)
+PHASES = ("wait", "pool", "connect", "ttfb", "total")
+
+PHASE_HELP = {
+    "wait": "our side — fair-share slot, rate limiter, token refresh",
+    "pool": "our side — waiting for a free connection in the pool",
+    "connect": "network — DNS, TCP and TLS of a new connection",
+    "ttfb": "TopBrains API — request sent to first response byte",
+    "total": "whole request, send to body read"
+}
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of already sorted `values`, None if empty."""
+    if not values:
+        return None
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+class RequestTiming:
+    """
+    Timestamps of one question request. Passed to aiohttp as
+    trace_request_ctx, so the transport's trace hooks can mark connection
+    pool and connect phases on it (see upload_transport).
+    """
+
+    __slots__ = ("queued", "sent", "marks", "done", "status", "error")
+
+    def __init__(self, queued):
+        self.queued = queued        # row taken from the send queue
+        self.sent = None            # post() called
+        self.marks = {}             # trace event -> monotonic time
+        self.done = None            # response body read (or request failed)
+        self.status = None          # API status (body statusCode, else HTTP), None if no response
+        self.error = None
+
+    def mark(self, event):
+        self.marks.setdefault(event, time.monotonic())
+
+    def _span(self, start, end):
+        a, b = self.marks.get(start), self.marks.get(end)
+        return b - a if a is not None and b is not None else None
+
+    def phases(self):
+        """Milliseconds of each phase; None for phases that did not happen."""
+        headers = self.marks.get("headers_sent")
+        response = self.marks.get("response")
+
+        return {
+            "wait": _ms(self.sent - self.queued),
+            "pool": _ms(self._span("pool_start", "pool_end")),
+            "connect": _ms(self._span("connect_start", "connect_end")),
+            "ttfb": _ms(response - headers) if headers and response else None,
+            "total": _ms(self.done - self.sent)
+        }
+
+
+class RunMetrics:
+    """
+    Latency and throughput of one upload run. Every request becomes a row
+    of upload_request_timing (through the write-behind writer); summary()
+    gives the aggregates saved to upload_run when the run ends.
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex
+        self.started_at = time.time()
+        self._t0 = time.monotonic()
+
+        self.requests = 0
+        self.errors = 0
+        self._totals = []
+        self._timeline = {}     # bucket -> [requests, errors]
+
+    def request(self, timing, row_no, attempt):
+        """Account one finished request; returns its upload_request_timing row."""
+        phases = timing.phases()
+        ok = timing.status in OK_STATUSES
+        offset = timing.sent - self._t0
+
+        self.requests += 1
+        self.errors += not ok
+        self._totals.append(phases["total"])
+
+        bucket = self._timeline.setdefault(int(offset // TIMELINE_BUCKET), [0, 0])
+        bucket[0] += 1
+        bucket[1] += not ok
+
+        return (
+            self.run_id, row_no, attempt, timing.status, timing.error,
+            *(phases[p] for p in PHASES), round(offset, 3)
+        )
+
+    def elapsed(self):
+        return time.monotonic() - self._t0
+
+    def summary(self, questions):
+        """Aggregates of the run; `questions` is the number of rows it settled."""
+        totals = sorted(self._totals)
+        elapsed = self.elapsed()
+
+        return {
+            "run_id": self.run_id,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.requests, 4) if self.requests else 0.0,
+            "p50_ms": percentile(totals, 50),
+            "p95_ms": percentile(totals, 95),
+            "p99_ms": percentile(totals, 99),
+            "per_second": round(questions / elapsed, 2) if elapsed else 0.0,
+            "elapsed": round(elapsed, 1),
+            "timeline": [
+                [bucket * TIMELINE_BUCKET, n, errors]
+                for bucket, (n, errors) in sorted(self._timeline.items())
+            ]
+        }
+
+
+# ---------------- SCREENS ---------------- #
+
+RUN_HEADERS = ["Window", "Requests", "Errors", "Error %", "p50 ms", "p95 ms"]
+REQUEST_HEADERS = ["Row", "Try", "Status", "Wait", "Pool", "Connect", "TTFB", "Total", "Error"]
+
+
+def _fmt_ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+
+def _run_label(run):
+    (run_id, started_at, chapter_id, source, elapsed, concurrency, questions,
+     requests, errors, p50, p95, p99, per_second, timeline) = run
+
+    when = datetime.fromtimestamp(started_at).strftime("%Y-%m-%d %H:%M")
+    error_pct = 100 * errors / requests if requests else 0
+    return (
+        f"{when}  {fit(source or chapter_id, 28)}  {questions:>6} q  {per_second:>6.2f}/s  "
+        f"p50 {_fmt_ms(p50)}  p95 {_fmt_ms(p95)}  p99 {_fmt_ms(p99)} ms  err {error_pct:.1f}%"
+    )
+
+
+def _phase_stats(timings):
+    """{phase: (p50, p95, p99, max, n)} over the requests of one run."""
+    stats = {}
+    for i, phase in enumerate(PHASES):
+        values = sorted(t[3 + i] for t in timings if t[3 + i] is not None)
+        stats[phase] = (
+            percentile(values, 50), percentile(values, 95), percentile(values, 99),
+            values[-1] if values else None, len(values)
+        )
+    return stats
+
+
+def _timeline_rows(timings):
+    """One row per TIMELINE_BUCKET of run time, with per-window latency."""
+    buckets = {}
+    for t in timings:
+        buckets.setdefault(int(t[8] // TIMELINE_BUCKET), []).append(t)
+
+    rows = []
+    for bucket, items in sorted(buckets.items()):
+        totals = sorted(t[7] for t in items if t[7] is not None)
+        errors = sum(1 for t in items if t[2] not in OK_STATUSES)
+        start = bucket * TIMELINE_BUCKET
+        rows.append([
+            f"{start}-{start + TIMELINE_BUCKET}s",
+            len(items),
+            errors,
+            f"{100 * errors / len(items):.1f}",
+            _fmt_ms(percentile(totals, 50)),
+            _fmt_ms(percentile(totals, 95))
+        ])
+    return rows
+
+
+def _request_rows(timings):
+    rows = []
+    for row_no, attempt, status, wait, pool, connect, ttfb, total, offset, error in timings:
+        rows.append([
+            row_no, attempt, status or "no response",
+            _fmt_ms(wait), _fmt_ms(pool), _fmt_ms(connect), _fmt_ms(ttfb), _fmt_ms(total),
+            error or ""
+        ])
+    return rows
+
+
+def _show_run(stdscr, run):
+    """Phase breakdown of one run; t opens the timeline, r every request."""
+    run_id, started_at, chapter_id, source = run[:4]
+    elapsed, questions, requests, errors, per_second = run[4], run[6], run[7], run[8], run[12]
+
+    timings = get_run_timings(run_id)
+    stats = _phase_stats(timings)
+
+    while True:
+        stdscr.clear()
+        h, w = stdscr.getmaxyx()
+
+        lines = [
+            (f"Run {datetime.fromtimestamp(started_at):%Y-%m-%d %H:%M:%S}  |  {source or chapter_id}",
+             curses.A_BOLD),
+            (f"Chapter {chapter_id}   {questions} question(s) in {elapsed:.1f}s   "
+             f"{per_second:.2f}/s   {requests} request(s), {errors} error(s)", 0),
+            ("", 0),
+            (f"{'Phase':<9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'n':>8}   where the time goes", curses.A_BOLD)
+        ]
+        for phase in PHASES:
+            p50, p95, p99, top, n = stats[phase]
+            lines.append((
+                f"{phase:<9}{_fmt_ms(p50):>9}{_fmt_ms(p95):>9}{_fmt_ms(p99):>9}{_fmt_ms(top):>9}{n:>8}"
+                f"   {PHASE_HELP[phase]}", 0
+            ))
+
+        lines += [
+            ("", 0),
+            ("All times in ms. pool / connect only count requests that had to wait or open a connection.", 0)
+        ]
+
+        for y, (text, attr) in enumerate(lines, start=1):
+            if y < h - 2:
+                stdscr.addstr(y, 2, fit(text, w - 4).rstrip(), attr)
+
+        stdscr.addstr(h - 2, 2, "t timeline   r requests   Esc return"[: w - 4])
+        stdscr.refresh()
+
+        key = stdscr.getch()
+
+        if key in (27, ord("q")):
+            return
+        elif key in (ord("t"), ord("T")):
+            scrollable_table(stdscr, f"Timeline  |  {TIMELINE_BUCKET}s windows",
+                             RUN_HEADERS, _timeline_rows(timings))
+        elif key in (ord("r"), ord("R")):
+            scrollable_table(stdscr, f"Requests  |  {len(timings)} total  (ms)",
+                             REQUEST_HEADERS, _request_rows(timings))
+
+
+def show_upload_metrics(stdscr):
+    """Recent upload runs with their latency / throughput; Enter for details."""
+    runs = get_recent_runs(RECENT_RUNS)
+
+    if not runs:
+        stdscr.clear()
+        stdscr.addstr(4, 4, "📊 No upload runs recorded yet")
+        stdscr.addstr(6, 4, "Press any key to return...")
+        stdscr.getch()
+        return
+
+    menu = ListView(stdscr, "Upload Metrics", "↑ ↓ move   Enter details   Esc return")
+
+    while True:
+        menu.draw(len(runs), lambda pos: _run_label(runs[pos]), status=f"(last {len(runs)} runs)")
+        key = stdscr.getch()
+
+        if key == 27:
+            return
+        if key in (10, 13):
+            _show_run(stdscr, runs[menu.current])
+            menu.invalidate()
+            continue
+
+        menu.key(key, len(runs))
@@ -0,0 +1,104 @@
+import ssl
+import aiohttp
+
+
+# connector tuning
+DNS_CACHE_TTL = 300       # seconds a resolved host stays cached
+KEEPALIVE_TIMEOUT = 30    # seconds an idle connection is kept open
+TOTAL_LIMIT = 100         # hard cap on open sockets across all hosts
+
+# per question request: connect, and whole request (a hung one becomes a retryable timeout)
+CONNECT_TIMEOUT = 10
+REQUEST_TIMEOUT = 60
+
+
+def build_ssl_context():
+    """One SSL context for the whole run (certificate verification off, as before)."""
+    ctx = ssl.create_default_context()
+    ctx.check_hostname = False
+    ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+
+class UploadTransport:
+    """
+    Connection setup shared by every question of one upload run:
+    a single SSL context, a tuned keep-alive TCPConnector,
+    counters for new handshakes vs reused connections, and trace hooks
+    that time the pool / connect / first-byte phases of each request.
+    """
+
+    def __init__(self, per_host_limit):
+        self.ssl_context = build_ssl_context()
+        self.per_host_limit = per_host_limit
+
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.dns_hits = 0
+        self.dns_misses = 0
+
+    # -------- TRACE HOOKS -------- #
+
+    async def _on_create(self, session, ctx, params):
+        self.new_connections += 1
+
+    async def _on_reuse(self, session, ctx, params):
+        self.reused_connections += 1
+
+    async def _on_dns_hit(self, session, ctx, params):
+        self.dns_hits += 1
+
+    async def _on_dns_miss(self, session, ctx, params):
+        self.dns_misses += 1
+
+    @staticmethod
+    def _mark(event):
+        """Hook that stamps `event` on the request's timing (trace_request_ctx), if any."""
+        async def hook(session, ctx, params):
+            timing = ctx.trace_request_ctx
+            if timing is not None:
+                timing.mark(event)
+        return hook
+
+    def _trace_config(self):
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_create)
+        trace.on_connection_reuseconn.append(self._on_reuse)
+        trace.on_dns_cache_hit.append(self._on_dns_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_miss)
+
+        # per-request phases (upload_metrics.RequestTiming)
+        trace.on_connection_queued_start.append(self._mark("pool_start"))
+        trace.on_connection_queued_end.append(self._mark("pool_end"))
+        trace.on_connection_create_start.append(self._mark("connect_start"))
+        trace.on_connection_create_end.append(self._mark("connect_end"))
+        trace.on_request_headers_sent.append(self._mark("headers_sent"))
+        trace.on_request_end.append(self._mark("response"))
+        return trace
+
+    # -------- SESSION -------- #
+
+    def session(self):
+        """Return a ClientSession bound to this transport (use with `async with`)."""
+        connector = aiohttp.TCPConnector(
+            ssl=self.ssl_context,
+            limit=TOTAL_LIMIT,
+            limit_per_host=self.per_host_limit,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True
+        )
+
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=CONNECT_TIMEOUT),
+            trace_configs=[self._trace_config()]
+        )
+
+    def summary(self):
+        """Short one-line description for the live screen."""
+        return (
+            f"Connections: {self.new_connections} new / "
+            f"{self.reused_connections} reused"
+        )
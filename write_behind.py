@@ -0,0 +1,182 @@
+import time
+import queue
+import atexit
+import threading
+
+from db import (
+    write_upload_batch,
+    checkpoint,
+    close_thread_conn,
+    log_upload,
+    save_question,
+    journal_row,
+    dead_letter_row,
+    drop_dead_letter,
+    log_request_timing,
+    save_upload_run
+)
+
+
+FLUSH_ROWS = 200          # flush once this many writes are waiting
+FLUSH_INTERVAL = 0.5      # ... or after this many seconds, whichever comes first
+
+_STOP = object()
+
+_KINDS = ("log", "question", "journal", "dead", "undead", "timing", "run")
+
+
+class WriteBehindWriter:
+    """
+    Queues upload log rows, saved questions, resume journal entries,
+    dead letters and upload metrics and writes them from a background
+    thread in batched transactions, so the upload event loop never waits
+    on SQLite. close() flushes everything and checkpoints the WAL; it also
+    runs at interpreter exit if a run dies without calling it.
+    """
+
+    def __init__(self, flush_rows=FLUSH_ROWS, flush_interval=FLUSH_INTERVAL):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.failed = 0
+        self.last_error = None
+
+        self.flushes = 0
+        self.flush_seconds = 0.0    # time spent in SQLite writes (batches + fallbacks)
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+        atexit.register(self.close)
+
+    # -------- PRODUCER SIDE (never blocks) -------- #
+
+    def log_upload(self, user_id, chapter_id, title, qid, status, error=None):
+        self._queue.put(("log", (user_id, chapter_id, title, qid, status, error)))
+
+    def save_question(self, resp):
+        self._queue.put(("question", resp))
+
+    def journal(self, chapter_id, fingerprint, row_no, status, qid=None):
+        self._queue.put(("journal", (chapter_id, fingerprint, row_no, status, qid)))
+
+    def dead_letter(self, chapter_id, fingerprint, row_no, subject_id, organization_id,
+                    title, content_hash, payload, attempts, error):
+        self._queue.put(("dead", (
+            chapter_id, fingerprint, row_no, subject_id, organization_id,
+            title, content_hash, payload, attempts, error
+        )))
+
+    def drop_dead_letter(self, chapter_id, fingerprint):
+        self._queue.put(("undead", (chapter_id, fingerprint)))
+
+    def request_timing(self, row):
+        """One upload_request_timing row (RunMetrics.request())."""
+        self._queue.put(("timing", row))
+
+    def upload_run(self, row):
+        """One upload_run row, written once the run has ended."""
+        self._queue.put(("run", row))
+
+    def pending(self):
+        return self._queue.qsize()
+
+    # -------- WRITER THREAD -------- #
+
+    def _run(self):
+        try:
+            self._drain()
+        finally:
+            close_thread_conn()
+
+    def _drain(self):
+        batch = {kind: [] for kind in _KINDS}
+        deadline = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stopping = True
+            elif item is not None:
+                kind, data = item
+                batch[kind].append(data)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            waiting = sum(len(v) for v in batch.values())
+            due = deadline is not None and time.monotonic() >= deadline
+
+            if waiting and (stopping or due or waiting >= self.flush_rows):
+                self._flush(batch)
+                batch = {kind: [] for kind in _KINDS}
+                deadline = None
+
+        try:
+            checkpoint()
+        except Exception as e:
+            self.last_error = str(e)
+
+    def _flush(self, batch):
+        started = time.perf_counter()
+        try:
+            self._write_batch(batch)
+        finally:
+            self.flushes += 1
+            self.flush_seconds += time.perf_counter() - started
+
+    def _write_batch(self, batch):
+        try:
+            write_upload_batch(
+                batch["log"], batch["question"], batch["journal"],
+                batch["dead"], batch["undead"], batch["timing"], batch["run"]
+            )
+            self.written += sum(len(v) for v in batch.values())
+            return
+        except Exception as e:
+            self.last_error = str(e)
+
+        # batch failed — write one by one so a single bad row loses only itself
+        for resp in batch["question"]:
+            self._write_one(save_question, resp)
+        for entry in batch["log"]:
+            self._write_one(log_upload, *entry)
+        for entry in batch["journal"]:
+            self._write_one(journal_row, *entry)
+        for entry in batch["undead"]:
+            self._write_one(drop_dead_letter, *entry)
+        for entry in batch["dead"]:
+            self._write_one(dead_letter_row, *entry)
+        for entry in batch["timing"]:
+            self._write_one(log_request_timing, *entry)
+        for entry in batch["run"]:
+            self._write_one(save_upload_run, *entry)
+
+    def _write_one(self, func, *args):
+        try:
+            func(*args)
+            self.written += 1
+        except Exception as e:
+            self.failed += 1
+            self.last_error = str(e)
+
+    # -------- SHUTDOWN -------- #
+
+    def close(self):
+        """Flush all queued writes and make them durable. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(_STOP)
+        self._thread.join()
+        atexit.unregister(self.close)